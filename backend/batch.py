@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Batch Research Mode
+- Runs many questions in one process with a configurable number of concurrent pipelines
+- Phase 1 (memory load + metadata analysis) runs once and is shared by every question;
+  model backends, the mem0 client and the memory snapshot are process-wide already
+- Writes a per-question result manifest (JSONL, one line as each question finishes)
+
+Usage:
+    python batch.py questions.txt|questions.jsonl [--concurrency 2] [--manifest out.jsonl]
+
+Input: .txt has one question per line (blank lines and # comments skipped); .jsonl has one
+object per line with "question" and an optional "id" (a bare JSON string also works).
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+if __name__ == "__main__":
+    # CLI entry point: load .env before any module reads its configuration
+    load_dotenv()
+
+from event_bus import log
+from main import DeepResearchOrchestrator
+from utils import artifacts_dir, new_session_id, save_artifact
+
+
+def load_questions(path: str) -> List[Dict[str, str]]:
+    """Questions with stable ids from a .txt or .jsonl file"""
+    questions = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or (not path.endswith(".jsonl") and line.startswith("#")):
+                continue
+            if path.endswith(".jsonl"):
+                entry = json.loads(line)
+                if isinstance(entry, str):
+                    entry = {"question": entry}
+                question = str(entry.get("question", "")).strip()
+                question_id = str(entry.get("id") or line_number)
+            else:
+                question, question_id = line, str(line_number)
+            if question:
+                questions.append({"id": question_id, "question": question})
+    return questions
+
+
+class SharedPhase1:
+    """Phase 1 outputs (memory load, metadata) computed by the first question and reused by the rest of the batch"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.memories: Optional[list] = None
+        self.references: Dict[str, Dict[str, Any]] = {}
+        self.metadata_json: Optional[str] = None
+
+    def memories_for(self, orchestrator: "BatchOrchestrator") -> list:
+        # Held while the first question loads, so the others wait instead of repeating it
+        with self._lock:
+            if self.memories is None:
+                self.memories = DeepResearchOrchestrator.load_memories(orchestrator)
+                self.references = dict(orchestrator.tracker.memory_references)
+                return self.memories
+
+        # Later sessions still get the Phase 1 memory references for citation linking
+        log("\nPhase 1: Database Analysis (memories shared with this batch)")
+        orchestrator.tracker._record_references(self.references)
+        return self.memories
+
+    def metadata_for(self, orchestrator: "BatchOrchestrator", filtered_memories: list) -> str:
+        with self._lock:
+            if self.metadata_json is None:
+                self.metadata_json = DeepResearchOrchestrator.phase_1_metadata_analysis(orchestrator, filtered_memories)
+                return self.metadata_json
+
+        # Later sessions still get their own metadata artifact
+        metadata_path = save_artifact("metadata", self.metadata_json, ext="json", session_id=orchestrator.session_timestamp)
+        orchestrator.artifacts["metadata"] = metadata_path
+        log(f"Metadata analysis saved: {metadata_path}")
+        return self.metadata_json
+
+
+class BatchOrchestrator(DeepResearchOrchestrator):
+    """Orchestrator whose Phase 1 comes from the batch's shared result"""
+
+    def __init__(self, *args, shared: SharedPhase1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shared = shared
+
+    def load_memories(self) -> list:
+        return self.shared.memories_for(self)
+
+    def phase_1_metadata_analysis(self, filtered_memories: list = None) -> str:
+        if filtered_memories is None:
+            filtered_memories = self.load_memories()
+        return self.shared.metadata_for(self, filtered_memories)
+
+
+def run_batch(
+    questions: List[Dict[str, str]],
+    manifest_path: str,
+    concurrency: int = 2,
+    store_memories: bool = False,
+    user_id: str = "doctor_memory",
+    max_memories: int = 100,
+    max_iterations: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Run every question and append one manifest line per finished question
+
+    Returns:
+        list: manifest entries in input order
+    """
+    shared = SharedPhase1()
+    manifest_lock = threading.Lock()
+    entries: Dict[str, Dict[str, Any]] = {}
+
+    def run_one(item: Dict[str, str]) -> Dict[str, Any]:
+        started = time.time()
+        entry = {"id": item["id"], "question": item["question"], "session_id": None}
+        try:
+            orchestrator = BatchOrchestrator(
+                user_id=user_id, max_memories=max_memories, max_iterations=max_iterations, shared=shared
+            )
+            entry["session_id"] = orchestrator.session_timestamp
+            result = orchestrator.run_complete_pipeline(item["question"], store_memories=store_memories)
+            entry.update({
+                "success": bool(result.get("success")),
+                "error": result.get("error"),
+                "execution_time": result.get("execution_time"),
+                "artifacts": result.get("artifacts", {}),
+                "trace": result.get("trace"),
+            })
+        except Exception as e:
+            entry.update({"success": False, "error": str(e), "artifacts": {}})
+        entry["wall_seconds"] = round(time.time() - started, 3)
+
+        with manifest_lock:
+            with open(manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            entries[item["id"]] = entry
+            status = "ok" if entry["success"] else f"failed: {entry['error']}"
+            print(f"[{len(entries)}/{len(questions)}] {item['id']}: {status} ({entry['wall_seconds']:.1f}s)")
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="batch-question") as executor:
+        futures = [executor.submit(run_one, item) for item in questions]
+        for future in as_completed(futures):
+            future.result()
+
+    return [entries[item["id"]] for item in questions]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run many research questions in one process")
+    parser.add_argument("questions", help="Questions file (.txt: one per line, .jsonl: {\"id\", \"question\"})")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BATCH_CONCURRENCY", "2")),
+                        help="Questions researched at the same time")
+    parser.add_argument("--manifest", help="Result manifest path (default: artifacts/batch_<id>_manifest.jsonl)")
+    parser.add_argument("--store-memories", action="store_true", help="Run Phase 5 for every question")
+    parser.add_argument("--user-id", default="doctor_memory")
+    parser.add_argument("--max-memories", type=int, default=100)
+    parser.add_argument("--max-iterations", type=int, default=5)
+    parser.add_argument("--quiet", action="store_true", help="Only show warnings and per-question results")
+    args = parser.parse_args()
+
+    if args.quiet:
+        os.environ["CONSOLE_LOG_LEVEL"] = "warning"
+
+    questions = load_questions(args.questions)
+    if not questions:
+        print(f"No questions found in {args.questions}")
+        return 1
+    ids = [item["id"] for item in questions]
+    if len(set(ids)) != len(ids):
+        print("Question ids must be unique within a batch")
+        return 1
+
+    manifest_path = args.manifest or str(artifacts_dir() / f"batch_{new_session_id()}_manifest.jsonl")
+    print(f"Running {len(questions)} questions with concurrency {args.concurrency}")
+    print(f"Manifest: {manifest_path}")
+
+    entries = run_batch(
+        questions,
+        manifest_path,
+        concurrency=args.concurrency,
+        store_memories=args.store_memories,
+        user_id=args.user_id,
+        max_memories=args.max_memories,
+        max_iterations=args.max_iterations,
+    )
+
+    failed = [entry for entry in entries if not entry.get("success")]
+    print(f"\nBatch complete: {len(entries) - len(failed)} succeeded, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
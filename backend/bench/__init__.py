@@ -0,0 +1 @@
+"""Benchmarks for the Deep Memory Research Pipeline (run from the backend directory)"""
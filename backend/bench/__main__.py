@@ -0,0 +1,7 @@
+"""python -m bench: end-to-end pipeline benchmark (see bench/pipeline.py)"""
+
+import sys
+
+from bench.pipeline import main
+
+sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Import-time benchmark
+- Cold-imports each module in a fresh interpreter and reports wall time
+- Fails when a module that must stay import-light pulls in the LLM/mem0 stack
+  or exceeds its time budget, so server workers and CLI tools keep starting fast
+
+Usage (from backend/):
+    python -m bench.import_time [--repeat 3] [--budget 0.5] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Packages that belong to the lazily loaded LLM/mem0 stack
+HEAVY_PACKAGES = ("camel", "mem0", "numpy", "google.generativeai", "rich")
+
+# Modules that must import without loading any heavy package
+LIGHT_MODULES = (
+    "utils",
+    "event_bus",
+    "tracing",
+    "pipeline_dag",
+    "checkpoints",
+    "jobs",
+    "memory_client",
+    "model_router",
+    "memory_sync",
+    "memory_id_tracker",
+    "main",
+    "batch",
+    "server",
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = [pkg for pkg in {heavy!r} if any(name == pkg or name.startswith(pkg + ".") for name in sys.modules)]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str, repeat: int = 3) -> dict:
+    """Best-of-N cold import time of a module and the heavy packages it loaded"""
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_PACKAGES)],
+            cwd=str(BACKEND_DIR),
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["import failed"])[-1]
+            return {"module": module, "seconds": None, "heavy": [], "error": error}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return {"module": module, **best}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import time of pipeline modules")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per module (best is reported)")
+    parser.add_argument("--budget", type=float, default=0.5, help="Max seconds per light module")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: all light modules)")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in (args.modules or LIGHT_MODULES)]
+
+    failures = []
+    print(f"{'module':<22}{'seconds':>10}  heavy packages")
+    for result in results:
+        if result.get("error"):
+            print(f"{result['module']:<22}{'-':>10}  error: {result['error']}")
+            failures.append(result["module"])
+            continue
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(f"{result['module']:<22}{result['seconds']:>10.3f}  {heavy}")
+        if result["heavy"] or result["seconds"] > args.budget:
+            failures.append(result["module"])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"budget": args.budget, "results": results}, f, indent=2)
+
+    if failures:
+        print(f"\nImport budget exceeded or heavy stack loaded: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
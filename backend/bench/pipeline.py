@@ -0,0 +1,238 @@
+"""
+End-to-end pipeline benchmark
+- Runs run_complete_pipeline non-interactively over questions from docs/Sample_Prompts.md
+- Backends: "simulated" (synthetic fixtures, see bench/simulated.py) or "replay" (fixtures
+  recorded with DEEP_RESEARCH_REPLAY=record); both run offline without API keys
+- Reports per phase: wall time, LLM calls, tokens, mem0 calls and peak RSS (median over runs)
+- Compares against a stored baseline and exits 1 when a metric regresses past its threshold
+
+Usage (from backend/):
+    python -m bench [--backend simulated|replay] [--questions 3] [--repeat 1]
+                    [--baseline bench/baseline.json] [--save-baseline]
+                    [--threshold seconds=0.25 ...] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_PROMPTS = BACKEND_DIR / "docs" / "Sample_Prompts.md"
+
+METRICS = ("seconds", "llm_calls", "input_tokens", "output_tokens", "mem0_calls", "peak_rss_mb")
+
+# Allowed relative increase per metric before it counts as a regression
+DEFAULT_THRESHOLDS = {
+    "seconds": 0.25,
+    "llm_calls": 0.0,
+    "input_tokens": 0.1,
+    "output_tokens": 0.1,
+    "mem0_calls": 0.0,
+    "peak_rss_mb": 0.25,
+}
+
+# Absolute slack so tiny phases are not flagged for scheduler noise
+MIN_DELTA = {"seconds": 0.05, "peak_rss_mb": 5.0}
+
+
+def load_sample_prompts(path: Path = SAMPLE_PROMPTS) -> List[str]:
+    """Questions from the sample prompts doc (lines like *"..."*)"""
+    prompts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            match = re.match(r'^\*"(.+)"\*\s*$', line.strip())
+            if match:
+                prompts.append(match.group(1))
+    return prompts
+
+
+def configure_environment(args, work_dir: Path):
+    """Point the pipeline at offline backends before any pipeline module is imported"""
+    os.environ["DEEP_RESEARCH_REPLAY"] = "replay"
+    os.environ["DEEP_RESEARCH_ARTIFACTS_DIR"] = str(work_dir / "artifacts")
+    os.environ["EVENT_LOG_FILE"] = "0"
+    if args.latency is not None:
+        os.environ["DEEP_RESEARCH_REPLAY_LATENCY"] = args.latency
+    if not args.verbose:
+        os.environ["CONSOLE_LOG_LEVEL"] = "off"
+    if args.fixtures:
+        os.environ["DEEP_RESEARCH_FIXTURES"] = str(Path(args.fixtures).resolve())
+    # Metadata memoization and the local index depend on state left by earlier runs
+    os.environ.setdefault("MEMORY_SNAPSHOT", "0")
+    os.environ.setdefault("LOCAL_MEMORY_INDEX", "0")
+
+
+def run_question(question: str, max_iterations: int, store_memories: bool) -> Dict[str, Any]:
+    """One pipeline run and its per-phase totals"""
+    from main import DeepResearchOrchestrator
+    from replay import reset_fixture_stores
+
+    # Every run replays its fixtures from the first record
+    reset_fixture_stores()
+
+    started = time.perf_counter()
+    orchestrator = DeepResearchOrchestrator(max_iterations=max_iterations)
+    result = orchestrator.run_complete_pipeline(question, store_memories=store_memories)
+    return {
+        "question": question,
+        "session_id": orchestrator.session_timestamp,
+        "success": bool(result.get("success")),
+        "error": result.get("error"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "phases": orchestrator.trace.phase_totals(),
+    }
+
+
+def aggregate(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Median of each metric per phase over successful runs"""
+    values: Dict[str, Dict[str, List[float]]] = {}
+    for run in runs:
+        if not run["success"]:
+            continue
+        for phase, totals in run["phases"].items():
+            for metric in METRICS:
+                if totals.get(metric) is not None:
+                    values.setdefault(phase, {}).setdefault(metric, []).append(totals[metric])
+    return {
+        phase: {metric: round(statistics.median(samples), 3) for metric, samples in metrics.items()}
+        for phase, metrics in values.items()
+    }
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    thresholds: Dict[str, float],
+) -> List[Dict[str, Any]]:
+    """One row per phase metric; regressed when above baseline * (1 + threshold) plus slack"""
+    rows = []
+    for phase, metrics in current.items():
+        for metric, value in metrics.items():
+            base = baseline.get(phase, {}).get(metric)
+            regressed = False
+            if base is not None:
+                limit = base * (1 + thresholds.get(metric, 0.0)) + MIN_DELTA.get(metric, 0.0)
+                regressed = value > limit
+            rows.append({"phase": phase, "metric": metric, "value": value, "baseline": base, "regressed": regressed})
+    return rows
+
+
+def parse_thresholds(overrides: List[str]) -> Dict[str, float]:
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for override in overrides or []:
+        metric, _, ratio = override.partition("=")
+        if metric not in METRICS or not ratio:
+            raise SystemExit(f"--threshold expects metric=ratio with metric in {METRICS}, got '{override}'")
+        thresholds[metric] = float(ratio)
+    return thresholds
+
+
+def print_report(rows: List[Dict[str, Any]]):
+    print(f"\n{'phase':<24}{'metric':<15}{'value':>12}{'baseline':>12}{'change':>10}")
+    for row in rows:
+        base = row["baseline"]
+        change = "-"
+        if base:
+            change = f"{(row['value'] - base) / base:+.0%}"
+        marker = "  REGRESSED" if row["regressed"] else ""
+        base_text = f"{base:>12}" if base is not None else f"{'-':>12}"
+        print(f"{row['phase']:<24}{row['metric']:<15}{row['value']:>12}{base_text}{change:>10}{marker}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the research pipeline per phase against a baseline")
+    parser.add_argument("--backend", choices=("simulated", "replay"), default="simulated",
+                        help="simulated: synthetic fixtures; replay: recorded fixtures (--fixtures)")
+    parser.add_argument("--fixtures", help="Recorded fixture directory for --backend replay")
+    parser.add_argument("--prompts", default=str(SAMPLE_PROMPTS), help="Markdown file with sample questions")
+    parser.add_argument("--questions", type=int, default=3, help="Number of sample questions to run")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per question (medians are reported)")
+    parser.add_argument("--max-iterations", type=int, default=3, help="Research iterations per run")
+    parser.add_argument("--no-memory-writing", action="store_true", help="Skip Phase 5")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for simulated fixtures")
+    parser.add_argument("--latency", help="Replay delay per call: recorded, or fixed seconds")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run's results to --baseline")
+    parser.add_argument("--threshold", action="append", metavar="METRIC=RATIO",
+                        help="Allowed relative increase, e.g. seconds=0.5 (repeatable)")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep pipeline console output")
+    args = parser.parse_args()
+
+    if args.backend == "replay" and not args.fixtures:
+        parser.error("--backend replay needs --fixtures (a directory recorded with DEEP_RESEARCH_REPLAY=record)")
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline")
+    thresholds = parse_thresholds(args.threshold)
+
+    questions = load_sample_prompts(Path(args.prompts))[: args.questions]
+    if not questions:
+        parser.error(f"No questions found in {args.prompts}")
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as work:
+        work_dir = Path(work)
+        configure_environment(args, work_dir)
+
+        runs = []
+        for index, question in enumerate(questions):
+            if args.backend == "simulated":
+                from bench.simulated import write_fixtures
+
+                fixtures = write_fixtures(
+                    work_dir / f"fixtures_{index}",
+                    seed=args.seed + index,
+                    max_iterations=args.max_iterations,
+                    parallel_searches=int(os.getenv("RESEARCH_PARALLEL_SEARCHES", "3")),
+                )
+                os.environ["DEEP_RESEARCH_FIXTURES"] = str(fixtures)
+
+            for attempt in range(args.repeat):
+                run = run_question(question, args.max_iterations, store_memories=not args.no_memory_writing)
+                status = "ok" if run["success"] else f"failed: {run['error']}"
+                print(f"[{index + 1}/{len(questions)} run {attempt + 1}] {run['seconds']:.2f}s {status}")
+                runs.append(run)
+
+    current = aggregate(runs)
+    results = {
+        "backend": args.backend,
+        "questions": len(questions),
+        "repeat": args.repeat,
+        "max_iterations": args.max_iterations,
+        "phases": current,
+        "runs": runs,
+    }
+
+    baseline = {}
+    if args.baseline and not args.save_baseline and Path(args.baseline).exists():
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("phases", {})
+    rows = compare(current, baseline, thresholds)
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**results, "thresholds": thresholds, "comparison": rows}, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved: {args.baseline}")
+
+    failed = [run for run in runs if not run["success"]]
+    regressed = [row for row in rows if row["regressed"]]
+    if failed:
+        print(f"\n{len(failed)} of {len(runs)} runs failed")
+    if regressed:
+        print(f"\nRegressions: {', '.join(sorted({row['phase'] + '.' + row['metric'] for row in regressed}))}")
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
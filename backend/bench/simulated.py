@@ -0,0 +1,143 @@
+"""
+Simulated backend for pipeline benchmarks
+- Writes synthetic llm.jsonl / mem0.jsonl fixtures in the replay format (replay.py), so the
+  whole pipeline runs offline in DEEP_RESEARCH_REPLAY=replay mode without recorded sessions
+- Responses have the shape each call site parses (metadata JSON, ReWOO plan phases, structured
+  decisions, insight arrays); latencies and token counts are drawn from a seeded RNG so runs
+  with the same seed are comparable
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+TOPICS = (
+    "metformin titration", "HbA1c follow-up", "ACE inhibitor", "statin intolerance", "CKD stage 3",
+    "eGFR decline", "beta blocker", "heart failure", "atrial fibrillation", "anticoagulation",
+    "depression screening", "PHQ-9", "deprescribing", "polypharmacy review", "colon cancer screening",
+    "mammography", "osteoporosis", "lifestyle counseling", "medication adherence", "cardiology referral",
+)
+
+# Simulated latency ranges per call (seconds), kept short so a benchmark run stays fast
+LLM_LATENCY = (0.05, 0.2)
+MEM0_LATENCY = (0.01, 0.05)
+
+
+def _memory(rng: random.Random, index: int) -> Dict[str, Any]:
+    topic = rng.choice(TOPICS)
+    return {
+        "id": f"sim-{index:05d}",
+        "memory": f"Patient {index % 97} - {topic}: follow-up note on {rng.choice(TOPICS)}",
+        "score": round(rng.uniform(0.5, 0.95), 3),
+        "metadata": {"summary_fact": True, "topic": topic.split()[0]},
+    }
+
+
+def _llm_responses(rng: random.Random, max_iterations: int, parallel_searches: int) -> Dict[str, List[str]]:
+    """Synthetic responses per LLM call site, in call order"""
+
+    def searches(count: int) -> List[str]:
+        return rng.sample(TOPICS, count)
+
+    metadata = {
+        "database_summary": {
+            "total_memories": 100,
+            "date_range": "2019-2024",
+            "primary_topics": list(TOPICS[:6]),
+        },
+        "field_coverage": {"topic": 1.0, "summary_fact": 1.0},
+    }
+    plan = {
+        "research_intent": "Simulated benchmark plan",
+        "phases": [
+            {"name": f"Phase {phase}", "searches": searches(parallel_searches)}
+            for phase in range(1, 4)
+        ],
+        "search_strategy": "Broad topics first, then narrow to outcomes",
+    }
+    decisions = [
+        json.dumps({
+            "enough_info": False,
+            "next_searches": searches(parallel_searches),
+            "reasoning": "More coverage needed on treatment outcomes",
+        })
+        for _ in range(max_iterations + 1)
+    ]
+    paragraphs = "\n\n".join(
+        f"- {topic.capitalize()} appears across several patients with consistent follow-up."
+        for topic in searches(6)
+    )
+    insights = [{"memory": f"Research found patterns in {topic}", "topic": "findings"} for topic in searches(5)]
+
+    return {
+        "metadata": [json.dumps(metadata)],
+        "plan": [json.dumps(plan)],
+        "decision": decisions,
+        "final_answer": [f"# Research Findings\n\n{paragraphs}\n"],
+        "analysis_methodology": [f"## Methodology\n\n{paragraphs}\n"],
+        "analysis_data_quality": [f"## Data Quality\n\n{paragraphs}\n"],
+        "analysis_findings": [f"## Findings\n\n{paragraphs}\n"],
+        "analysis_synthesis": [f"# Analysis Report\n\n{paragraphs}\n"],
+        "memory_extraction": [json.dumps(insights)],
+        "citation": ["{}"],
+    }
+
+
+def write_fixtures(
+    directory: Path,
+    seed: int = 0,
+    max_iterations: int = 3,
+    parallel_searches: int = 3,
+    memories: int = 100,
+) -> Path:
+    """
+    Generate one question's worth of synthetic fixtures
+
+    Args:
+        directory: Fixture directory (DEEP_RESEARCH_FIXTURES)
+        seed: RNG seed for contents, latencies and token counts
+        max_iterations: Research iterations to provide decisions and searches for
+        parallel_searches: Searches per iteration (RESEARCH_PARALLEL_SEARCHES)
+        memories: Size of the simulated memory corpus
+
+    Returns:
+        Path: the fixture directory
+    """
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    corpus = [_memory(rng, i) for i in range(memories)]
+
+    with open(directory / "llm.jsonl", "w", encoding="utf-8") as f:
+        for site, responses in _llm_responses(rng, max_iterations, parallel_searches).items():
+            for i, response in enumerate(responses):
+                record = {
+                    "key": f"simulated:{site}:{i}",
+                    "channel": site,
+                    "latency_seconds": round(rng.uniform(*LLM_LATENCY), 4),
+                    "response": response,
+                    "usage": {"input_tokens": rng.randint(1500, 6000), "output_tokens": (len(response) + 3) // 4},
+                }
+                f.write(json.dumps(record) + "\n")
+
+    # Searches overlap partially so novelty tracking sees both new and repeated memories
+    search_calls = (max_iterations + 2) * parallel_searches
+    with open(directory / "mem0.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "key": "simulated:get_all:0",
+            "channel": "get_all",
+            "latency_seconds": round(rng.uniform(*MEM0_LATENCY), 4),
+            "response": corpus,
+        }) + "\n")
+        for i in range(search_calls):
+            results = sorted(rng.sample(corpus, min(20, len(corpus))), key=lambda m: m["score"], reverse=True)
+            f.write(json.dumps({
+                "key": f"simulated:search:{i}",
+                "channel": "search",
+                "latency_seconds": round(rng.uniform(*MEM0_LATENCY), 4),
+                "response": results,
+            }) + "\n")
+
+    return directory
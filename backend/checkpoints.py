@@ -0,0 +1,117 @@
+"""
+Session Checkpoints - Resumable pipeline state under ARTIFACTS_DIR/sessions/<session_id>/
+- session.json: run parameters, question, status, artifact paths and completed nodes
+- nodes/<node>.json: outputs of every completed pipeline node
+- research_state.json: the research loop after each iteration (searches, merged results,
+  next searches or stop reason), so an interrupted Phase 3 continues where it stopped
+- Node and research checkpoints belong to one question (fingerprint in session.json); running
+  the session with another question discards them, so resume never mixes two questions
+- Writes go to a temp file and are renamed into place, so a crash never leaves a torn file
+- PIPELINE_CHECKPOINTS=0 turns checkpointing off
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils import artifacts_dir
+
+
+def checkpoints_enabled() -> bool:
+    return os.getenv("PIPELINE_CHECKPOINTS", "1").lower() not in ("0", "false", "no")
+
+
+def question_fingerprint(question: str) -> str:
+    return hashlib.sha256(question.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def _write_json(path: Path, data: Any):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class SessionCheckpoint:
+    """Checkpoint directory of one research session"""
+
+    def __init__(self, session_id: str):
+        if not re.fullmatch(r"[\w-]+", session_id or ""):
+            raise ValueError(f"Invalid session ID: '{session_id}'")
+        self.session_id = session_id
+        self.path = artifacts_dir() / "sessions" / session_id
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return (self.path / "session.json").is_file()
+
+    def load_session(self) -> Dict[str, Any]:
+        """Run parameters and progress of the session ({} when never checkpointed)"""
+        return _read_json(self.path / "session.json") or {}
+
+    def save_session(self, **fields):
+        """Merge fields into session.json"""
+        with self._lock:
+            session = self.load_session()
+            session.update(fields, session_id=self.session_id)
+            _write_json(self.path / "session.json", session)
+
+    def bind_question(self, question: str) -> bool:
+        """
+        Tie the checkpoint to a question, discarding node and research checkpoints saved for another one
+
+        Returns:
+            bool: True when checkpoints of a different question were discarded
+        """
+        fingerprint = question_fingerprint(question)
+        with self._lock:
+            session = self.load_session()
+            previous = session.get("question_fingerprint")
+            if previous is None and session.get("question"):
+                previous = question_fingerprint(session["question"])
+            stale = previous is not None and previous != fingerprint
+            if stale:
+                shutil.rmtree(self.path / "nodes", ignore_errors=True)
+                (self.path / "research_state.json").unlink(missing_ok=True)
+                session.update(artifacts={}, completed_nodes=[])
+            session.update(question=question, question_fingerprint=fingerprint, session_id=self.session_id)
+            _write_json(self.path / "session.json", session)
+        return stale
+
+    def save_node(self, name: str, outputs: Dict[str, Any]):
+        """Persist a completed node's outputs"""
+        _write_json(self.path / "nodes" / f"{name}.json", outputs)
+
+    def completed_nodes(self) -> List[str]:
+        return sorted(path.stem for path in (self.path / "nodes").glob("*.json"))
+
+    def load_nodes(self) -> Dict[str, Any]:
+        """Outputs of every checkpointed node, merged into one values dict"""
+        values = {}
+        for name in self.completed_nodes():
+            values.update(_read_json(self.path / "nodes" / f"{name}.json") or {})
+        return values
+
+    def save_research_state(self, state: Dict[str, Any]):
+        _write_json(self.path / "research_state.json", state)
+
+    def load_research_state(self, question: str = None) -> Optional[Dict[str, Any]]:
+        """Saved research state (None when absent or saved for a different question)"""
+        state = _read_json(self.path / "research_state.json")
+        if state and question is not None and state.get("question") != question:
+            return None
+        return state
@@ -0,0 +1,176 @@
+"""
+Citation Linker - Deterministic local replacement for the LLM citation rewrite pass
+- Splits the final answer into claims (sentences)
+- Matches each claim against tracked memory texts with a TF-IDF (unigram + bigram) index
+- Inserts [ID:...] tags above a confidence threshold without touching any other text
+- Skips headings, code blocks and table rows (a tag after a row's closing pipe breaks the table)
+- Optionally hands unmatched claims to a fallback resolver (e.g. a small LLM call)
+"""
+
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "for", "from", "has", "have",
+    "had", "he", "her", "his", "in", "is", "it", "its", "of", "on", "or", "she", "that", "the",
+    "their", "them", "they", "this", "to", "was", "were", "which", "with", "who", "will", "also",
+    "these", "those", "there", "than", "then", "into", "such", "not", "no", "all", "any", "both",
+    "each", "more", "most", "other", "some", "can", "may", "our", "your", "we", "you", "i",
+}
+
+# Citations the answer may already carry ([ID:abc] from the tracker, [Memory-abc] from the analysis prompt)
+EXISTING_CITATION = re.compile(r"\[(?:ID:|Memory-)[^\]]+\]")
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])(\s+)")
+# Tags go before closing punctuation and emphasis but after a closing bracket: "(x) [ID:a]."
+TRAILING_PUNCTUATION = re.compile(r"""([.!?:;,]*["'*_]*\s*)$""")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content words plus adjacent-word bigrams"""
+    words = [w for w in re.findall(r"[a-z0-9]+(?:[.'-][a-z0-9]+)*", text.lower()) if w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class CitationLinker:
+    """TF-IDF index over a session's tracked memories"""
+
+    def __init__(
+        self,
+        memory_references: Dict[str, Dict],
+        threshold: float = 0.22,
+        max_citations_per_claim: int = 2,
+        min_claim_terms: int = 3,
+    ):
+        self.threshold = threshold
+        self.max_citations_per_claim = max_citations_per_claim
+        self.min_claim_terms = min_claim_terms
+
+        self.memory_ids = []
+        documents = []
+        for memory_id, reference in memory_references.items():
+            text = (reference or {}).get("memory", "")
+            if text:
+                self.memory_ids.append(memory_id)
+                documents.append(Counter(tokenize(text)))
+
+        doc_freq = Counter(term for doc in documents for term in doc)
+        n_docs = len(documents)
+        self.idf = {term: math.log((n_docs + 1) / (df + 1)) + 1.0 for term, df in doc_freq.items()}
+
+        # Inverted index of L2-normalized TF-IDF weights: term -> [(memory index, weight)]
+        self.postings = defaultdict(list)
+        for index, doc in enumerate(documents):
+            weights = {term: tf * self.idf[term] for term, tf in doc.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                self.postings[term].append((index, weight / norm))
+
+    def match(self, claim: str) -> List[Tuple[str, float]]:
+        """Memory IDs supporting a claim, best first, above the confidence threshold"""
+        terms = Counter(t for t in tokenize(claim) if t in self.idf)
+        if sum(terms.values()) < self.min_claim_terms:
+            return []
+
+        weights = {term: tf * self.idf[term] for term, tf in terms.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+
+        scores = defaultdict(float)
+        for term, weight in weights.items():
+            for index, doc_weight in self.postings[term]:
+                scores[index] += (weight / norm) * doc_weight
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (self.memory_ids[index], score)
+            for index, score in ranked[: self.max_citations_per_claim]
+            if score >= self.threshold
+        ]
+
+    @staticmethod
+    def _segments(answer: str):
+        """Yield (text, is_claim) pieces that concatenate back to the exact answer"""
+        in_code_block = False
+        for line in answer.splitlines(keepends=True):
+            stripped = line.strip()
+            if stripped.startswith("```"):
+                in_code_block = not in_code_block
+                yield line, False
+                continue
+            if (
+                in_code_block
+                or not stripped
+                or stripped.startswith("#")
+                or stripped.startswith("|")
+                or set(stripped) <= set("-|: *=_")
+            ):
+                yield line, False
+                continue
+
+            for piece in SENTENCE_BOUNDARY.split(line):
+                yield piece, bool(piece.strip()) and not EXISTING_CITATION.search(piece)
+
+    @staticmethod
+    def _insert(sentence: str, memory_ids: List[str]) -> str:
+        tags = " ".join(f"[ID:{memory_id}]" for memory_id in memory_ids)
+        body = TRAILING_PUNCTUATION.sub("", sentence)
+        tail = sentence[len(body):]
+        return f"{body} {tags}{tail}"
+
+    def link(
+        self,
+        answer: str,
+        fallback: Optional[Callable[[List[str]], List[List[str]]]] = None,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Insert citations into an answer
+
+        Args:
+            answer: Final answer text (markdown)
+            fallback: Optional resolver given the unmatched claims, returning memory IDs per claim
+
+        Returns:
+            tuple: (answer with [ID:...] tags inserted, match statistics)
+        """
+        segments = list(self._segments(answer))
+        citations = {}
+        unmatched = []
+
+        for position, (text, is_claim) in enumerate(segments):
+            if not is_claim:
+                continue
+            matches = self.match(text)
+            if matches:
+                citations[position] = [memory_id for memory_id, _ in matches]
+            elif len(tokenize(text)) >= self.min_claim_terms:
+                unmatched.append(position)
+
+        fallback_cited = 0
+        if fallback and unmatched:
+            known_ids = set(self.memory_ids)
+            resolved = fallback([segments[position][0].strip() for position in unmatched])
+            for position, memory_ids in zip(unmatched, resolved or []):
+                memory_ids = [m for m in (memory_ids or []) if m in known_ids][: self.max_citations_per_claim]
+                if memory_ids:
+                    citations[position] = memory_ids
+                    fallback_cited += 1
+
+        linked = "".join(
+            self._insert(text, citations[position]) if position in citations else text
+            for position, (text, _) in enumerate(segments)
+        )
+
+        stats = {
+            "claims": sum(1 for _, is_claim in segments if is_claim),
+            "cited_locally": len(citations) - fallback_cited,
+            "cited_by_fallback": fallback_cited,
+            "unmatched": len(unmatched) - fallback_cited,
+        }
+        return linked, stats
+
+
+def citation_llm_fallback_enabled() -> bool:
+    """LLM matching of unlinked claims is opt-in via CITATION_LLM_FALLBACK=1"""
+    return os.getenv("CITATION_LLM_FALLBACK", "0").lower() in ("1", "true", "yes")
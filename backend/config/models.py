@@ -0,0 +1,43 @@
+"""
+Model tiers and call-site routing for the Deep Memory Research Pipeline.
+
+Each LLM call site is assigned a tier; each tier names one Gemini model.
+Overrides (no code change needed):
+  MODEL_TIER_<TIER>=<model name>   e.g. MODEL_TIER_DEEP=gemini-2.5-flash
+  MODEL_SITE_<SITE>=<tier>         e.g. MODEL_SITE_DECISION=fast
+"""
+
+# Tier -> model. Prices are USD per 1M (input, output) tokens, used for cost estimates only.
+MODEL_TIERS = {
+    "fast": {
+        "model_type": "gemini-2.5-flash-lite",
+        "max_tokens": 100000,
+        "cost_per_million": (0.10, 0.40),
+    },
+    "balanced": {
+        "model_type": "gemini-2.5-flash",
+        "max_tokens": 100000,
+        "cost_per_million": (0.30, 2.50),
+    },
+    "deep": {
+        "model_type": "gemini-2.5-pro",
+        "max_tokens": 100000,
+        "cost_per_million": (1.25, 10.00),
+    },
+}
+
+# Call site -> tier and sampling settings ("max_tokens" overrides the tier's; None leaves the backend default)
+CALL_SITES = {
+    "metadata": {"tier": "fast", "temperature": 0.3},
+    "plan": {"tier": "fast", "temperature": 0.3},
+    "decision": {"tier": "deep", "temperature": 0.2},
+    "final_answer": {"tier": "deep", "temperature": 0.2},
+    "analysis_methodology": {"tier": "deep", "temperature": 0.2},
+    "analysis_data_quality": {"tier": "deep", "temperature": 0.2},
+    "analysis_findings": {"tier": "deep", "temperature": 0.2},
+    "analysis_synthesis": {"tier": "deep", "temperature": 0.2},
+    "citation": {"tier": "balanced", "temperature": 0.1, "max_tokens": None},
+    "memory_extraction": {"tier": "balanced", "temperature": 0.2, "api_key_env": "GOOGLE_API_KEY"},
+}
+
+DEFAULT_API_KEY_ENV = "GEMINI_API_KEY"
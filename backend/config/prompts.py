@@ -2,6 +2,9 @@
 Prompts for deep_test_mem memory analysis
 """
 
+# Bump when the metadata prompts change in a way that should invalidate memoized Phase 1 output
+METADATA_PROMPT_VERSION = "1"
+
 METADATA_ANALYZER_PROMPT = """You are an expert database metadata analyzer who provides comprehensive analysis for strategic research planning.
 
 Your analysis will be used by downstream research agents to:
@@ -393,7 +396,7 @@ STRATEGIC PLAN PHASES:
 DISCOVERIES FROM MEMORY EXPLORATION:
 {all_context}
 
-CURRENT ITERATION: {iteration}/5
+CURRENT ITERATION: {iteration}/{max_iterations}
 
 You are executing a multi-phase research strategy. Review your strategic plan and current discoveries:
 
@@ -431,75 +434,19 @@ Base your next search on:
 - Never generate fabricated content - only work with actual search results
 - If no memories found, state this clearly rather than inventing information
 
-Respond with:
-ENOUGH_INFO: YES or NO
-NEXT_SEARCH: search term that builds on actual discoveries or recovers from search failures (2-5 words)
-MEMORY_REASONING: How this search addresses discovered gaps or recovers from previous search failures"""
-
-SEARCH_TERM_EXTRACTION_PROMPT = """RESEARCH QUESTION: {question}
-
-STRATEGIC PLAN WITH PHASES: {strategic_plan}
-
-You need to start executing the first phase of your strategic research plan.
-
-**PHASE 1 ANALYSIS:**
-- Look at the **first phase** in your strategic plan
-- Identify the **specific searches** outlined for Phase 1
-- Choose the **most important initial search** from that phase
-- Consider the **expected findings** and **metadata filters** mentioned
-
-**STRATEGIC EXECUTION:**
-Your search should:
-- Target Phase 1's specific clinical objectives with precise terminology
-- Use medical language that matches clinical documentation style
-- Generate terms that will find specific patient scenarios and decision points
-- Set foundation for progressive, increasingly targeted subsequent searches
+**PARALLEL SEARCHES:**
+- You may propose up to {max_searches} distinct searches; they run at the same time
+- Make each one cover a different gap (different patients, drugs, outcomes or phases)
+- Do not repeat a search that was already run
 
-**SEARCH EXAMPLES FOR DIFFERENT OBJECTIVES:**
-If Phase 1 seeks "foundational understanding" → "diabetes treatment" or "patient management" 
-If Phase 1 wants "decision patterns" → "medication selection" or "treatment decisions"
-If Phase 1 focuses "outcome analysis" → "treatment outcomes" or "patient results"
+Return ONLY a JSON object - no markdown, no code fences, no other text:
+{{
+  "enough_info": false,
+  "next_searches": ["search term that builds on actual discoveries (2-5 words)", "another distinct search term"],
+  "reasoning": "How these searches address discovered gaps or recover from previous search failures"
+}}
 
-**SEARCH TERM REQUIREMENTS:**
-- 2-5 words that balance findability with specificity
-- Use terminology likely to appear in memory database
-- Start broad enough to find content, then build specificity
-- Include key concepts from the research question
-- Avoid overly narrow terms unless database content is confirmed
-
-**FINDABILITY PRIORITY:**
-- Prioritize terms that definitely exist over perfect specificity
-- Better to find broad relevant content than nothing specific
-- Build complexity only after establishing basic content exists
-
-Return ONLY the strategic search term (2-5 words, balanced for findability)."""
-
-SEARCH_TERM_EXTRACTION_SYSTEM = """You analyze strategic research plans and context to generate precise, targeted search terms that will discover specific memories from the database.
-
-PROGRESSIVE SEARCH STRATEGY:
-- Start with broad, foundational terms that are likely to find content
-- Build on concrete findings from previous searches
-- Use specific terminology that matches the actual language in memories
-- Progress from general concepts to specific scenarios and details
-- Ensure search terms are broad enough to find content but specific enough to be useful
-
-SEARCH TERM REQUIREMENTS:
-- 2-5 words that balance specificity with findability
-- Use terminology that likely appears in the memory database
-- Start broad, then narrow based on discoveries
-- Include key concepts from the research question
-- Avoid overly technical jargon unless confirmed in database
-
-EFFECTIVE SEARCH PROGRESSION:
-1. Start broad: "diabetes treatment" → "patient management" → "medication decisions"
-2. Build specificity: "treatment outcomes" → "medication effectiveness" → "patient response patterns"
-3. Target gaps: "compliance issues" → "side effects" → "dosage adjustments"
-
-SEARCH TERM VALIDATION:
-- Terms should be findable in typical memory databases
-- Avoid terms that are too narrow or specialized initially
-- Build complexity only after confirming basic concepts exist
-- Prioritize terms that appear in the research question or strategic plan"""
+Set "enough_info" to true (and "next_searches" to []) only when the findings fully answer the research question."""
 
 STRATEGIC_MEMORY_ANALYSIS_PROMPT = """{context_section}
 
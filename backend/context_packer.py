@@ -0,0 +1,98 @@
+"""
+Context Packer - Token-budgeted research context for decision and answer prompts
+- De-duplicates memories by ID across iterations (keeping the best score)
+- Orders memories by relevance and fits them to a token budget
+- Renders memories from older iterations as compressed one-line summaries
+"""
+
+from typing import Any, Dict, List
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+class ContextPacker:
+    """Accumulates research findings and packs them into a bounded prompt section"""
+
+    def __init__(self, recent_iterations: int = 2, summary_chars: int = 160):
+        self.recent_iterations = recent_iterations
+        self.summary_chars = summary_chars
+        self.memories: Dict[str, Dict[str, Any]] = {}
+        self.searches: List[Dict[str, Any]] = []
+        self.latest_iteration = 0
+
+    def add(self, iteration: int, searches: List[str], results: List[Dict[str, Any]]):
+        """Record one iteration's searches and their (merged) results"""
+        self.latest_iteration = max(self.latest_iteration, iteration)
+        self.searches.append({"iteration": iteration, "searches": list(searches), "found": len(results)})
+
+        for i, result in enumerate(results, 1):
+            memory_id = result.get("id", f"unknown_{iteration}_{i}")
+            score = result.get("score") or 0.0
+            entry = self.memories.get(memory_id)
+            if entry is None:
+                metadata = result.get("metadata") or {}
+                self.memories[memory_id] = {
+                    "id": memory_id,
+                    "memory": result.get("memory", ""),
+                    "patient": metadata.get("patient_name", "Unknown"),
+                    "score": score,
+                    "iteration": iteration,
+                }
+            else:
+                entry["score"] = max(entry["score"], score)
+                entry["iteration"] = max(entry["iteration"], iteration)
+
+    def _render(self, entry: Dict[str, Any], compressed: bool) -> str:
+        text = " ".join(entry["memory"].split())
+        if compressed and len(text) > self.summary_chars:
+            text = text[: self.summary_chars].rsplit(" ", 1)[0] + "..."
+        return f"- [ID:{entry['id']}] [{entry['patient']}] {text} (relevance {entry['score']:.2f})"
+
+    def pack(self, token_budget: int) -> str:
+        """
+        Render the accumulated context within a token budget
+
+        Args:
+            token_budget: Estimated tokens the packed section may use
+
+        Returns:
+            str: Search history plus the most relevant memories that fit
+        """
+        history = "SEARCHES RUN:\n" + "".join(
+            f"- Iteration {s['iteration']}: {', '.join(repr(q) for q in s['searches'])} ({s['found']} memories)\n"
+            for s in self.searches
+        )
+
+        header = f"\nMEMORIES DISCOVERED ({len(self.memories)} unique, most relevant first):\n"
+        lines = []
+        used = estimate_tokens(history + header)
+        omitted = 0
+        recent_from = self.latest_iteration - self.recent_iterations + 1
+        ranked = sorted(self.memories.values(), key=lambda e: e["score"], reverse=True)
+
+        for entry in ranked:
+            # Older findings start compressed; recent ones fall back to compressed when space runs out
+            candidates = [self._render(entry, compressed=True)]
+            if entry["iteration"] >= recent_from:
+                candidates.insert(0, self._render(entry, compressed=False))
+
+            for line in candidates:
+                cost = estimate_tokens(line) + 1
+                if used + cost <= token_budget:
+                    lines.append(line)
+                    used += cost
+                    break
+            else:
+                omitted += 1
+
+        packed = history + header + "\n".join(lines)
+        if omitted:
+            packed += f"\n({omitted} lower-relevance memories omitted to fit the context budget)"
+        return packed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Unique memories and iterations recorded so far"""
+        return {"unique_memories": len(self.memories), "iterations": len(self.searches)}
@@ -0,0 +1,216 @@
+"""
+Event Bus - Levelled, typed pipeline events with pluggable sinks
+- Modules publish events (log lines, progress updates, LLM outputs); sinks decide what to render or keep
+- A process-wide bus feeds the console; each pipeline run binds its own bus through a contextvar
+  that feeds the session log, the SSE progress stream and the session event file
+- Worker threads started with contextvars.copy_context() publish into their run's bus
+- Quiet/production mode: CONSOLE_LOG_LEVEL=off turns console rendering off entirely
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+
+# Event types published by the pipeline
+LOG = "log"                # Human-readable status line
+PROGRESS = "progress"      # Phase progress for the SSE stream: phase, status, data
+LLM_OUTPUT = "llm_output"  # Full LLM output (metadata, plan, reports) - debug level
+
+
+def _level_value(level: str) -> int:
+    return LEVELS.get(str(level).lower(), LEVELS["info"])
+
+
+def make_event(event_type: str, message: str = "", level: str = "info", **data) -> Dict[str, Any]:
+    """Build an event record"""
+    return {"type": event_type, "level": level, "timestamp": time.time(), "message": message, **data}
+
+
+class EventBus:
+    """Dispatches events to subscribed sinks filtered by level and type"""
+
+    def __init__(self):
+        self._subscribers: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, sink: Callable[[Dict[str, Any]], None], min_level: str = "debug",
+                  types: Iterable[str] = None) -> Callable[[Dict[str, Any]], None]:
+        """
+        Subscribe a sink
+
+        Args:
+            sink: Callable receiving each event dict
+            min_level: Lowest level delivered to the sink
+            types: Event types delivered to the sink (all when None)
+
+        Returns:
+            The sink, for unsubscribe()
+        """
+        entry = (sink, _level_value(min_level), frozenset(types) if types else None)
+        with self._lock:
+            self._subscribers.append(entry)
+        return sink
+
+    def unsubscribe(self, sink: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            self._subscribers = [entry for entry in self._subscribers if entry[0] is not sink]
+
+    def wants(self, event_type: str, level: str) -> bool:
+        """Whether any sink would receive an event (lets callers skip building expensive payloads)"""
+        value = _level_value(level)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return any(value >= min_value and (types is None or event_type in types)
+                   for _, min_value, types in subscribers)
+
+    def publish(self, event: Dict[str, Any]):
+        """Deliver an event to matching sinks (a failing sink never breaks the pipeline)"""
+        value = _level_value(event.get("level", "info"))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sink, min_value, types in subscribers:
+            if value < min_value or (types is not None and event["type"] not in types):
+                continue
+            try:
+                sink(event)
+            except Exception:
+                pass
+
+
+class ConsoleSink:
+    """Plain-text console renderer (no rich markup, multi-KB outputs are not rendered)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event: Dict[str, Any]):
+        prefix = "" if event["level"] in ("info", "debug") else f"[{event['level']}] "
+        (self.stream or sys.stdout).write(f"{prefix}{event['message']}\n")
+
+
+class JsonlFileSink:
+    """Appends events as JSON lines to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class RunLog:
+    """Bounded, thread-safe session log of one pipeline run (returned as the API 'logs')"""
+
+    def __init__(self, session_id: str, max_records: int = 5000):
+        self.session_id = session_id
+        self.max_records = max_records
+        self._records: List[Dict[str, Any]] = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        with self._lock:
+            self._records.append(event)
+            if len(self._records) > self.max_records:
+                self._records.pop(0)
+                self._dropped += 1
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._records)
+
+    def text(self) -> str:
+        """Plain-text log, one record per line"""
+        with self._lock:
+            lines = [record["message"] for record in self._records]
+            dropped = self._dropped
+        if dropped:
+            lines.insert(0, f"({dropped} earlier log lines dropped)")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+def console_log_level() -> str:
+    """Console level from CONSOLE_LOG_LEVEL (debug|info|warning|error|off)"""
+    level = os.getenv("CONSOLE_LOG_LEVEL", "info").lower()
+    return level if level in LEVELS else "info"
+
+
+# Process-wide bus: console rendering (progress events are mirrored by log lines, so not rendered)
+_process_bus: EventBus = None
+_process_bus_lock = threading.Lock()
+
+
+def get_process_bus() -> EventBus:
+    """Process-wide bus, built on first use so .env loaded by the entry point sets the console level"""
+    global _process_bus
+    if _process_bus is None:
+        with _process_bus_lock:
+            if _process_bus is None:
+                bus = EventBus()
+                bus.subscribe(ConsoleSink(), min_level=console_log_level(), types=(LOG, LLM_OUTPUT))
+                _process_bus = bus
+    return _process_bus
+
+_current_bus: contextvars.ContextVar = contextvars.ContextVar("current_event_bus", default=None)
+
+
+def get_run_bus() -> Optional[EventBus]:
+    """Run bus bound to the current context, if any"""
+    return _current_bus.get()
+
+
+@contextmanager
+def bind_event_bus(bus: EventBus):
+    """Route events in this context (and contexts copied from it) to a run's bus"""
+    token = _current_bus.set(bus)
+    try:
+        yield bus
+    finally:
+        _current_bus.reset(token)
+
+
+def wants(event_type: str, level: str = "info") -> bool:
+    """Whether an event of this type/level would reach any sink"""
+    run_bus = _current_bus.get()
+    return get_process_bus().wants(event_type, level) or (run_bus is not None and run_bus.wants(event_type, level))
+
+
+def emit(event_type: str, message: str = "", level: str = "info", **data):
+    """Publish an event to the process bus and the current run's bus"""
+    event = make_event(event_type, message, level, **data)
+    get_process_bus().publish(event)
+    run_bus = _current_bus.get()
+    if run_bus is not None:
+        run_bus.publish(event)
+
+
+def log(*args, level: str = "info", **fields):
+    """
+    Publish a log line
+
+    Accepts print-style positional arguments so it can stand in for print/rprint.
+    """
+    emit(LOG, " ".join(str(arg) for arg in args), level, **fields)
+
+
+def emit_progress(phase: str, status: str, data: Any = None):
+    """Publish a phase progress update (the SSE stream subscribes to these)"""
+    emit(PROGRESS, "", "info", phase=phase, status=status, data=data)
+
+
+def log_llm_output(label: str, content: str):
+    """Publish a full LLM output at debug level (skipped when no sink wants it)"""
+    if wants(LLM_OUTPUT, "debug"):
+        emit(LLM_OUTPUT, f"{label}:\n{content}", "debug", label=label)
@@ -5,7 +5,6 @@ import os
 import random
 import warnings
 from dotenv import load_dotenv
-from mem0 import MemoryClient
 from rich import print as rprint
 from rich.panel import Panel
 
@@ -15,18 +14,26 @@ from camel.types import ModelPlatformType
 from camel.agents import ChatAgent
 from camel.messages import BaseMessage
 
+from memory_client import get_memory_client
+
 warnings.filterwarnings("ignore", category=DeprecationWarning)
-load_dotenv()
 
 # Configuration
 DOCTOR_MEMORY_ID = "doctor_memory"  # set user id constant as if one doctor examining multiple patients and mem0 is his personal memory silo
-mem0 = MemoryClient()
-model = ModelFactory.create(
-    model_platform=ModelPlatformType.GEMINI,
-    model_type="gemini-2.5-flash",
-    api_key=os.getenv("GOOGLE_API_KEY"),
-    model_config_dict={"temperature": 0.3, "max_tokens": 100000},
-)
+_model = None
+
+
+def get_generator_model():
+    """Gemini model for patient generation, created on first use rather than at import"""
+    global _model
+    if _model is None:
+        _model = ModelFactory.create(
+            model_platform=ModelPlatformType.GEMINI,
+            model_type="gemini-2.5-flash",
+            api_key=os.getenv("GOOGLE_API_KEY"),
+            model_config_dict={"temperature": 0.3, "max_tokens": 100000},
+        )
+    return _model
 
 
 def create_patient_disease_combo():
@@ -72,7 +79,7 @@ Return ONLY raw JSON - no markdown, no code blocks, no ```json formatting:
 Use realistic medical data, actual drug names with mg/mcg dosages, real BP/HR/lab values.""",
     )
 
-    agent = ChatAgent(system_message=system_message, model=model)
+    agent = ChatAgent(system_message=system_message, model=get_generator_model())
     response = agent.step(
         BaseMessage.make_user_message("User", "Generate unique patient-disease data")
     )
@@ -93,8 +100,8 @@ def generate_conversation(patient_disease_combo, rounds=5):
         user_role_name="Patient",
         task_prompt=f"Medical consultation based on: {raw_data}",
         with_task_specify=False,
-        assistant_agent_kwargs={"model": model},
-        user_agent_kwargs={"model": model},
+        assistant_agent_kwargs={"model": get_generator_model()},
+        user_agent_kwargs={"model": get_generator_model()},
         extend_sys_msg_meta_dicts=[
             {
                 "assistant_role": "Dr. Sarah Chen",
@@ -163,7 +170,7 @@ Return only the medical facts, one per line, each starting with the patient's fu
             content="You are a medical summarizer. Create specific medical facts from conversations.",
         )
 
-        agent = ChatAgent(system_message=system_message, model=model)
+        agent = ChatAgent(system_message=system_message, model=get_generator_model())
         response = agent.step(BaseMessage.make_user_message("User", summary_prompt))
 
         # Split into individual facts and clean them
@@ -202,7 +209,7 @@ def store_patient_summary(conversations, patient_disease_combo):
     for fact in summary_facts:
         if fact.strip() and patient_name in fact:
             try:
-                mem0.add(
+                get_memory_client().add(
                     messages=[{"role": "assistant", "content": fact}],
                     user_id=DOCTOR_MEMORY_ID,
                     agent_id=agent_id,
@@ -217,6 +224,12 @@ def store_patient_summary(conversations, patient_disease_combo):
             except Exception as e:
                 rprint(f"[red]Error storing fact: {e}[/red]")
 
+    # New memories change the corpus - drop memoized metadata and force a full re-sync
+    if stored:
+        from phase_cache import invalidate_user_caches
+
+        invalidate_user_caches(DOCTOR_MEMORY_ID)
+
     return stored
 
 
@@ -266,7 +279,7 @@ def get_memory_status():
     """Check memory database status from mem0"""
     rprint("[yellow]Checking memory status...[/yellow]")
     try:
-        memories = mem0.search(
+        memories = get_memory_client().search(
             query="Dr. Sarah Chen", user_id=DOCTOR_MEMORY_ID, limit=100
         )
         count = len(memories) if memories else 0
@@ -280,9 +293,13 @@ def get_memory_status():
 def clear_memory():
     """Clear all memories from database"""
     try:
-        mem0.delete_all(
+        get_memory_client().delete_all(
             user_id=DOCTOR_MEMORY_ID
         )  # you can use this but not relevant to this usecase of population anyways
+
+        from phase_cache import invalidate_user_caches
+
+        invalidate_user_caches(DOCTOR_MEMORY_ID)
         rprint("[green]Memory database cleared[/green]")
         return True
     except Exception as e:
@@ -291,6 +308,8 @@ def clear_memory():
 
 
 if __name__ == "__main__":
+    load_dotenv()
+
     # Uncomment the following line to clear all existing memories before starting
     # clear_memory()  # This will delete all stored memories for DOCTOR_MEMORY_ID
 
@@ -0,0 +1,211 @@
+"""
+Research Jobs - Bounded worker pool for pipeline runs
+- submit() returns a job ID immediately; runs execute on a fixed-size thread pool
+- Admission control: submissions beyond the worker + queue capacity are rejected, as are
+  runs for a session that already has an active job
+- Each job keeps its progress events, status and final result for polling or streaming
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobQueueFull(Exception):
+    """Raised when the worker pool and its queue are at capacity"""
+
+
+class SessionBusy(Exception):
+    """Raised when a session already has a queued or running job"""
+
+
+class ResearchJob:
+    """One pipeline run: status, progress events and result"""
+
+    TERMINAL = ("succeeded", "failed")
+
+    def __init__(self, params: Dict[str, Any], max_events: int = 1000):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.session_id = None
+        self.result = None
+        self.error = None
+        self.max_events = max_events
+        self.events: List[Dict[str, Any]] = []
+        self.future = None  # concurrent.futures.Future of the worker run
+        self._dropped_events = 0
+        self._changed = threading.Condition()
+
+    def emit(self, phase: str, status: str, data: Any = None):
+        """Record a progress event (same shape as the /stream events)"""
+        event = {"phase": phase, "status": status, "timestamp": time.time(), "data": data}
+        with self._changed:
+            self.events.append(event)
+            if len(self.events) > self.max_events:
+                # Keep the stream bounded; cursors are absolute so readers skip dropped events
+                self.events.pop(0)
+                self._dropped_events += 1
+            self._changed.notify_all()
+
+    def _set_status(self, status: str):
+        with self._changed:
+            self.status = status
+            self._changed.notify_all()
+
+    @property
+    def done(self) -> bool:
+        return self.status in self.TERMINAL
+
+    def events_since(self, cursor: int = 0, timeout: float = None) -> tuple:
+        """
+        Events after an absolute cursor, optionally waiting for new ones
+
+        Returns:
+            tuple: (events, next cursor)
+        """
+        with self._changed:
+            end = self._dropped_events + len(self.events)
+            if cursor >= end and not self.done and timeout:
+                self._changed.wait(timeout)
+                end = self._dropped_events + len(self.events)
+            start = max(cursor - self._dropped_events, 0)
+            return self.events[start:], end
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job finishes, returns whether it did"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.done, timeout)
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """Job status summary (optionally with the full result)"""
+        with self._changed:
+            latest = self.events[-1] if self.events else None
+            summary = {
+                "job_id": self.job_id,
+                "status": self.status,
+                "session_id": self.session_id,
+                "question": self.params.get("question"),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "events": self._dropped_events + len(self.events),
+                "latest_progress": latest,
+                "error": self.error,
+            }
+        if include_result:
+            summary["result"] = self.result
+        return summary
+
+
+class JobManager:
+    """Runs research jobs on a bounded pool and keeps recent jobs for lookup"""
+
+    def __init__(self, max_workers: int = 2, max_queued: int = 8, max_finished: int = 100):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ResearchJob] = {}
+
+    def _active_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.done]
+        finished.sort(key=lambda job: job.finished_at or 0)
+        for job in finished[: max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job.job_id]
+
+    def submit(
+        self, runner: Callable[[ResearchJob], Dict[str, Any]], session_id: str = None, **params
+    ) -> ResearchJob:
+        """
+        Queue a pipeline run
+
+        Args:
+            runner: Callable executing the run for a job and returning its result
+            session_id: Existing session the run continues (at most one active job per session)
+            **params: Request parameters stored on the job (question, user_id, ...)
+
+        Raises:
+            JobQueueFull: When running + queued jobs would exceed capacity
+            SessionBusy: When session_id already has an active job
+        """
+        with self._lock:
+            if session_id:
+                for active in self._jobs.values():
+                    if active.session_id == session_id and not active.done:
+                        raise SessionBusy(f"Session {session_id} is still running in job {active.job_id}")
+            if self._active_count() >= self.max_workers + self.max_queued:
+                raise JobQueueFull(
+                    f"Research queue is full ({self.max_workers} running, {self.max_queued} queued)"
+                )
+            job = ResearchJob(params)
+            job.session_id = session_id
+            self._jobs[job.job_id] = job
+            self._prune()
+
+        job.future = self._executor.submit(self._run, job, runner)
+        return job
+
+    def _run(self, job: ResearchJob, runner: Callable[[ResearchJob], Dict[str, Any]]):
+        job.started_at = time.time()
+        job._set_status("running")
+        try:
+            job.result = runner(job)
+            status = "succeeded" if (job.result or {}).get("success", True) else "failed"
+            if status == "failed":
+                job.error = job.result.get("error", "Pipeline failed")
+        except Exception as e:
+            job.error = str(e)
+            status = "failed"
+        job.finished_at = time.time()
+        job._set_status(status)
+
+    def get(self, job_id: str) -> Optional[ResearchJob]:
+        """Look up a job by ID"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Summaries of all known jobs, newest first"""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+        return [job.to_dict() for job in jobs]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool capacity and current load"""
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job.status == "running")
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "running": running,
+            "queued": queued,
+        }
+
+
+# Process-wide job manager for the API server (sized from env)
+_manager: JobManager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Get the shared job manager"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(
+                max_workers=int(os.getenv("RESEARCH_MAX_WORKERS", "2")),
+                max_queued=int(os.getenv("RESEARCH_MAX_QUEUED", "8")),
+            )
+        return _manager
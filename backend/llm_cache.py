@@ -0,0 +1,339 @@
+"""
+LLM Response Cache - Content-addressed on-disk cache in front of ChatAgent.step
+Entries are keyed on model, model config (temperature etc.), system prompt,
+prior conversation and user prompt, and evicted by size (LRU) and age (TTL).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from camel.messages import BaseMessage
+from camel.responses import ChatAgentResponse
+from camel.types import OpenAIBackendRole
+
+from event_bus import log
+from utils import CACHE_DIR
+from model_router import record_llm_call
+from replay import get_fixture_store, replay_mode, request_key
+from tracing import span
+
+
+def describe_agent(agent) -> Dict[str, Any]:
+    """Collect the parts of an agent's configuration that determine its output"""
+    pool_key = getattr(agent, "_pool_model_key", None)
+    if pool_key:
+        platform, model_type, config_json = pool_key[:3]
+        config = json.loads(config_json)
+    else:
+        backend = getattr(agent, "model_backend", None)
+        platform = ""
+        model_type = str(getattr(backend, "model_type", "unknown"))
+        config = getattr(backend, "model_config_dict", {}) or {}
+
+    system_message = getattr(agent, "system_message", None)
+    return {
+        "platform": platform,
+        "model": model_type,
+        "temperature": config.get("temperature"),
+        "config": config,
+        "system_prompt": getattr(system_message, "content", "") or "",
+    }
+
+
+def get_conversation(agent) -> list:
+    """Prior turns held in the agent's memory (empty for a fresh agent)"""
+    try:
+        history = agent.chat_history
+    except Exception:
+        return []
+    return [message for message in history if message.get("role") != "system"]
+
+
+class LLMResponseCache:
+    """Bounded disk cache of LLM responses with LRU/TTL eviction and hit/miss counters"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int, ttl_seconds: float, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._index = None  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0}
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        """Build the cache from LLM_CACHE_* environment variables"""
+        return cls(
+            cache_dir=Path(os.getenv("LLM_CACHE_DIR", str(CACHE_DIR / "llm_responses"))),
+            max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600,
+            enabled=os.getenv("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no"),
+        )
+
+    @staticmethod
+    def make_key(description: Dict[str, Any], conversation: list, prompt: str) -> str:
+        """Content address for a single step"""
+        payload = json.dumps(
+            {
+                "platform": description["platform"],
+                "model": description["model"],
+                "config": description["config"],
+                "system_prompt": hashlib.sha256(description["system_prompt"].encode("utf-8")).hexdigest(),
+                "conversation": conversation,
+                "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self):
+        """Scan the cache directory once, ordering entries by last access (mtime)"""
+        if self._index is not None:
+            return
+
+        entries = []
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+
+    def _remove(self, key: str):
+        size = self._index.pop(key, 0)
+        self._total_bytes -= size
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            oldest_key = next(iter(self._index))
+            self._remove(oldest_key)
+            self.stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, or None on miss/expiry"""
+        with self._lock:
+            self._load_index()
+
+            if key not in self._index:
+                self.stats["misses"] += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._remove(key)
+                self.stats["misses"] += 1
+                return None
+
+            if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+                self._remove(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            # Touch for LRU ordering (also survives restarts via mtime)
+            self._index.move_to_end(key)
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+
+            self.stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, content: str, description: Dict[str, Any]):
+        """Store a response and evict least recently used entries past the size cap"""
+        entry = {
+            "key": key,
+            "model": description["model"],
+            "temperature": description["temperature"],
+            "created_at": time.time(),
+            "content": content,
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        with self._lock:
+            self._load_index()
+
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+            self.stats["writes"] += 1
+
+            self._evict()
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._remove(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "enabled": self.enabled,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._index) if self._index is not None else None,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Process-wide cache instance
+llm_cache = LLMResponseCache.from_env()
+
+
+def _usage(response, prompt: str) -> tuple:
+    """(input, output) tokens reported by the backend, estimated from text length when missing"""
+    usage = (getattr(response, "info", None) or {}).get("usage") or {}
+    content = response.msg.content if response.msgs else ""
+    input_tokens = usage.get("prompt_tokens") or (len(prompt) + 3) // 4
+    output_tokens = usage.get("completion_tokens") or (len(content or "") + 3) // 4
+    return input_tokens, output_tokens
+
+
+def replay_key(agent, prompt: str, site: Optional[str]) -> str:
+    """Fixture key for a step: call site, system prompt, prior conversation and prompt (not the model backend)"""
+    system_prompt = describe_agent(agent)["system_prompt"]
+    return request_key(site, system_prompt, get_conversation(agent), prompt)
+
+
+def _write_to_memory(agent, user_message, content: str) -> BaseMessage:
+    """Add a user/assistant exchange to the agent's memory as if the step had run live"""
+    assistant_message = BaseMessage.make_assistant_message(
+        role_name=getattr(agent, "role_name", "Assistant"),
+        content=content,
+    )
+    try:
+        agent.update_memory(user_message, OpenAIBackendRole.USER)
+        agent.update_memory(assistant_message, OpenAIBackendRole.ASSISTANT)
+    except Exception as e:
+        log(f"Could not write cached exchange to agent memory: {e}", level="warning")
+    return assistant_message
+
+
+def _live_step(agent, user_message, prompt: str, site: Optional[str]):
+    recording = replay_mode() == "record"
+    key = replay_key(agent, prompt, site) if recording else None
+    with span(f"llm:{site or 'unrouted'}", kind="llm") as llm_span:
+        started = time.perf_counter()
+        response = agent.step(user_message)
+        latency = time.perf_counter() - started
+        input_tokens, output_tokens = _usage(response, prompt)
+        llm_span.set(input_tokens=input_tokens, output_tokens=output_tokens)
+    if site:
+        record_llm_call(site, latency, input_tokens, output_tokens)
+    if recording:
+        get_fixture_store("llm").record(
+            key, site or "unrouted", response.msg.content if response.msgs else "", latency,
+            usage={"input_tokens": input_tokens, "output_tokens": output_tokens},
+        )
+    return response
+
+
+def _replayed_step(agent, user_message, prompt: str, site: Optional[str]):
+    """Serve a recorded response (offline replay) with the recorded or configured latency"""
+    store = get_fixture_store("llm")
+    with span(f"llm:{site or 'unrouted'}", kind="llm", replayed=True) as llm_span:
+        started = time.perf_counter()
+        record = store.lookup(replay_key(agent, prompt, site), site or "unrouted")
+        if record is None:
+            raise LookupError(f"No recorded LLM response left for call site '{site}' in {store.path}")
+        store.delay(record)
+        latency = time.perf_counter() - started
+        usage = record.get("usage") or {}
+        input_tokens = usage.get("input_tokens", (len(prompt) + 3) // 4)
+        output_tokens = usage.get("output_tokens", (len(record["response"]) + 3) // 4)
+        llm_span.set(input_tokens=input_tokens, output_tokens=output_tokens)
+    if site:
+        record_llm_call(site, latency, input_tokens, output_tokens)
+    return ChatAgentResponse(
+        msgs=[_write_to_memory(agent, user_message, record["response"])],
+        terminated=False,
+        info={"replayed": True, "usage": {"prompt_tokens": input_tokens, "completion_tokens": output_tokens}},
+    )
+
+
+def cached_step(agent, prompt: str, role_name: str = "User", site: Optional[str] = None):
+    """
+    Drop-in replacement for agent.step(BaseMessage.make_user_message(role_name, prompt))
+
+    On a hit the exchange is written into the agent's memory so later turns
+    see the same conversation they would have after a live call. When a call
+    site is given, latency and token usage are recorded against its model tier.
+    Record/replay mode (replay.py) bypasses the cache so every call is captured or served from fixtures.
+    """
+    user_message = BaseMessage.make_user_message(role_name=role_name, content=prompt)
+
+    mode = replay_mode()
+    if mode == "replay":
+        return _replayed_step(agent, user_message, prompt, site)
+    if not llm_cache.enabled or mode == "record":
+        return _live_step(agent, user_message, prompt, site)
+
+    description = describe_agent(agent)
+    key = llm_cache.make_key(description, get_conversation(agent), prompt)
+
+    entry = llm_cache.get(key)
+    if entry is not None:
+        assistant_message = _write_to_memory(agent, user_message, entry["content"])
+        if site:
+            record_llm_call(site, 0.0, 0, 0, cached=True)
+        with span(f"llm:{site or 'unrouted'}", kind="llm_cached"):
+            pass
+        return ChatAgentResponse(
+            msgs=[assistant_message],
+            terminated=False,
+            info={"cached": True, "cache_key": key},
+        )
+
+    response = _live_step(agent, user_message, prompt, site)
+
+    content = response.msg.content if response.msgs else ""
+    if content and content.strip():
+        try:
+            llm_cache.put(key, content, description)
+        except OSError as e:
+            log(f"LLM cache write failed: {e}", level="warning")
+
+    return response
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get LLM cache summary - convenience function"""
+    return llm_cache.get_stats()
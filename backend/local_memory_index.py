@@ -0,0 +1,303 @@
+"""
+Local Memory Index - NumPy mirror of a user's mem0 memories for in-process search
+- Pulls a user's memories once and embeds them through a pluggable embedder
+- Answers search(query, limit) with vectorized cosine similarity: top-k above a cutoff on the
+  embedder's own scale (mem0's score threshold does not carry over to another embedder)
+- An empty local result is an answer; the hosted mem0 search is only used when no usable
+  mirror exists (never built, refresh failed, embedding size mismatch)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+import numpy as np
+from event_bus import log
+from tracing import span
+
+from utils import CACHE_DIR
+from memory_sync import snapshot_enabled, get_snapshot_store
+
+
+class HashingEmbedder:
+    """Deterministic offline embedder (hashed unigrams + bigrams), useful for benchmarks"""
+
+    name = "hashing"
+    # Unrelated texts score near 0 (hash collisions stay below ~0.1); relevant matches score 0.2+
+    default_threshold = 0.15
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        tokens = re.findall(r"[a-z0-9]+", text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return np.vstack([self._vector(text) for text in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self._vector(text)
+
+
+class GeminiEmbedder:
+    """Gemini text embeddings (documents and queries use their retrieval task types)"""
+
+    name = "gemini"
+    # text-embedding-004 scores loosely related texts around 0.3-0.4
+    default_threshold = 0.45
+
+    def __init__(self, model: str = "models/text-embedding-004", api_key: str = None, batch_size: int = 100):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+        self._genai = genai
+        self.model = model
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            result = self._genai.embed_content(
+                model=self.model, content=batch, task_type="retrieval_document"
+            )
+            vectors.extend(result["embedding"])
+        return np.asarray(vectors, dtype=np.float32)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        result = self._genai.embed_content(
+            model=self.model, content=text, task_type="retrieval_query"
+        )
+        return np.asarray(result["embedding"], dtype=np.float32)
+
+
+def get_default_embedder():
+    """Pick the embedder from LOCAL_MEMORY_EMBEDDER (gemini when a key is available, else hashing)"""
+    choice = os.getenv("LOCAL_MEMORY_EMBEDDER")
+    if choice is None:
+        choice = "gemini" if os.getenv("GEMINI_API_KEY") else "hashing"
+    if choice == "gemini":
+        return GeminiEmbedder()
+    return HashingEmbedder()
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class LocalMemoryIndex:
+    """In-memory cosine-similarity index over one user's memories"""
+
+    def __init__(
+        self, user_id: str, client, embedder=None, max_age_seconds: float = 900, limit: int = 1000,
+        threshold: float = None,
+    ):
+        self.user_id = user_id
+        self.client = client
+        self.embedder = embedder or get_default_embedder()
+        self.max_age_seconds = max_age_seconds
+        self.limit = limit
+        # Local cosine cutoff, on the embedder's scale
+        self.threshold = threshold if threshold is not None else getattr(self.embedder, "default_threshold", 0.0)
+
+        self._lock = threading.Lock()
+        self._memories = []
+        self._matrix = None  # (n_memories, dim), rows L2-normalized
+        self._built_at = 0.0
+        self._fingerprint = None  # corpus fingerprint the mirror was built from
+        self._embedding_cache = {}  # sha256(text) -> embedding, so refreshes only embed new text
+        self._query_cache = OrderedDict()
+        self.stats = {"local_hits": 0, "local_misses": 0, "remote_fallbacks": 0, "refreshes": 0}
+
+    def is_stale(self) -> bool:
+        """True when the mirror was never built, is too old, or the snapshot corpus changed"""
+        if self._matrix is None or time.time() - self._built_at > self.max_age_seconds:
+            return True
+        if self._fingerprint and snapshot_enabled():
+            return get_snapshot_store(self.client).get_fingerprint(self.user_id) != self._fingerprint
+        return False
+
+    def _fetch_memories(self) -> List[Dict[str, Any]]:
+        if snapshot_enabled():
+            try:
+                store = get_snapshot_store(self.client)
+                sync = store.sync(self.user_id)
+                self._fingerprint = sync["fingerprint"]
+                return store.get_memories(self.user_id, limit=self.limit)
+            except Exception as e:
+                log(f"Memory snapshot unavailable, loading from mem0: {e}")
+        self._fingerprint = None
+        with span("mem0.get_all", kind="mem0"):
+            return self.client.get_all(user_id=self.user_id, limit=self.limit)
+
+    def refresh(self):
+        """Pull the user's memories and (re)build the embedding matrix"""
+        with self._lock:
+            memories = [m for m in self._fetch_memories() if m.get("memory")]
+
+            texts = [m["memory"] for m in memories]
+            text_keys = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in texts]
+            missing = [i for i, key in enumerate(text_keys) if key not in self._embedding_cache]
+            if missing:
+                embedded = self.embedder.embed_documents([texts[i] for i in missing])
+                for i, vector in zip(missing, embedded):
+                    self._embedding_cache[text_keys[i]] = vector
+
+            # Drop embeddings for memories that no longer exist
+            live_keys = set(text_keys)
+            self._embedding_cache = {k: v for k, v in self._embedding_cache.items() if k in live_keys}
+
+            if memories:
+                matrix = _normalize(np.vstack([self._embedding_cache[key] for key in text_keys]).astype(np.float32))
+            else:
+                matrix = np.zeros((0, 1), dtype=np.float32)
+            # Swap both together so concurrent searches never see a mismatched pair
+            self._memories, self._matrix = memories, matrix
+            self._built_at = time.time()
+            self._query_cache.clear()
+            self.stats["refreshes"] += 1
+
+        log(f"Local memory index built: {len(memories)} memories ({len(missing)} newly embedded)")
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        # search_many threads share the cache; the embedding call itself runs unlocked
+        with self._lock:
+            vector = self._query_cache.get(query)
+            if vector is not None:
+                self._query_cache.move_to_end(query)
+                return vector
+
+        vector = _normalize(self.embedder.embed_query(query).astype(np.float32))
+        with self._lock:
+            self._query_cache[query] = vector
+            if len(self._query_cache) > 256:
+                self._query_cache.popitem(last=False)
+        return vector
+
+    def search_local(self, query: str, limit: int = 5, threshold: float = None):
+        """
+        Vectorized cosine search against the mirror, same result shape as mem0 search
+
+        Returns:
+            list: Top matches above the local cutoff (possibly empty), or None when the mirror is unusable
+        """
+        threshold = self.threshold if threshold is None else threshold
+        memories, matrix = self._memories, self._matrix
+        if matrix is None or len(memories) != matrix.shape[0]:
+            return None
+        if not len(memories):
+            return []
+
+        query_vector = self._embed_query(query)
+        if query_vector.shape[0] != matrix.shape[1]:
+            return None
+
+        scores = matrix @ query_vector
+        k = min(limit, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {**memories[i], "score": float(scores[i])}
+            for i in top
+            if scores[i] >= threshold
+        ]
+
+    def search(self, query: str, limit: int = 5, threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        Search locally, refreshing a stale mirror; mem0 only answers when no usable mirror exists
+
+        Args:
+            threshold: mem0 score threshold, applied to the remote fallback only (local results use self.threshold)
+        """
+        if self.is_stale():
+            try:
+                self.refresh()
+            except Exception as e:
+                log(f"Local memory index refresh failed, using mem0 search: {e}")
+
+        results = self.search_local(query, limit)
+        if results is not None:
+            self.stats["local_hits" if results else "local_misses"] += 1
+            return results
+
+        self.stats["remote_fallbacks"] += 1
+        with span("mem0.search", kind="mem0"):
+            return self.client.search(query=query, user_id=self.user_id, limit=limit, threshold=threshold)
+
+    def save(self, path: str = None) -> str:
+        """Persist the mirror so it can be loaded for offline benchmarking"""
+        import json
+
+        path = path or str(CACHE_DIR / "memory_index" / f"{self.user_id}_{self.embedder.name}.npz")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(
+            path,
+            matrix=self._matrix if self._matrix is not None else np.zeros((0, 1), dtype=np.float32),
+            memories=np.array(json.dumps(self._memories)),
+            built_at=np.array(self._built_at),
+        )
+        return path
+
+    def load(self, path: str = None):
+        """Load a mirror previously written by save()"""
+        import json
+
+        path = path or str(CACHE_DIR / "memory_index" / f"{self.user_id}_{self.embedder.name}.npz")
+        data = np.load(path)
+        with self._lock:
+            self._memories, self._matrix = json.loads(str(data["memories"])), data["matrix"]
+            self._built_at = float(data["built_at"])
+            self._query_cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get local hit/miss counters"""
+        return {
+            **self.stats,
+            "user_id": self.user_id,
+            "memories": len(self._memories),
+            "fingerprint": self._fingerprint,
+            "embedder": self.embedder.name,
+            "age_seconds": time.time() - self._built_at if self._built_at else None,
+        }
+
+
+# One mirror per user, shared across sessions in this process
+_indexes: Dict[str, LocalMemoryIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def local_index_enabled() -> bool:
+    """Local mirror is opt-in via LOCAL_MEMORY_INDEX=1"""
+    return os.getenv("LOCAL_MEMORY_INDEX", "0").lower() in ("1", "true", "yes")
+
+
+def get_local_index(user_id: str, client) -> LocalMemoryIndex:
+    """Get (or create) the shared mirror for a user"""
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            index = LocalMemoryIndex(
+                user_id,
+                client,
+                max_age_seconds=float(os.getenv("LOCAL_MEMORY_INDEX_MAX_AGE", "900")),
+                threshold=float(os.environ["LOCAL_MEMORY_THRESHOLD"]) if os.getenv("LOCAL_MEMORY_THRESHOLD") else None,
+            )
+            _indexes[user_id] = index
+        return index
@@ -2,27 +2,42 @@
 """
 Deep Memory Research Pipeline Orchestrator
 Complete autonomous pipeline: metadata -> plan -> search -> research -> analysis
+Interrupted sessions continue from their last checkpoint: python main.py --resume <session_id>
 """
 
+import argparse
+import contextvars
 import json
+import os
 import sys
+import threading
 import time
-from typing import Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 
 from dotenv import load_dotenv
-load_dotenv()
 
-from rich import print as rprint
+if __name__ == "__main__":
+    # CLI entry point: load .env before any module reads its configuration
+    load_dotenv()
+
+from event_bus import EventBus, JsonlFileSink, LOG, RunLog, bind_event_bus, emit_progress, log
 
-# Import our pipeline components
-from utils import save_artifact, save_jsonl_artifact, get_timestamp, load_artifact
-from metadata_generator import get_database_metadata, get_filtered_memory_with_context
-from rewoo_planner import ReWOOResearchPlanner  
-from strategic_react_agent import StrategicResearchAgent
-from meta_analysis_engine import AnalysisEngine
-from memory_writer import write_memories_from_reports
-from memory_id_tracker import init_tracker, finalize_answer_with_citations, get_session_memory_summary
+# Import our pipeline components (the LLM/mem0 phase modules are imported by the phase that
+# needs them, so importing the orchestrator - e.g. from server.py - stays cheap)
+from utils import artifacts_dir, save_artifact, save_jsonl_artifact, new_session_id, load_artifact
+from model_router import get_router_stats
+from tracing import Tracer, bind_tracer
+from pipeline_dag import Node, PipelineDAG
+from checkpoints import SessionCheckpoint, checkpoints_enabled
+from memory_id_tracker import (
+    init_tracker,
+    use_tracker,
+    finalize_answer_with_citations,
+    finalize_session_references,
+    load_memory_references,
+)
 
 
 def decompose_plan_to_searches(research_plan: str) -> str:
@@ -36,51 +51,191 @@ def decompose_plan_to_searches(research_plan: str) -> str:
     }, indent=2)
 
 
+_analysis_executor: ThreadPoolExecutor = None
+_analysis_executor_lock = threading.Lock()
+_analysis_pending = 0  # background analyses queued or running
+
+
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """Shared pool for Phase 4 analyses that run after the answer is returned"""
+    global _analysis_executor
+    with _analysis_executor_lock:
+        if _analysis_executor is None:
+            _analysis_executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("ANALYSIS_MAX_WORKERS", "2")), thread_name_prefix="background-analysis"
+            )
+        return _analysis_executor
+
+
+def _reserve_analysis_slot() -> bool:
+    """Admission control for background analyses: ANALYSIS_MAX_WORKERS running plus ANALYSIS_MAX_QUEUED waiting"""
+    global _analysis_pending
+    capacity = int(os.getenv("ANALYSIS_MAX_WORKERS", "2")) + int(os.getenv("ANALYSIS_MAX_QUEUED", "4"))
+    with _analysis_executor_lock:
+        if _analysis_pending >= capacity:
+            return False
+        _analysis_pending += 1
+        return True
+
+
+def _release_analysis_slot(_future: Future = None):
+    global _analysis_pending
+    with _analysis_executor_lock:
+        _analysis_pending -= 1
+
+
+def background_analysis_enabled() -> bool:
+    """Return the answer after Phase 3 + citations and finish Phase 4 in the background (BACKGROUND_ANALYSIS=1)"""
+    return os.getenv("BACKGROUND_ANALYSIS", "0").lower() in ("1", "true", "yes")
+
+
 class DeepResearchOrchestrator:
     """Main orchestrator for the deep research pipeline"""
     
-    def __init__(self, user_id: str = "doctor_memory", max_memories: int = 100):
+    def __init__(self, user_id: str = "doctor_memory", max_memories: int = 100, max_iterations: int = 5,
+                 background_analysis: bool = None, session_id: str = None):
         self.user_id = user_id
         self.max_memories = max_memories
-        self.session_timestamp = get_timestamp()
+        self.max_iterations = max_iterations
+        self.background_analysis = background_analysis_enabled() if background_analysis is None else background_analysis
+        self.session_timestamp = session_id or new_session_id()
         self.artifacts = {}  # Store paths to all generated artifacts
+
+        # Node outputs and research iterations saved as they complete, so the session can resume
+        self.checkpoint = SessionCheckpoint(self.session_timestamp) if checkpoints_enabled() else None
         
-        # Initialize memory ID tracker for this session
-        init_tracker(self.session_timestamp)
-        
-        rprint(f"Pipeline initialized - Session: {self.session_timestamp}")
+        # Initialize memory ID tracker for this session (re-bound around each run so
+        # concurrent orchestrators in one process never share references)
+        self.tracker = init_tracker(self.session_timestamp)
+
+        # Per-run event bus: session log (API 'logs'), optional session event file, plus any
+        # subscribers added by callers (e.g. the SSE progress stream)
+        self.events = EventBus()
+        self.run_log = self.events.subscribe(RunLog(self.session_timestamp), min_level="info", types=(LOG,))
+        # (kept out of self.artifacts so Phase 4 does not feed the event log to the analysis prompt)
+        self.event_log_path = None
+        if os.getenv("EVENT_LOG_FILE", "1").lower() not in ("0", "false", "no"):
+            self.event_log_path = str(artifacts_dir() / f"{self.session_timestamp}_events.jsonl")
+            self.events.subscribe(JsonlFileSink(self.event_log_path), min_level=os.getenv("EVENT_LOG_LEVEL", "info"))
+        
+        # Timing spans for phases, LLM calls and mem0 requests (saved as the trace artifact)
+        self.trace = Tracer(self.session_timestamp)
+
+        # Outputs of finished pipeline nodes, reused if the run is repeated
+        self.node_outputs: Dict[str, Any] = {}
+        self.research_stats: Dict[str, Any] = {}
+        self.question = None
+        self.run_started = None
+
+        # Phase 4 after the answer was returned (background_analysis): not_started, running, succeeded, failed,
+        # or rejected when the background queue was full
+        self.analysis_status = "not_started"
+        self.analysis_error = None
+        self.analysis_future: Optional[Future] = None
+        
+        with bind_event_bus(self.events):
+            log(f"Pipeline initialized - Session: {self.session_timestamp}")
+
+    @classmethod
+    def resume(cls, session_id: str, **kwargs) -> "DeepResearchOrchestrator":
+        """
+        Orchestrator for an interrupted session, restored from its checkpoint
+
+        Completed nodes are not run again and Phase 3 continues after its last completed
+        iteration; call run_complete_pipeline(orchestrator.question) to finish the session.
+
+        Raises:
+            ValueError: The session has no checkpoint
+        """
+        checkpoint = SessionCheckpoint(session_id)
+        session = checkpoint.load_session()
+        if not session.get("question"):
+            raise ValueError(f"No checkpoint found for session '{session_id}'")
+
+        for name in ("user_id", "max_memories", "max_iterations"):
+            if name in session:
+                kwargs.setdefault(name, session[name])
+        orchestrator = cls(session_id=session_id, **kwargs)
+        orchestrator.question = session["question"]
+        orchestrator.artifacts.update(session.get("artifacts", {}))
+        orchestrator.node_outputs = {**checkpoint.load_nodes(), "question": session["question"]}
+        orchestrator.research_stats = orchestrator.node_outputs.get("research_stats", {})
+
+        # Memory references captured before the interruption (citations link against them)
+        if os.path.exists(orchestrator.tracker.journal_file):
+            orchestrator.tracker.memory_references.update(load_memory_references(orchestrator.tracker.journal_file))
+
+        with bind_event_bus(orchestrator.events):
+            log(f"Resuming session {session_id}: completed nodes {', '.join(checkpoint.completed_nodes()) or 'none'}")
+        return orchestrator
+
+    def _checkpoint_node(self, node: Node, outputs: Dict[str, Any]):
+        """Persist a finished node's outputs and the artifacts saved so far"""
+        if self.checkpoint is None or not node.persist:
+            return
+        try:
+            self.checkpoint.save_node(node.name, outputs)
+            self.checkpoint.save_session(artifacts=dict(self.artifacts), completed_nodes=self.checkpoint.completed_nodes())
+        except (OSError, TypeError, ValueError) as e:
+            log(f"Could not checkpoint {node.name}: {e}", level="warning")
+
+    def _checkpoint_status(self, status: str, error: str = None, **fields):
+        """Record the session status (and any run parameters) in session.json"""
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.save_session(status=status, error=error, artifacts=dict(self.artifacts), **fields)
+        except OSError as e:
+            log(f"Could not checkpoint session status: {e}", level="warning")
     
-    def phase_1_metadata_analysis(self) -> str:
-        """Phase 1: Analyze database and generate metadata"""
-        rprint("\nPhase 1: Database Analysis")
+    def load_memories(self) -> list:
+        """Phase 1: Load the memories to analyse (their IDs are captured by the session tracker)"""
+        log("\nPhase 1: Database Analysis")
+        from metadata_generator import get_filtered_memory_with_context
         
         # Load filtered memories with ID capture
-        filtered_memories, memory_context = get_filtered_memory_with_context(
+        filtered_memories, _ = get_filtered_memory_with_context(
             user_id=self.user_id, 
             limit=self.max_memories
         )
-        rprint(f"Loaded {len(filtered_memories)} memories with ID tracking")
-        
-        # Generate metadata analysis
-        metadata_json = get_database_metadata(filtered_memory=filtered_memories)
+        log(f"Loaded {len(filtered_memories)} memories with ID tracking")
+        return filtered_memories
+
+    def phase_1_metadata_analysis(self, filtered_memories: list = None) -> str:
+        """Phase 1: Analyze database and generate metadata"""
+        from metadata_generator import get_database_metadata_memoized
+
+        if filtered_memories is None:
+            filtered_memories = self.load_memories()
+        
+        # Generate metadata analysis (reused when the memory corpus is unchanged)
+        metadata_json, reused = get_database_metadata_memoized(
+            filtered_memory=filtered_memories,
+            user_id=self.user_id,
+            max_memories=self.max_memories,
+        )
+        if reused:
+            emit_progress("metadata", "progress", {"message": "Memory corpus unchanged - reusing metadata analysis"})
         
         if not metadata_json:
             raise ValueError("Failed to generate metadata analysis")
             
         # Save metadata artifact
-        metadata_path = save_artifact("metadata", metadata_json, ext="json")
+        metadata_path = save_artifact("metadata", metadata_json, ext="json", session_id=self.session_timestamp)
         self.artifacts["metadata"] = metadata_path
         
-        rprint(f"Metadata analysis saved: {metadata_path}")
+        log(f"Metadata analysis saved: {metadata_path}")
         
         return metadata_json
     
-    def phase_2_strategic_planning(self, question: str, metadata_json: str) -> str:
+    def phase_2_strategic_planning(self, question: str, metadata_json: str, planner=None) -> str:
         """Phase 2: Create strategic research plan"""
-        rprint("\nPhase 2: Strategic Planning")
+        log("\nPhase 2: Strategic Planning")
         
-        # Initialize ReWOO planner
-        planner = ReWOOResearchPlanner()
+        # Initialize ReWOO planner (the pipeline DAG builds it while Phase 1 runs)
+        if planner is None:
+            from rewoo_planner import ReWOOResearchPlanner
+            planner = ReWOOResearchPlanner()
         
         # Create research plan
         research_plan = planner.create_research_plan(question, metadata_json)
@@ -89,83 +244,79 @@ class DeepResearchOrchestrator:
             raise ValueError("Failed to create research plan")
         
         # Save plan artifact  
-        plan_path = save_artifact("plan", research_plan, ext="json")
+        plan_path = save_artifact("plan", research_plan, ext="json", session_id=self.session_timestamp)
         self.artifacts["plan"] = plan_path
         
-        rprint(f"Research plan saved: {plan_path}")
+        log(f"Research plan saved: {plan_path}")
         
         return research_plan
     
     def phase_3_plan_decomposition(self, research_plan: str) -> str:
         """Phase 3: Decompose plan into actionable searches"""
-        rprint("\nPhase 3: Deep Research")
+        log("\nPhase 3: Deep Research")
         
         # Decompose plan into mem0 searches
         search_list_json = decompose_plan_to_searches(research_plan)
         
         # Save search list artifact
-        search_list_path = save_artifact("search_list", search_list_json, ext="json")
+        search_list_path = save_artifact("search_list", search_list_json, ext="json", session_id=self.session_timestamp)
         self.artifacts["search_list"] = search_list_path
         
-        rprint(f"Search list saved: {search_list_path}")
+        log(f"Search list saved: {search_list_path}")
         
         return search_list_json
     
-    def phase_3_strategic_deep_research(self, question: str, strategic_plan: str, metadata_context: str, max_iterations: int = 5) -> tuple:
+    def phase_3_strategic_deep_research(self, question: str, strategic_plan: str, metadata_context: str, max_iterations: int = None) -> tuple:
         """Phase 3: Execute strategic deep research loop with full context"""
-        rprint("\nPhase 3: Strategic Deep Research")
+        log("\nPhase 3: Strategic Deep Research")
+        max_iterations = max_iterations or self.max_iterations
         
         # Initialize research agent
+        from strategic_react_agent import StrategicResearchAgent
         agent = StrategicResearchAgent()
         
-        # Execute strategic research with full context (plan + metadata guides iterative agent)
-        final_answer, raw_results = agent.execute_with_strategic_plan(question, strategic_plan, metadata_context, max_iterations=max_iterations)
+        # Execute strategic research with full context (plan + metadata guides iterative agent);
+        # with checkpoints, every iteration is saved and an interrupted loop picks up after the last one
+        resume_state = self.checkpoint.load_research_state(question) if self.checkpoint else None
+        final_answer, raw_results = agent.execute_with_strategic_plan(
+            question, strategic_plan, metadata_context, max_iterations=max_iterations,
+            resume_state=resume_state, on_iteration=self.checkpoint.save_research_state if self.checkpoint else None,
+        )
         
         # Save artifacts
-        final_answer_path = save_artifact("final_answer", final_answer, ext="md")
-        raw_results_path = save_jsonl_artifact("raw_results", raw_results)
+        final_answer_path = save_artifact("final_answer", final_answer, ext="md", session_id=self.session_timestamp)
+        raw_results_path = save_jsonl_artifact("raw_results", raw_results, session_id=self.session_timestamp)
         
         self.artifacts["final_answer"] = final_answer_path
         self.artifacts["raw_results"] = raw_results_path
         
-        rprint(f"Final research report saved to: {final_answer_path}")
-        rprint(f"Raw search results saved to: {raw_results_path}")
+        log(f"Final research report saved to: {final_answer_path}")
+        log(f"Raw search results saved to: {raw_results_path}")
+        log(f"Research stopped after {len(agent.iteration_stats)} iterations: {agent.last_stop_reason}")
+        self.research_stats = {
+            "iterations_completed": len(agent.iteration_stats),
+            "stop_reason": agent.last_stop_reason,
+            "iteration_stats": agent.iteration_stats,
+        }
         
         return final_answer, raw_results
-    
-    def phase_4_comprehensive_analysis(self, question: str, execution_time: float) -> str:
-        """Phase 4: Create comprehensive meta-analysis report"""
-        rprint("\nPhase 4: Meta-Analysis")
-        
-        # Initialize analysis engine
-        analysis_engine = AnalysisEngine()
-        
-        # Generate comprehensive meta-analysis report
-        analysis_report = analysis_engine.generate_comprehensive_report(
-            question=question,
-            artifacts_dict=self.artifacts,
-            execution_time=execution_time,
-            session_id=self.session_timestamp
-        )
-        
-        # Save analysis report
-        analysis_path = save_artifact("analysis_report", analysis_report, ext="md")
-        self.artifacts["analysis_report"] = analysis_path
-        
-        rprint(f"Analysis report saved: {analysis_path}")
-        
-        return analysis_report
+
+    def add_citations(self, final_answer: str) -> str:
+        """Link the final answer's claims to memory IDs and compact the session's reference journal"""
+        final_answer = finalize_answer_with_citations(final_answer)
+        finalize_session_references()
+        return final_answer
     
     def phase_5_memory_writing(self, question: str) -> int:
         """Phase 5: Extract insights and write to memory (optional)"""
-        rprint("\nPhase 5: Memory Writing")
+        log("\nPhase 5: Memory Writing")
         
         # Load the reports from artifacts
         final_answer_path = self.artifacts.get("final_answer")
         analysis_report_path = self.artifacts.get("analysis_report")
         
         if not final_answer_path or not analysis_report_path:
-            rprint("Missing required reports for memory writing")
+            log("Missing required reports for memory writing")
             return 0
             
         # Load report contents
@@ -173,11 +324,12 @@ class DeepResearchOrchestrator:
         analysis_report = load_artifact(analysis_report_path)
         
         # Debug: Check what was loaded
-        rprint(f"[debug] Research report length: {len(str(research_report))}")
-        rprint(f"[debug] Analysis report length: {len(str(analysis_report))}")
-        rprint(f"[debug] Research report preview: {str(research_report)[:200]}...")
+        log(f"Research report length: {len(str(research_report))}", level="debug")
+        log(f"Analysis report length: {len(str(analysis_report))}", level="debug")
+        log(f"Research report preview: {str(research_report)[:200]}...", level="debug")
         
         # Write memories to mem0
+        from memory_writer import write_memories_from_reports
         stored_count = write_memories_from_reports(
             research_report=research_report,
             analysis_report=analysis_report, 
@@ -186,115 +338,425 @@ class DeepResearchOrchestrator:
         )
         
         return stored_count
+
+    def build_pipeline(self) -> PipelineDAG:
+        """Pipeline phases as DAG nodes; Phase 4 is split into sub-reports that start once their inputs exist"""
+        return PipelineDAG([
+            Node(
+                "memory_load", lambda: {"filtered_memories": self.load_memories()},
+                outputs=("filtered_memories",), phase="metadata", message="Loading memories from database",
+                summarize=lambda out: {
+                    "message": f"Loaded {len(out['filtered_memories'])} memories",
+                    "count": len(out["filtered_memories"]),
+                },
+            ),
+            Node(
+                "metadata",
+                lambda filtered_memories: {"metadata_json": self.phase_1_metadata_analysis(filtered_memories)},
+                inputs=("filtered_memories",), outputs=("metadata_json",), phase="metadata",
+                message="Analyzing database structure and patterns", summarize=self._metadata_summary,
+            ),
+            # Planner setup (model backend, agent pool) overlaps with the memory load
+            Node("plan_setup", self._plan_setup, outputs=("planner",), persist=False),
+            Node(
+                "plan",
+                lambda question, metadata_json, planner: {
+                    "research_plan": self.phase_2_strategic_planning(question, metadata_json, planner)
+                },
+                inputs=("question", "metadata_json", "planner"), outputs=("research_plan",), phase="planning",
+                message="Creating strategic research plan", summarize=self._plan_summary,
+            ),
+            Node(
+                "research", self._research,
+                inputs=("question", "research_plan", "metadata_json"),
+                outputs=("research_answer", "raw_results", "research_stats"), phase="research",
+                message="Beginning strategic deep research", summarize=self._research_summary,
+            ),
+            Node(
+                "citations", self._citations,
+                inputs=("research_answer",), outputs=("final_answer", "execution_time"), phase="citations",
+                message="Linking claims to memory IDs",
+            ),
+            Node("analysis_setup", self._analysis_setup, outputs=("analysis_engine",), persist=False),
+            # Sub-reports read the saved artifacts, so they overlap with research and citations
+            # (own progress phase: the frontend's "analysis" step starts with the final report)
+            Node(
+                "analysis_methodology", self._analysis_methodology,
+                inputs=("analysis_engine", "metadata_json", "research_plan"), outputs=("methodology_analysis",),
+                phase="analysis_reports", message="Analyzing research methodology",
+            ),
+            Node(
+                "analysis_data_quality", self._analysis_data_quality,
+                inputs=("analysis_engine", "metadata_json", "raw_results"), outputs=("data_quality_analysis",),
+                phase="analysis_reports", message="Analyzing data quality",
+            ),
+            Node(
+                "analysis_findings", self._analysis_findings,
+                inputs=("analysis_engine", "question", "research_answer", "raw_results"), outputs=("findings_analysis",),
+                phase="analysis_reports", message="Analyzing findings quality",
+            ),
+            Node(
+                "analysis", self._analysis_synthesis,
+                inputs=(
+                    "analysis_engine", "question", "execution_time",
+                    "methodology_analysis", "data_quality_analysis", "findings_analysis",
+                ),
+                outputs=("analysis_report",), phase="analysis", message="Performing comprehensive meta-analysis",
+                summarize=lambda out: {"message": "Meta-analysis complete", "artifact_path": self.artifacts.get("analysis_report")},
+            ),
+            Node(
+                "memory_write", lambda question, final_answer, analysis_report: {
+                    "memories_stored": self.phase_5_memory_writing(question)
+                },
+                inputs=("question", "final_answer", "analysis_report"), outputs=("memories_stored",),
+                phase="memory_writing", message="Extracting insights to store as memories",
+                summarize=lambda out: {"message": f"Stored {out['memories_stored']} memories", "count": out["memories_stored"]},
+            ),
+        ])
+
+    def _metadata_summary(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "message": "Database analysis complete",
+            "artifact_path": self.artifacts.get("metadata"),
+            "summary": json.loads(outputs["metadata_json"]).get("database_summary", {}),
+        }
+
+    def _plan_setup(self) -> Dict[str, Any]:
+        from rewoo_planner import ReWOOResearchPlanner
+        return {"planner": ReWOOResearchPlanner()}
+
+    def _plan_summary(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        plan_data = json.loads(outputs["research_plan"])
+        return {
+            "message": "Strategic research plan created",
+            "artifact_path": self.artifacts.get("plan"),
+            "phases": plan_data.get("phases", []),
+            "strategy": plan_data.get("search_strategy", ""),
+        }
+
+    def _research(self, question: str, research_plan: str, metadata_json: str) -> Dict[str, Any]:
+        research_answer, raw_results = self.phase_3_strategic_deep_research(question, research_plan, metadata_json)
+        return {"research_answer": research_answer, "raw_results": raw_results, "research_stats": self.research_stats}
+
+    def _research_summary(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "message": "Research execution complete",
+            "final_answer": outputs["research_answer"],
+            "artifact_paths": {
+                "final_answer": self.artifacts.get("final_answer"),
+                "raw_results": self.artifacts.get("raw_results"),
+            },
+            **outputs["research_stats"],
+            "raw_results": outputs["raw_results"],
+        }
+
+    def _citations(self, research_answer: str) -> Dict[str, Any]:
+        final_answer = self.add_citations(research_answer)
+        return {"final_answer": final_answer, "execution_time": time.time() - self.run_started}
+
+    def _analysis_setup(self) -> Dict[str, Any]:
+        from meta_analysis_engine import AnalysisEngine
+        return {"analysis_engine": AnalysisEngine()}
+
+    def _load_for_analysis(self, engine, *kinds: str) -> Dict[str, Any]:
+        return engine.load_artifacts({kind: self.artifacts[kind] for kind in kinds if kind in self.artifacts})
+
+    def _analysis_methodology(self, analysis_engine, metadata_json: str, research_plan: str) -> Dict[str, Any]:
+        artifacts = self._load_for_analysis(analysis_engine, "metadata", "plan", "search_list")
+        return {"methodology_analysis": analysis_engine.analyze_research_methodology(artifacts)}
+
+    def _analysis_data_quality(self, analysis_engine, metadata_json: str, raw_results: list) -> Dict[str, Any]:
+        artifacts = self._load_for_analysis(analysis_engine, "metadata", "raw_results")
+        return {"data_quality_analysis": analysis_engine.analyze_data_quality(artifacts)}
+
+    def _analysis_findings(self, analysis_engine, question: str, research_answer: str, raw_results: list) -> Dict[str, Any]:
+        artifacts = self._load_for_analysis(analysis_engine, "final_answer", "raw_results")
+        return {"findings_analysis": analysis_engine.analyze_findings_quality(artifacts, question)}
+
+    def _analysis_synthesis(
+        self, analysis_engine, question: str, execution_time: float,
+        methodology_analysis: str, data_quality_analysis: str, findings_analysis: str,
+    ) -> Dict[str, Any]:
+        log("\nPhase 4: Meta-Analysis")
+        from meta_analysis_engine import ANALYSIS_ARTIFACT_TYPES
+
+        # A copy: the request thread may add the trace artifact while this runs in the background
+        analysis_artifacts = {
+            kind: path for kind, path in dict(self.artifacts).items() if kind in ANALYSIS_ARTIFACT_TYPES
+        }
+        analysis_report = analysis_engine.synthesize_report(
+            question, analysis_artifacts, execution_time, self.session_timestamp,
+            methodology_analysis, data_quality_analysis, findings_analysis,
+        )
+        analysis_path = save_artifact("analysis_report", analysis_report, ext="md", session_id=self.session_timestamp)
+        self.artifacts["analysis_report"] = analysis_path
+        log(f"Analysis report saved: {analysis_path}")
+        return {"analysis_report": analysis_report}
     
-    def run_complete_pipeline(self, question: str) -> Dict[str, Any]:
-        """Run the complete research pipeline"""
-        
-        rprint("\nStarting Deep Research Pipeline")
-        rprint(f"Research Question: {question}")
-        
-        start_time = time.time()
+    def run_complete_pipeline(self, question: str, store_memories: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Run the complete research pipeline
+
+        Args:
+            question: Research question
+            store_memories: Run Phase 5 (True) or skip it (False); None asks on the terminal
+        """
+        with use_tracker(self.tracker), bind_event_bus(self.events), bind_tracer(self.trace):
+            return self._run_complete_pipeline(question, store_memories)
+
+    def save_trace(self) -> Dict[str, Any]:
+        """Close the run's trace, save it as an artifact and return its summary"""
+        self.trace.finish()
+        trace = self.trace.to_dict()
+        try:
+            self.artifacts["trace"] = save_artifact("trace", trace, ext="json", session_id=self.session_timestamp)
+        except OSError as e:
+            log(f"Could not save trace: {e}", level="warning")
+        return trace["summary"]
+
+    def _run_complete_pipeline(self, question: str, store_memories: Optional[bool] = None) -> Dict[str, Any]:
+        """Pipeline body, executed with this session's tracker bound"""
+        
+        log("\nStarting Deep Research Pipeline")
+        log(f"Research Question: {question}")
+        
+        self.run_started = time.time()
+        self.question = question
+        values = self.node_outputs
+        if values.get("question") != question:
+            values.clear()
+            self.artifacts.clear()
+            values["question"] = question
+        if self.checkpoint is not None:
+            try:
+                # Checkpoints of an earlier question in this session must not be resumed with this one
+                if self.checkpoint.bind_question(question):
+                    log("Discarded checkpoints saved for a different question", level="warning")
+            except OSError as e:
+                log(f"Could not checkpoint session: {e}", level="warning")
+        pipeline = self.build_pipeline()
+        self._checkpoint_status(
+            "running", question=question, user_id=self.user_id,
+            max_memories=self.max_memories, max_iterations=self.max_iterations,
+        )
         
         try:
-            # Phase 1: Database Metadata Analysis
-            metadata_json = self.phase_1_metadata_analysis()
-            
-            # Phase 2: Strategic Research Planning  
-            research_plan = self.phase_2_strategic_planning(question, metadata_json)
-            
-            # Phase 3: Strategic Deep Research Execution (using plan + metadata as guidance)
-            final_answer, raw_results = self.phase_3_strategic_deep_research(question, research_plan, metadata_json)
-            
-            # Add memory ID citations to final answer
-            final_answer = finalize_answer_with_citations(final_answer)
-            
-            execution_time = time.time() - start_time
-            
-            # Phase 4: Comprehensive Analysis
-            analysis_report = self.phase_4_comprehensive_analysis(question, execution_time)
+            # Phases 1-4: metadata, planning, research, citations and analysis, each node
+            # starting as soon as its inputs exist (Phase 4 comes later in background mode)
+            if self.background_analysis:
+                pipeline.run(values, targets=("final_answer",), on_node_complete=self._checkpoint_node)
+            else:
+                pipeline.run(values, targets=("final_answer", "analysis_report"), on_node_complete=self._checkpoint_node)
+                self.analysis_status = "succeeded"
+            final_answer = values["final_answer"]
+            execution_time = values["execution_time"]
             
             # Phase 5: Optional Memory Writing
             memories_stored = 0
             try:
-                # Ask user if they want to store insights as memories
-                rprint("\n" + "="*60)
-                rprint("Research pipeline complete!")
-                store_memories = input("Do you want to store key insights as memories for future research? (y/n): ").strip().lower()
+                log("\n" + "="*60)
+                log("Research pipeline complete!")
+                if store_memories is None:
+                    # Ask user if they want to store insights as memories
+                    answer = input("Do you want to store key insights as memories for future research? (y/n): ").strip().lower()
+                    store_memories = answer in ['y', 'yes']
                 
-                if store_memories in ['y', 'yes']:
-                    memories_stored = self.phase_5_memory_writing(question)
-                    rprint(f"Stored {memories_stored} research insights as memories")
+                if self.background_analysis:
+                    # The analysis report (and memory writing, which needs it) follow on a background worker
+                    self.analysis_future = self.start_background_analysis(pipeline, store_memories)
+                    if self.analysis_future is not None:
+                        log("Meta-analysis continues in the background")
+                elif store_memories:
+                    pipeline.run(values, targets=("memories_stored",), on_node_complete=self._checkpoint_node)
+                    memories_stored = values["memories_stored"]
+                    log(f"Stored {memories_stored} research insights as memories")
                 else:
-                    rprint("Skipping memory storage")
+                    log("Skipping memory storage")
             except Exception as e:
-                rprint(f"Memory writing failed: {e}")
+                log(f"Memory writing failed: {e}", level="error")
             
+            trace_summary = self.save_trace()
+            self._checkpoint_status("succeeded" if self.analysis_status == "succeeded" else "answered")
+
             # Display final results
-            self.display_completion_summary(question, execution_time, final_answer, memories_stored)
+            self.display_completion_summary(question, execution_time, final_answer, memories_stored, trace_summary)
             
             return {
                 "success": True,
                 "execution_time": execution_time,
-                "artifacts": self.artifacts,
-                "final_answer": final_answer
+                "artifacts": dict(self.artifacts),
+                "final_answer": final_answer,
+                "trace": trace_summary,
+                "analysis_status": self.analysis_status,
             }
             
         except Exception as e:
-            rprint(f"Pipeline failed: {e}")
+            log(f"Pipeline failed: {e}", level="error")
+            self._checkpoint_status("failed", str(e))
             return {
                 "success": False,
                 "error": str(e),
-                "artifacts": self.artifacts
+                "artifacts": dict(self.artifacts),
+                "trace": self.save_trace(),
             }
+
+    def start_background_analysis(self, pipeline: PipelineDAG, store_memories: bool = False) -> Optional[Future]:
+        """
+        Queue Phase 4 (then Phase 5 if requested) on the background pool, in this run's context
+
+        Returns None with analysis_status "rejected" when the pool and its queue are full; the
+        session checkpoint keeps the research, so the analysis can be finished later by resuming.
+        """
+        if not _reserve_analysis_slot():
+            self.analysis_status = "rejected"
+            self.analysis_error = "Background analysis queue is full; resume the session to run the analysis"
+            log(self.analysis_error, level="warning")
+            return None
+
+        self.analysis_status = "running"
+        # The copied context keeps this session's tracker, event bus and tracer bound in the worker
+        context = contextvars.copy_context()
+        try:
+            future = get_analysis_executor().submit(context.run, self._background_analysis, pipeline, store_memories)
+        except Exception:
+            _release_analysis_slot()
+            raise
+        future.add_done_callback(_release_analysis_slot)
+        return future
+
+    def _background_analysis(self, pipeline: PipelineDAG, store_memories: bool) -> Dict[str, Any]:
+        try:
+            pipeline.run(self.node_outputs, targets=("analysis_report",), on_node_complete=self._checkpoint_node)
+            self.analysis_status = "succeeded"
+            if store_memories:
+                try:
+                    pipeline.run(self.node_outputs, targets=("memories_stored",), on_node_complete=self._checkpoint_node)
+                    log(f"Stored {self.node_outputs['memories_stored']} research insights as memories")
+                except Exception as e:
+                    log(f"Memory writing failed: {e}", level="error")
+        except Exception as e:
+            self.analysis_error = str(e)
+            self.analysis_status = "failed"
+            log(f"Background meta-analysis failed: {e}", level="error")
+        finally:
+            # Re-save the trace so it includes the analysis spans
+            self.save_trace()
+            self._checkpoint_status(self.analysis_status, self.analysis_error)
+        return self.analysis_result()
+
+    def analysis_result(self) -> Dict[str, Any]:
+        """Status of the session's Phase 4 analysis, with the report once it exists"""
+        result = {
+            "session_id": self.session_timestamp,
+            "status": self.analysis_status,
+            "error": self.analysis_error,
+            "artifact_path": self.artifacts.get("analysis_report"),
+            "analysis_report": self.node_outputs.get("analysis_report"),
+        }
+        if "memories_stored" in self.node_outputs:
+            result["memories_stored"] = self.node_outputs["memories_stored"]
+        return result
     
-    def display_completion_summary(self, question: str, execution_time: float, final_answer: str, memories_stored: int = 0):
+    def display_completion_summary(self, question: str, execution_time: float, final_answer: str, memories_stored: int = 0,
+                                   trace_summary: Dict[str, Any] = None):
         """Display comprehensive completion summary"""
         
-        rprint("\nPipeline execution complete")
+        log("\nPipeline execution complete")
         
-        rprint(f"\nGenerated Artifacts ({len(self.artifacts)} files):")
-        rprint("-" * 60)
-        for artifact_type, path in self.artifacts.items():
-            rprint(f"  - {artifact_type.replace('_', ' ').title()}: {path}")
+        log(f"\nGenerated Artifacts ({len(self.artifacts)} files):")
+        log("-" * 60)
+        for artifact_type, path in dict(self.artifacts).items():
+            log(f"  - {artifact_type.replace('_', ' ').title()}: {path}")
         
-        rprint(f"\nExecution Summary:")
-        rprint("-" * 60)
-        rprint(f"  - Total Time: {execution_time:.2f} seconds")
-        rprint(f"  - Session ID: {self.session_timestamp}")
-        rprint(f"  - Question: {question}")
+        log(f"\nExecution Summary:")
+        log("-" * 60)
+        log(f"  - Total Time: {execution_time:.2f} seconds")
+        log(f"  - Session ID: {self.session_timestamp}")
+        log(f"  - Question: {question}")
         if memories_stored > 0:
-            rprint(f"  - Memories Stored: {memories_stored} insights saved for future research")
+            log(f"  - Memories Stored: {memories_stored} insights saved for future research")
         
         # Display memory tracking summary
-        memory_summary = get_session_memory_summary()
+        memory_summary = self.tracker.get_memory_references_summary()
         if "total_memories_referenced" in memory_summary:
-            rprint(f"  - Memory References: {memory_summary['total_memories_referenced']} memories cited")
-            rprint(f"  - Memory Tracking File: {memory_summary['memory_file']}")
-        
-        rprint(f"\nFinal Research Report Preview:")
-        rprint("-" * 60)
+            log(f"  - Memory References: {memory_summary['total_memories_referenced']} memories cited")
+            log(f"  - Memory Tracking File: {memory_summary['memory_file']}")
+
+        # Display per-tier LLM latency and cost
+        tier_stats = get_router_stats()["tiers"]
+        if tier_stats:
+            log(f"\nModel Tiers:")
+            log("-" * 60)
+            for tier, metrics in tier_stats.items():
+                log(
+                    f"  - {tier} ({metrics['model']}): {metrics['calls']} calls ({metrics['cached']} cached), "
+                    f"avg {metrics['avg_latency_seconds']:.2f}s, "
+                    f"{metrics['input_tokens']}/{metrics['output_tokens']} tokens in/out, "
+                    f"~${metrics['estimated_cost_usd']:.4f}"
+                )
+
+        # Display LLM response cache effectiveness (process totals; the module is loaded once a phase called an LLM)
+        if "llm_cache" in sys.modules:
+            cache_stats = sys.modules["llm_cache"].get_cache_stats()
+            if cache_stats["enabled"]:
+                log(
+                    f"\nLLM Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                    f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['entries'] or 0} entries, "
+                    f"{cache_stats['bytes'] / 1e6:.1f} MB"
+                )
+        
+        # Display where the time went (phases, then totals per call kind)
+        if trace_summary:
+            log(f"\nTrace ({self.artifacts.get('trace', 'not saved')}):")
+            log("-" * 60)
+            for phase, seconds in trace_summary["phases"].items():
+                log(f"  - {phase}: {seconds:.2f}s")
+            for kind, totals in trace_summary["by_kind"].items():
+                tokens = ""
+                if "input_tokens" in totals:
+                    tokens = f", {totals['input_tokens']}/{totals.get('output_tokens', 0)} tokens in/out"
+                log(f"  - {kind}: {totals['count']} spans, {totals['seconds']:.2f}s{tokens}")
+            for slow in trace_summary["slowest"]:
+                log(f"  - slowest: {slow['name']} {slow['seconds']:.2f}s")
+
+        log(f"\nFinal Research Report Preview:")
+        log("-" * 60)
         # Show first 200 characters of the final answer
         preview = final_answer[:200] + "..." if len(final_answer) > 200 else final_answer
-        rprint(preview)
-        rprint(f"\n[Full report available in: {self.artifacts.get('final_answer', 'N/A')}]")
+        log(preview)
+        log(f"\n[Full report available in: {self.artifacts.get('final_answer', 'N/A')}]")
         
 
 
 def main():
     """Main entry point with simple input prompts"""
-    rprint("Deep Memory Research Pipeline")
-    rprint("I'll help you research your mem0 memories comprehensively!")
-    rprint()
+    parser = argparse.ArgumentParser(description="Deep Memory Research Pipeline")
+    parser.add_argument("--resume", metavar="SESSION_ID", help="Continue an interrupted session from its checkpoint")
+    args = parser.parse_args()
+
+    log("Deep Memory Research Pipeline")
+    log("I'll help you research your mem0 memories comprehensively!")
+    log()
+
+    if args.resume:
+        try:
+            orchestrator = DeepResearchOrchestrator.resume(args.resume)
+        except ValueError as e:
+            log(str(e))
+            sys.exit(1)
+        log(f"Resuming research: {orchestrator.question}")
+        result = orchestrator.run_complete_pipeline(orchestrator.question)
+        sys.exit(0 if result.get("success") else 1)
     
     # Get research question from user
     question = input("What would you like to research? ").strip()
     
     if not question:
-        rprint("Please provide a research question.")
+        log("Please provide a research question.")
         return
     
-    rprint(f"\nResearch Question: {question}")
-    rprint("Starting comprehensive research...")
+    log(f"\nResearch Question: {question}")
+    log("Starting comprehensive research...")
     
     # Initialize orchestrator with fixed defaults
     orchestrator = DeepResearchOrchestrator(
@@ -306,9 +768,9 @@ def main():
     result = orchestrator.run_complete_pipeline(question)
     
     if result.get("success"):
-        rprint("\nResearch complete! Check the artifacts folder for detailed reports.")
+        log("\nResearch complete! Check the artifacts folder for detailed reports.")
     else:
-        rprint(f"\nResearch failed: {result.get('error', 'Unknown error')}")
+        log(f"\nResearch failed: {result.get('error', 'Unknown error')}")
     
     # Exit with appropriate code
     sys.exit(0 if result.get("success") else 1)
@@ -0,0 +1,36 @@
+"""
+Memory Client - Shared, lazily constructed mem0 client
+- mem0 is imported and the client built (which validates the API key over HTTP) on first use,
+  not when pipeline modules are imported
+- One client per process, so every phase and session reuses its HTTP connection pool
+- Under DEEP_RESEARCH_REPLAY the client records to / replays from fixtures (see replay.py)
+"""
+
+import os
+import threading
+
+from replay import RecordingMemoryClient, ReplayMemoryClient, get_fixture_store, replay_mode
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_memory_client():
+    """Get the shared mem0 MemoryClient, creating it on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            mode = replay_mode()
+            if mode == "replay":
+                _client = ReplayMemoryClient(get_fixture_store("mem0"))
+                return _client
+
+            api_key = os.getenv("MEM0_API_KEY")
+            if not api_key:
+                raise ValueError("Missing MEM0_API_KEY in environment variables")
+            from mem0.client.main import MemoryClient
+
+            _client = MemoryClient(api_key=api_key)
+            if mode == "record":
+                _client = RecordingMemoryClient(_client, get_fixture_store("mem0"))
+        return _client
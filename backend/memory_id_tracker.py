@@ -2,19 +2,26 @@
 Simple Memory ID Injection & Tracking System
 - Captures memory IDs during search
 - Injects them into every prompt
-- Tracks all referenced memories in a file
-- Uses LLM to add citations to final answer
+- Appends referenced memories to a per-session JSONL journal
+  (compacted into a JSON snapshot when the session is finalized)
+- Links final-answer claims to memories locally (LLM only as an opt-in fallback)
 """
 
 import os
+import re
 import json
-from typing import List, Dict, Any, Tuple
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from dotenv import load_dotenv
-from mem0.client.main import MemoryClient
-from rich import print as rprint
+from event_bus import log
+from tracing import span
 
-load_dotenv()
+from utils import artifacts_dir
+from memory_client import get_memory_client
+from citation_linker import CitationLinker, citation_llm_fallback_enabled
+from memory_sync import snapshot_enabled, get_snapshot_store
 
 
 class MemoryIDTracker:
@@ -22,33 +29,48 @@ class MemoryIDTracker:
 
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.mem0_api_key = os.getenv("MEM0_API_KEY")
-        self.client = MemoryClient(api_key=self.mem0_api_key)
 
-        # File to track all memory-ID pairs for this session
-        self.memory_file = f"/home/parthshr370/Downloads/DEEP_MEM/backend/artifacts/{session_id}_memory_references.json"
+        # Append-only journal of captured memory-ID pairs, compacted into memory_file at finalize
+        self.journal_file = str(artifacts_dir() / f"{session_id}_memory_references.jsonl")
+        self.memory_file = str(artifacts_dir() / f"{session_id}_memory_references.json")
         self.memory_references = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Shared mem0 client (created on first search, not when the session starts)"""
+        return get_memory_client()
 
     def search_and_capture(
         self, query: str, user_id: str, limit: int = 100
     ) -> Tuple[List[Dict], str]:
         """Search memories and capture IDs, return memories + prompt injection"""
 
-        rprint(f"Searching memories for: {query[:50]}...")
+        log(f"Searching memories for: {query[:50]}...")
 
-        # Get memories with IDs
-        memories = self.client.search(
-            query=query, user_id=user_id, limit=limit, threshold=0.5
-        )
+        # Get memories with IDs (local mirror first when enabled, mem0 otherwise)
+        from local_memory_index import local_index_enabled, get_local_index
+
+        if local_index_enabled():
+            with span("local_index.search", kind="index"):
+                memories = get_local_index(user_id, self.client).search(
+                    query=query, limit=limit, threshold=0.5
+                )
+        else:
+            with span("mem0.search", kind="mem0"):
+                memories = self.client.search(
+                    query=query, user_id=user_id, limit=limit, threshold=0.5
+                )
 
         # Capture memory-ID pairs
         prompt_injection = "\n## MEMORY CONTEXT WITH IDs:\n"
+        captured = {}
         for i, mem in enumerate(memories, 1):
             memory_id = mem.get("id", f"unknown_{i}")
             memory_text = mem.get("memory", "")
 
             # Store the reference
-            self.memory_references[memory_id] = {
+            captured[memory_id] = {
                 "memory": memory_text,
                 "score": mem.get("score", 0.0),
                 "metadata": mem.get("metadata", {}),
@@ -58,10 +80,10 @@ class MemoryIDTracker:
             # Add to prompt injection
             prompt_injection += f"[ID:{memory_id}] {memory_text}\n"
 
-        # Save references to file
-        self._save_references()
+        # Append only the newly captured references to the journal
+        self._record_references(captured)
 
-        rprint(f"Captured {len(memories)} memories with IDs")
+        log(f"Captured {len(memories)} memories with IDs")
         return memories, prompt_injection
 
     def get_all_and_capture(
@@ -69,20 +91,36 @@ class MemoryIDTracker:
     ) -> Tuple[List[Dict], str]:
         """Get all memories and capture IDs for metadata analysis"""
 
-        rprint("Getting all memories for metadata analysis...")
-
-        memories = self.client.get_all(
-            user_id=user_id, limit=limit, metadata={"summary_fact": True}
-        )
+        log("Getting all memories for metadata analysis...")
+
+        memories = None
+        if snapshot_enabled():
+            # Delta-sync the local snapshot, then read it instead of re-downloading
+            try:
+                store = get_snapshot_store(self.client)
+                with span("snapshot.sync", kind="sync"):
+                    store.sync(user_id)
+                memories = store.get_memories(
+                    user_id, limit=limit, metadata={"summary_fact": True}
+                )
+            except Exception as e:
+                log(f"Memory snapshot unavailable, loading from mem0: {e}")
+
+        if memories is None:
+            with span("mem0.get_all", kind="mem0"):
+                memories = self.client.get_all(
+                    user_id=user_id, limit=limit, metadata={"summary_fact": True}
+                )
 
         # Capture memory-ID pairs
         prompt_injection = "\n## ALL MEMORY CONTEXT WITH IDs:\n"
+        captured = {}
         for i, mem in enumerate(memories, 1):
             memory_id = mem.get("id", f"unknown_{i}")
             memory_text = mem.get("memory", "")
 
             # Store the reference
-            self.memory_references[memory_id] = {
+            captured[memory_id] = {
                 "memory": memory_text,
                 "metadata": mem.get("metadata", {}),
                 "query_used": "metadata_analysis",
@@ -91,10 +129,10 @@ class MemoryIDTracker:
             # Add to prompt injection
             prompt_injection += f"[ID:{memory_id}] {memory_text}\n"
 
-        # Save references to file
-        self._save_references()
+        # Append only the newly captured references to the journal
+        self._record_references(captured)
 
-        rprint(f"Captured {len(memories)} memories with IDs for metadata")
+        log(f"Captured {len(memories)} memories with IDs for metadata")
         return memories, prompt_injection
 
     def inject_into_prompt(self, base_prompt: str, memory_context: str) -> str:
@@ -109,11 +147,28 @@ This is critical for fact verification and source attribution.
 
         return base_prompt + memory_context + citation_instruction
 
-    def _save_references(self):
-        """Save memory references to file"""
+    def _record_references(self, captured: Dict[str, Dict[str, Any]]):
+        """Merge captured references and append one journal line per memory"""
+        if not captured:
+            return
+
+        lines = "".join(
+            json.dumps({"id": memory_id, **reference}, ensure_ascii=False) + "\n"
+            for memory_id, reference in captured.items()
+        )
+
+        with self._lock:
+            self.memory_references.update(captured)
+
+            os.makedirs(os.path.dirname(self.journal_file), exist_ok=True)
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def finalize(self) -> str:
+        """Write the compacted snapshot of all references for this session"""
         os.makedirs(os.path.dirname(self.memory_file), exist_ok=True)
 
-        with open(self.memory_file, "w") as f:
+        with self._lock, open(self.memory_file, "w", encoding="utf-8") as f:
             json.dump(
                 {
                     "session_id": self.session_id,
@@ -123,121 +178,187 @@ This is critical for fact verification and source attribution.
                 },
                 f,
                 indent=2,
+                ensure_ascii=False,
             )
 
+        return self.memory_file
+
     def add_citations_to_final_answer(self, final_answer: str) -> str:
-        """Use LLM to add proper citations to final answer based on tracked memories"""
+        """Link claims in the final answer to tracked memories and insert [ID:...] citations"""
 
-        from camel.agents import ChatAgent
-        from camel.messages import BaseMessage
-        from camel.models import ModelFactory
-        from camel.types import ModelPlatformType, ModelType
+        linker = CitationLinker(
+            self.memory_references,
+            threshold=float(os.getenv("CITATION_MATCH_THRESHOLD", "0.22")),
+        )
+        fallback = self._resolve_unmatched_claims if citation_llm_fallback_enabled() else None
+
+        try:
+            cited_answer, stats = linker.link(final_answer, fallback=fallback)
+        except Exception as e:
+            log(f"Error adding citations: {e}", level="error")
+            return final_answer  # Return original if citation fails
 
-        # Create citation prompt
-        memory_list = ""
-        for mem_id, mem_data in self.memory_references.items():
-            memory_list += f"[ID:{mem_id}] {mem_data['memory']}\n"
+        log(
+            f"Added citations to final answer: {stats['cited_locally']} claims linked locally, "
+            f"{stats['cited_by_fallback']} by LLM fallback, {stats['unmatched']} uncited"
+        )
+        return cited_answer
+
+    def _resolve_unmatched_claims(self, claims: List[str]) -> List[List[str]]:
+        """LLM fallback: pick supporting memory IDs for claims the local linker could not match"""
+
+        from model_pool import pooled_agent
+        from model_router import get_model_for
+        from llm_cache import cached_step
+
+        claim_list = "\n".join(f"{i}. {claim}" for i, claim in enumerate(claims))
+        memory_list = "".join(
+            f"[ID:{mem_id}] {mem_data['memory']}\n" for mem_id, mem_data in list(self.memory_references.items())
+        )
 
         citation_prompt = f"""
-You are a citation expert. Your job is to add proper memory ID citations to this research answer.
+You are a citation expert. For each numbered claim, pick the memory IDs that directly support it.
 
-ORIGINAL ANSWER:
-{final_answer}
+CLAIMS:
+{claim_list}
 
 AVAILABLE MEMORY REFERENCES:
 {memory_list}
 
-TASK:
-1. Read the original answer carefully
-2. For each factual claim or piece of information, find the corresponding memory reference
-3. Add the memory ID citation in square brackets after the relevant information
-4. Return the answer with proper citations added
-
-CITATION FORMAT: Use [ID:memory_id] immediately after the information it supports.
-EXAMPLE: "Diabetes affects 10% of adults [ID:abc123] and requires daily monitoring [ID:def456]."
-
-Return ONLY the answer with citations added. Do not add any explanation or meta-commentary.
+Return ONLY a JSON object mapping claim numbers to lists of supporting memory IDs.
+Use an empty list when no memory supports the claim.
+EXAMPLE: {{"0": ["abc123"], "1": [], "2": ["def456", "ghi789"]}}
 """
 
-        # Use LLM to add citations
         try:
-            model = ModelFactory.create(
-                model_platform=ModelPlatformType.GEMINI,
-                model_type=ModelType.GEMINI_2_5_FLASH,
-                api_key=os.getenv("GEMINI_API_KEY"),
-                model_config_dict={"temperature": 0.1},
-            )
-
-            system_message = BaseMessage.make_assistant_message(
-                role_name="CitationExpert",
-                content="You add memory ID citations to research answers for proper source attribution.",
-            )
-
-            agent = ChatAgent(system_message=system_message, model=model)
-            response = agent.step(
-                BaseMessage.make_user_message("User", citation_prompt)
-            )
-
-            cited_answer = response.msg.content.strip()
-            rprint("Added citations to final answer")
-            return cited_answer
+            with pooled_agent(
+                "CitationExpert",
+                "You match research claims to the memory IDs that support them.",
+                get_model_for("citation"),
+            ) as agent:
+                response = cached_step(agent, citation_prompt, site="citation")
+
+            content = response.msg.content.strip()
+            match = re.search(r"\{.*\}", content, re.DOTALL)
+            mapping = json.loads(match.group(0)) if match else {}
+            return [mapping.get(str(i)) or [] for i in range(len(claims))]
 
         except Exception as e:
-            rprint(f"Error adding citations: {e}")
-            return final_answer  # Return original if citation fails
+            log(f"Citation fallback failed: {e}", level="warning")
+            return [[] for _ in claims]
 
     def get_memory_references_summary(self) -> Dict[str, Any]:
         """Get summary of all memory references used"""
         return {
             "total_memories_referenced": len(self.memory_references),
             "memory_file": self.memory_file,
+            "journal_file": self.journal_file,
             "session_id": self.session_id,
         }
 
 
-# Global tracker instance (will be set by orchestrator)
-current_tracker: MemoryIDTracker = None
+def load_memory_references(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Rebuild a session's memory_references dict
+
+    Args:
+        path: Compacted snapshot (.json) or append-only journal (.jsonl)
+
+    Returns:
+        dict: memory_id -> reference (later journal lines win, as in the live tracker)
+    """
+    if path.endswith(".jsonl"):
+        references = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # tolerate a torn final line from an interrupted session
+                memory_id = entry.pop("id", None)
+                if memory_id is not None:
+                    references[memory_id] = entry
+        return references
 
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("memory_references", {})
 
-def init_tracker(session_id: str):
-    """Initialize the global tracker for a session"""
-    global current_tracker
-    current_tracker = MemoryIDTracker(session_id)
-    rprint(f"Initialized Memory ID Tracker for session: {session_id}")
+
+# Session-scoped tracker (set by orchestrator). A ContextVar instead of a module
+# global so concurrent pipelines in one process each see their own tracker.
+_current_tracker: contextvars.ContextVar = contextvars.ContextVar("current_tracker", default=None)
+
+
+def get_current_tracker() -> Optional[MemoryIDTracker]:
+    """Tracker bound to the current session context, if any"""
+    return _current_tracker.get()
+
+
+def init_tracker(session_id: str) -> MemoryIDTracker:
+    """Create a tracker for a session and bind it to the current context"""
+    tracker = MemoryIDTracker(session_id)
+    _current_tracker.set(tracker)
+    log(f"Initialized Memory ID Tracker for session: {session_id}")
+    return tracker
+
+
+@contextmanager
+def use_tracker(tracker: MemoryIDTracker):
+    """Bind a session's tracker for the duration of a block (e.g. inside a worker thread)"""
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
 
 
 def search_with_id_capture(
     query: str, user_id: str, limit: int = 100
 ) -> Tuple[List[Dict], str]:
     """Search and capture - convenience function"""
-    if not current_tracker:
+    tracker = get_current_tracker()
+    if not tracker:
         raise ValueError("Memory tracker not initialized!")
-    return current_tracker.search_and_capture(query, user_id, limit)
+    return tracker.search_and_capture(query, user_id, limit)
 
 
 def get_all_with_id_capture(user_id: str, limit: int = 150) -> Tuple[List[Dict], str]:
     """Get all and capture - convenience function"""
-    if not current_tracker:
+    tracker = get_current_tracker()
+    if not tracker:
         raise ValueError("Memory tracker not initialized!")
-    return current_tracker.get_all_and_capture(user_id, limit)
+    return tracker.get_all_and_capture(user_id, limit)
 
 
 def inject_memory_context(base_prompt: str, memory_context: str) -> str:
     """Inject memory context into prompt - convenience function"""
-    if not current_tracker:
+    tracker = get_current_tracker()
+    if not tracker:
         raise ValueError("Memory tracker not initialized!")
-    return current_tracker.inject_into_prompt(base_prompt, memory_context)
+    return tracker.inject_into_prompt(base_prompt, memory_context)
 
 
 def finalize_answer_with_citations(final_answer: str) -> str:
     """Add citations to final answer - convenience function"""
-    if not current_tracker:
+    tracker = get_current_tracker()
+    if not tracker:
+        raise ValueError("Memory tracker not initialized!")
+    return tracker.add_citations_to_final_answer(final_answer)
+
+
+def finalize_session_references() -> str:
+    """Write the compacted reference snapshot - convenience function"""
+    tracker = get_current_tracker()
+    if not tracker:
         raise ValueError("Memory tracker not initialized!")
-    return current_tracker.add_citations_to_final_answer(final_answer)
+    return tracker.finalize()
 
 
 def get_session_memory_summary() -> Dict[str, Any]:
     """Get memory usage summary - convenience function"""
-    if not current_tracker:
+    tracker = get_current_tracker()
+    if not tracker:
         return {"error": "Memory tracker not initialized"}
-    return current_tracker.get_memory_references_summary()
+    return tracker.get_memory_references_summary()
@@ -0,0 +1,267 @@
+"""
+Memory Sync - Incremental delta sync of mem0 memories into a local SQLite snapshot
+- Keeps one snapshot per user and an updated_at watermark from the last sync
+- Delta syncs only fetch memories created/updated since the watermark
+- Periodic (or explicitly requested) full syncs pick up deletions
+- Exposes a corpus fingerprint that downstream caches can key on
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+from event_bus import log
+from tracing import span
+
+from utils import CACHE_DIR
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    memory TEXT,
+    metadata TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    content_hash TEXT,
+    PRIMARY KEY (user_id, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    fingerprint TEXT,
+    total INTEGER,
+    synced_at REAL,
+    full_synced_at REAL,
+    needs_full_sync INTEGER DEFAULT 0
+);
+"""
+
+
+def _content_hash(mem: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"memory": mem.get("memory"), "metadata": mem.get("metadata"), "updated_at": mem.get("updated_at")},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemorySnapshotStore:
+    """Local per-user snapshot of mem0 memories kept fresh by watermark-based delta syncs"""
+
+    def __init__(
+        self,
+        db_path: str = None,
+        client=None,
+        page_size: int = 100,
+        min_sync_interval: float = 60,
+        full_sync_interval: float = 24 * 3600,
+    ):
+        self.db_path = db_path or str(CACHE_DIR / "memory_snapshot.sqlite3")
+        self.page_size = page_size
+        self.min_sync_interval = min_sync_interval
+        self.full_sync_interval = full_sync_interval
+        self._client = client
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            conn.commit()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from memory_client import get_memory_client
+
+            self._client = get_memory_client()
+        return self._client
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_state(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Sync bookkeeping for a user, None if never synced"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM sync_state WHERE user_id = ?", (user_id,)).fetchone()
+        return dict(row) if row else None
+
+    def _fetch_pages(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch every page of a v2 get_all query"""
+        memories = []
+        page = 1
+        while True:
+            with span("mem0.get_all", kind="mem0", page=page):
+                data = self.client.get_all(version="v2", filters=filters, page=page, page_size=self.page_size)
+            if isinstance(data, dict):
+                memories.extend(data.get("results", []))
+                if not data.get("next"):
+                    break
+                page += 1
+            else:
+                memories.extend(data or [])
+                break
+        return memories
+
+    def sync(self, user_id: str, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the user's snapshot up to date
+
+        Args:
+            user_id: mem0 user whose memories are mirrored
+            force_full: Re-download everything (also picks up deletions)
+
+        Returns:
+            dict: mode, fetched count, total memories and corpus fingerprint
+        """
+        with self._lock:
+            state = self.get_state(user_id)
+            now = time.time()
+
+            full = (
+                force_full
+                or state is None
+                or not state["watermark"]
+                or state["needs_full_sync"]
+                or now - (state["full_synced_at"] or 0) > self.full_sync_interval
+            )
+
+            if not full and now - (state["synced_at"] or 0) < self.min_sync_interval:
+                return {"mode": "skipped", "fetched": 0, "total": state["total"], "fingerprint": state["fingerprint"]}
+
+            user_filter = {"user_id": user_id}
+            if full:
+                fetched = self._fetch_pages({"AND": [user_filter]})
+            else:
+                fetched = self._fetch_pages(
+                    {"AND": [user_filter, {"updated_at": {"gte": state["watermark"]}}]}
+                )
+
+            rows = [
+                (
+                    user_id,
+                    mem["id"],
+                    mem.get("memory", ""),
+                    json.dumps(mem.get("metadata") or {}),
+                    mem.get("created_at"),
+                    mem.get("updated_at") or mem.get("created_at"),
+                    _content_hash(mem),
+                )
+                for mem in fetched
+                if mem.get("id")
+            ]
+
+            with closing(self._connect()) as conn:
+                if full:
+                    conn.execute("DELETE FROM memories WHERE user_id = ?", (user_id,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO memories (user_id, id, memory, metadata, created_at, updated_at, content_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+                total, watermark = conn.execute(
+                    "SELECT COUNT(*), MAX(updated_at) FROM memories WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                digest = hashlib.sha256()
+                for memory_id, content_hash in conn.execute(
+                    "SELECT id, content_hash FROM memories WHERE user_id = ? ORDER BY id", (user_id,)
+                ):
+                    digest.update(f"{memory_id}:{content_hash}\n".encode("utf-8"))
+                fingerprint = digest.hexdigest()
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state "
+                    "(user_id, watermark, fingerprint, total, synced_at, full_synced_at, needs_full_sync) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (
+                        user_id,
+                        watermark,
+                        fingerprint,
+                        total,
+                        now,
+                        now if full else (state["full_synced_at"] if state else None),
+                    ),
+                )
+                conn.commit()
+
+        mode = "full" if full else "delta"
+        log(f"Memory snapshot {mode} sync for {user_id}: {len(rows)} fetched, {total} total")
+        return {"mode": mode, "fetched": len(rows), "total": total, "fingerprint": fingerprint}
+
+    def get_memories(
+        self, user_id: str, limit: int = None, metadata: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """Read memories from the snapshot (newest first), optionally filtered by metadata equality"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, memory, metadata, created_at, updated_at FROM memories "
+                "WHERE user_id = ? ORDER BY created_at DESC, id",
+                (user_id,),
+            ).fetchall()
+
+        memories = []
+        for row in rows:
+            mem_metadata = json.loads(row["metadata"] or "{}")
+            if metadata and any(mem_metadata.get(k) != v for k, v in metadata.items()):
+                continue
+            memories.append(
+                {
+                    "id": row["id"],
+                    "memory": row["memory"],
+                    "metadata": mem_metadata,
+                    "created_at": row["created_at"],
+                    "updated_at": row["updated_at"],
+                }
+            )
+            if limit and len(memories) >= limit:
+                break
+        return memories
+
+    def get_fingerprint(self, user_id: str) -> Optional[str]:
+        """Corpus fingerprint from the last sync (changes whenever any memory changes)"""
+        state = self.get_state(user_id)
+        return state["fingerprint"] if state else None
+
+    def invalidate(self, user_id: str):
+        """Force the next sync to be a full one (e.g. after writing or deleting memories)"""
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE sync_state SET needs_full_sync = 1 WHERE user_id = ?", (user_id,))
+            conn.commit()
+
+
+# Shared store instance (created on first use)
+_store: MemorySnapshotStore = None
+_store_lock = threading.Lock()
+
+
+def snapshot_enabled() -> bool:
+    """Snapshot reads are on by default; MEMORY_SNAPSHOT=0 goes straight to mem0"""
+    return os.getenv("MEMORY_SNAPSHOT", "1").lower() not in ("0", "false", "no")
+
+
+def get_snapshot_store(client=None) -> MemorySnapshotStore:
+    """Get the shared snapshot store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MemorySnapshotStore(
+                db_path=os.getenv("MEMORY_SNAPSHOT_DB"),
+                client=client,
+                min_sync_interval=float(os.getenv("MEMORY_SNAPSHOT_SYNC_INTERVAL", "60")),
+            )
+        return _store
+
+
+def get_corpus_fingerprint(user_id: str) -> Optional[str]:
+    """Corpus fingerprint for a user - convenience function"""
+    return get_snapshot_store().get_fingerprint(user_id)
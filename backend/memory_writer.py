@@ -3,19 +3,16 @@ Memory Writer - Converts research reports into actionable memories for mem0 stor
 Simple module that extracts key insights and stores them as structured memories
 """
 
-import os
 import json
-from dotenv import load_dotenv
-from mem0.client.main import MemoryClient
-from rich import print as rprint
 
-from camel.agents import ChatAgent
-from camel.messages import BaseMessage
-from camel.models import ModelFactory
-from camel.types import ModelPlatformType, ModelType
+from event_bus import log, log_llm_output
+from tracing import span
+from memory_client import get_memory_client
 
-# Load environment variables
-load_dotenv()
+from model_pool import pooled_agent
+from model_router import get_model_for
+from llm_cache import cached_step
+from phase_cache import invalidate_user_caches
 
 # Configuration - same as final_mem0_populator.py
 USER_ID = "doctor_memory"  # Same as final_mem0_populator.py and main.py
@@ -24,15 +21,10 @@ USER_ID = "doctor_memory"  # Same as final_mem0_populator.py and main.py
 class MemoryWriter:
     def __init__(self):
         # Use same pattern as final_mem0_populator.py
-        self.mem0 = MemoryClient()  # No API key needed here, uses env var
+        self.mem0 = get_memory_client()  # Shared client, created on first use
         
-        # Simple model for memory extraction - adjusted for better JSON generation
-        self.model = ModelFactory.create(
-            model_platform=ModelPlatformType.GEMINI,
-            model_type="gemini-2.5-flash",  # Same as populator
-            api_key=os.getenv("GOOGLE_API_KEY"),  # Same env var as populator
-            model_config_dict={"temperature": 0.2, "max_tokens": 100000},  # Higher temp for better JSON generation
-        )
+        # Memory extraction model (tier set in config/models.py, same key env var as populator)
+        self.model = get_model_for("memory_extraction")
     
     def extract_actionable_memories(self, research_report: str, analysis_report: str, question: str) -> list:
         """Extract actionable memories from research and analysis reports"""
@@ -69,25 +61,22 @@ Extract key insights from the research reports above and format as JSON array.
 - Use exact phrases and details from the reports, not generic statements
 - Return ONLY the JSON array, no other text or formatting"""
 
-        system_message = BaseMessage.make_assistant_message(
-            role_name="MemoryExtractor",
-            content="You extract insights from research reports and return them as a JSON array. Analyze the provided research content and extract specific findings, not generic statements. Return only valid JSON - no explanations, markdown, or code blocks."
-        )
+        system_prompt = "You extract insights from research reports and return them as a JSON array. Analyze the provided research content and extract specific findings, not generic statements. Return only valid JSON - no explanations, markdown, or code blocks."
         
-        agent = ChatAgent(system_message=system_message, model=self.model)
-        response = agent.step(BaseMessage.make_user_message("User", prompt))
+        with pooled_agent("MemoryExtractor", system_prompt, self.model) as agent:
+            response = cached_step(agent, prompt, site="memory_extraction")
         
         try:
             response_content = response.msg.content.strip()
-            rprint(f"[debug] LLM response length: {len(response_content)}")
-            rprint(f"[debug] LLM response preview: {response_content[:200]}...")
+            log(f"LLM response length: {len(response_content)}", level="debug")
+            log(f"LLM response preview: {response_content[:200]}...", level="debug")
             
             memory_data = json.loads(response_content)
-            rprint(f"[debug] Successfully parsed {len(memory_data)} memories")
+            log(f"Successfully parsed {len(memory_data)} memories", level="debug")
             return memory_data
         except json.JSONDecodeError as e:
-            rprint(f"Memory extraction failed: {e}")
-            rprint(f"[debug] Raw response: {response.msg.content}")
+            log(f"Memory extraction failed: {e}", level="warning")
+            log_llm_output("Raw memory extraction response", response.msg.content)
             
             # Fallback: Create simple memories from the analysis
             fallback_memories = [
@@ -96,7 +85,7 @@ Extract key insights from the research reports above and format as JSON array.
                 {"memory": "Analysis artifacts generated", "topic": "artifacts"},
                 {"memory": "Memory extraction encountered JSON parsing error", "topic": "technical_issue"}
             ]
-            rprint(f"[debug] Using {len(fallback_memories)} fallback memories")
+            log(f"Using {len(fallback_memories)} fallback memories", level="debug")
             return fallback_memories
     
     def store_memories(self, memories: list, session_id: str, question: str) -> int:
@@ -111,22 +100,27 @@ Extract key insights from the research reports above and format as JSON array.
             if memory_text.strip():  # Check for non-empty content
                 try:
                     # Use same pattern as final_mem0_populator.py
-                    self.mem0.add(
-                        messages=[{"role": "assistant", "content": memory_text}],
-                        user_id=USER_ID,
-                        metadata={
-                            "session_id": session_id,
-                            "research_question": question,
-                            "topic": topic,
-                            "memory_type": "research_insight",
-                            "summary_fact": True  # Same as populator for consistency
-                        }
-                    )
+                    with span("mem0.add", kind="mem0"):
+                        self.mem0.add(
+                            messages=[{"role": "assistant", "content": memory_text}],
+                            user_id=USER_ID,
+                            metadata={
+                                "session_id": session_id,
+                                "research_question": question,
+                                "topic": topic,
+                                "memory_type": "research_insight",
+                                "summary_fact": True  # Same as populator for consistency
+                            }
+                        )
                     stored_count += 1
                     # Simplified logging for production use
-                    rprint(f"   + Stored insight {i+1}")
+                    log(f"   + Stored insight {i+1}")
                 except Exception as e:
-                    rprint(f"   - Failed to store memory {i+1}: {e}")
+                    log(f"   - Failed to store memory {i+1}: {e}", level="warning")
+        
+        # New memories change the corpus - drop memoized metadata and force a full re-sync
+        if stored_count:
+            invalidate_user_caches(USER_ID)
         
         return stored_count
     
@@ -137,11 +131,11 @@ Extract key insights from the research reports above and format as JSON array.
         memories = self.extract_actionable_memories(research_report, analysis_report, question)
         
         if not memories:
-            rprint("No memories extracted")
+            log("No memories extracted")
             return 0
         
         # Store memories - simple loop
-        rprint(f"Extracting and storing {len(memories)} research insights...")
+        log(f"Extracting and storing {len(memories)} research insights...")
         stored_count = self.store_memories(memories, session_id, question)
         
         return stored_count
@@ -155,6 +149,11 @@ def write_memories_from_reports(research_report: str, analysis_report: str, ques
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from rich import print as rprint
+
+    load_dotenv()
+
     # Test the memory writer with realistic sample data
     rprint("[yellow]Testing Memory Writer with Sample Data[/yellow]")
     
@@ -3,9 +3,11 @@ Analysis Engine for Deep Memory Research Pipeline
 Performs comprehensive meta-analysis of research artifacts and methodology
 """
 
+import contextvars
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
@@ -13,18 +15,12 @@ from typing import Dict, Any
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
+from event_bus import log, log_llm_output
 
-load_dotenv()
-
-from rich import print as rprint
-
-from camel.agents import ChatAgent
-from camel.messages import BaseMessage
-from camel.models import ModelFactory
-from camel.types import ModelPlatformType, ModelType
-
-from utils import load_artifact
+from utils import load_artifact, require_env
+from model_pool import pooled_agent
+from model_router import get_model_for
+from llm_cache import cached_step
 from config.prompts import (
     ANALYSIS_SYSTEM_PROMPT,
     METHODOLOGY_ANALYSIS_PROMPT,
@@ -36,6 +32,9 @@ from config.prompts import (
 # this is like a weaver just before the final report that combines it all
 # like metadat aartifact etc
 
+# Artifact types the analyses read (a session's trace, event log or earlier report are not inputs)
+ANALYSIS_ARTIFACT_TYPES = ("metadata", "plan", "search_list", "final_answer", "raw_results")
+
 
 class AnalysisEngine:
     """
@@ -43,27 +42,20 @@ class AnalysisEngine:
     quality, and findings across all pipeline artifacts
     """
 
-    def __init__(self):
-        rprint("Analysis engine initialized")
-        self.gemini_api_key = os.getenv("GEMINI_API_KEY")
-        if not self.gemini_api_key:
-            raise ValueError("Missing GEMINI_API_KEY in environment variables")
-
-        # Use Gemini 2.5 Pro for comprehensive analysis
-        self.model = ModelFactory.create(
-            model_platform=ModelPlatformType.GEMINI,
-            model_type=ModelType.GEMINI_2_5_PRO,
-            api_key=self.gemini_api_key,
-            model_config_dict={"temperature": 0.2, "max_tokens": 100000},
-        )
+    def __init__(self, concurrent: bool = None):
+        log("Analysis engine initialized")
+        # Run the three independent sub-analyses in parallel unless disabled
+        if concurrent is None:
+            concurrent = os.getenv("ANALYSIS_CONCURRENT", "1").lower() not in ("0", "false", "no")
+        self.concurrent = concurrent
 
-        self.analysis_agent = ChatAgent(
-            system_message=BaseMessage.make_assistant_message(
-                role_name="ResearchAnalyst",
-                content=ANALYSIS_SYSTEM_PROMPT,
-            ),
-            model=self.model,
-        )
+        require_env("GEMINI_API_KEY")
+
+    def _run_analysis(self, site: str, prompt: str) -> str:
+        """Run one analysis prompt on its own pooled agent (model tier chosen per call site)"""
+        with pooled_agent("ResearchAnalyst", ANALYSIS_SYSTEM_PROMPT, get_model_for(site)) as analysis_agent:
+            response = cached_step(analysis_agent, prompt, site=site)
+        return response.msg.content
 
     def load_artifacts(self, artifacts_dict: Dict[str, str]) -> Dict[str, Any]:
         """Load all research artifacts for analysis"""
@@ -72,9 +64,9 @@ class AnalysisEngine:
         for artifact_type, file_path in artifacts_dict.items():
             try:
                 loaded_artifacts[artifact_type] = load_artifact(file_path)
-                rprint(f"Loaded {artifact_type}: {file_path}")
+                log(f"Loaded {artifact_type}: {file_path}")
             except Exception as e:
-                rprint(f"Failed to load {artifact_type}: {e}")
+                log(f"Failed to load {artifact_type}: {e}")
                 loaded_artifacts[artifact_type] = {"error": str(e)}
 
         return loaded_artifacts
@@ -93,11 +85,7 @@ class AnalysisEngine:
             search_list=json.dumps(search_list, indent=2),
         )
 
-        response = self.analysis_agent.step(
-            BaseMessage.make_user_message(role_name="User", content=methodology_prompt)
-        )
-
-        return response.msg.content
+        return self._run_analysis("analysis_methodology", methodology_prompt)
 
     def analyze_data_quality(self, artifacts: Dict[str, Any]) -> str:
         """Analyze data quality and search effectiveness"""
@@ -131,11 +119,7 @@ class AnalysisEngine:
             metadata=json.dumps(metadata, indent=2),
         )
 
-        response = self.analysis_agent.step(
-            BaseMessage.make_user_message(role_name="User", content=data_quality_prompt)
-        )
-
-        return response.msg.content
+        return self._run_analysis("analysis_data_quality", data_quality_prompt)
 
     def analyze_findings_quality(self, artifacts: Dict[str, Any], question: str) -> str:
         """Analyze the quality and consistency of research findings"""
@@ -152,11 +136,7 @@ class AnalysisEngine:
             ),
         )
 
-        response = self.analysis_agent.step(
-            BaseMessage.make_user_message(role_name="User", content=findings_prompt)
-        )
-
-        return response.msg.content
+        return self._run_analysis("analysis_findings", findings_prompt)
 
     def generate_comprehensive_report(
         self,
@@ -169,13 +149,46 @@ class AnalysisEngine:
 
         artifacts = self.load_artifacts(artifacts_dict)
 
-        methodology_analysis = self.analyze_research_methodology(artifacts)
-
-        data_quality_analysis = self.analyze_data_quality(artifacts)
+        if self.concurrent:
+            # None of the sub-analyses depends on another - fan out and join
+            log("Running methodology, data quality and findings analyses concurrently...")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                methodology_future = executor.submit(
+                    contextvars.copy_context().run, self.analyze_research_methodology, artifacts
+                )
+                data_quality_future = executor.submit(
+                    contextvars.copy_context().run, self.analyze_data_quality, artifacts
+                )
+                findings_future = executor.submit(
+                    contextvars.copy_context().run, self.analyze_findings_quality, artifacts, question
+                )
+                methodology_analysis = methodology_future.result()
+                data_quality_analysis = data_quality_future.result()
+                findings_analysis = findings_future.result()
+        else:
+            methodology_analysis = self.analyze_research_methodology(artifacts)
+
+            data_quality_analysis = self.analyze_data_quality(artifacts)
+
+            findings_analysis = self.analyze_findings_quality(artifacts, question)
+
+        return self.synthesize_report(
+            question, artifacts_dict, execution_time, session_id,
+            methodology_analysis, data_quality_analysis, findings_analysis,
+        )
 
-        findings_analysis = self.analyze_findings_quality(artifacts, question)
+    def synthesize_report(
+        self,
+        question: str,
+        artifacts_dict: Dict[str, str],
+        execution_time: float,
+        session_id: str,
+        methodology_analysis: str,
+        data_quality_analysis: str,
+        findings_analysis: str,
+    ) -> str:
+        """Combine the three sub-analyses into the final meta-analysis report"""
 
-        # Generate final comprehensive report
         comprehensive_prompt = COMPREHENSIVE_ANALYSIS_PROMPT.format(
             session_id=session_id,
             question=question,
@@ -187,27 +200,26 @@ class AnalysisEngine:
             artifacts_details=json.dumps(artifacts_dict, indent=2),
         )
 
-        rprint("Generating meta-analysis report...")
-        response = self.analysis_agent.step(
-            BaseMessage.make_user_message(
-                role_name="User", content=comprehensive_prompt
-            )
-        )
+        log("Generating meta-analysis report...")
+        report = self._run_analysis("analysis_synthesis", comprehensive_prompt)
 
-        rprint("Meta-analysis complete")
-        rprint(response.msg.content)
+        log("Meta-analysis complete")
+        log_llm_output("Meta-analysis report", report)
 
-        return response.msg.content
+        return report
 
 
 def main():
     """Test the analysis engine"""
     import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
     parser = argparse.ArgumentParser(description="Research Analysis Engine")
-    parser.add_argument("--question", required=True, help="Research question")
+    parser.add_argument("--question", help="Research question (default: from the session checkpoint)")
     parser.add_argument(
-        "--artifacts", required=True, help="JSON file with artifact paths"
+        "--artifacts", help="JSON file with artifact paths (default: from the session checkpoint)"
     )
     parser.add_argument(
         "--execution_time", type=float, default=0.0, help="Execution time"
@@ -216,23 +228,39 @@ def main():
 
     args = parser.parse_args()
 
-    # Load artifacts dictionary
-    with open(args.artifacts, "r") as f:
-        artifacts_dict = json.load(f)
+    # Load artifacts dictionary (a checkpointed session records its own)
+    question = args.question
+    if args.artifacts:
+        with open(args.artifacts, "r") as f:
+            artifacts_dict = json.load(f)
+    if not (question and args.artifacts):
+        from checkpoints import SessionCheckpoint
+
+        try:
+            session = SessionCheckpoint(args.session_id).load_session()
+        except ValueError:
+            session = {}
+        question = question or session.get("question")
+        if not args.artifacts:
+            artifacts_dict = {
+                kind: path for kind, path in session.get("artifacts", {}).items() if kind in ANALYSIS_ARTIFACT_TYPES
+            }
+        if not question or not artifacts_dict:
+            parser.error("--question and --artifacts are required for sessions without a checkpoint")
 
     # Create analysis engine
     engine = AnalysisEngine()
 
     # Generate comprehensive report
     report = engine.generate_comprehensive_report(
-        question=args.question,
+        question=question,
         artifacts_dict=artifacts_dict,
         execution_time=args.execution_time,
         session_id=args.session_id,
     )
 
-    rprint("\nComprehensive Analysis Report")
-    rprint(report)
+    log("\nComprehensive Analysis Report")
+    log(report)
 
 
 if __name__ == "__main__":
@@ -1,31 +1,27 @@
+import hashlib
 import json
-import os
 import sys
 from datetime import datetime
-from dotenv import load_dotenv
-
-# Load environment variables FIRST
-load_dotenv()
 
 # Import utils for path setup
 from utils import ROOT
-from rich import print as rprint
+from event_bus import log, log_llm_output
+from tracing import span
 
-from config.prompts import ANALYSIS_PROMPT_TEMPLATE, METADATA_ANALYZER_PROMPT
+from config.prompts import (
+    ANALYSIS_PROMPT_TEMPLATE,
+    METADATA_ANALYZER_PROMPT,
+    METADATA_PROMPT_VERSION,
+)
 
-from camel.agents import ChatAgent
-from camel.messages import BaseMessage
-from camel.models import ModelFactory
-from camel.types import ModelPlatformType, ModelType
-from mem0.client.main import MemoryClient
+from memory_client import get_memory_client
+from model_pool import pooled_agent
+from model_router import model_router, get_model_for
+from llm_cache import cached_step
+from phase_cache import metadata_cache
 
 # Cloud Client Setup
 USER_ID = "doctor_memory"
-MEM0_API_KEY = os.getenv("MEM0_API_KEY")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not MEM0_API_KEY or not GEMINI_API_KEY:
-    raise ValueError("Missing API keys in environment variables")
 
 
 def get_filtered_memory_with_context(user_id: str = USER_ID, limit: int = 150):
@@ -43,26 +39,27 @@ def get_filtered_memory_with_context(user_id: str = USER_ID, limit: int = 150):
         memories, memory_context = get_all_with_id_capture(user_id=user_id, limit=limit)
         return memories, memory_context
     except Exception as e:
-        rprint(f"Error with ID tracker, using fallback method: {e}")
+        log(f"Error with ID tracker, using fallback method: {e}", level="warning")
         
         # Fallback: Direct mem0 client access
-        rprint(f"Loading {limit} memories for user: {user_id}")
-        client = MemoryClient(api_key=MEM0_API_KEY)
+        log(f"Loading {limit} memories for user: {user_id}")
+        client = get_memory_client()
         
-        memory = client.get_all(
-            user_id=user_id,
-            limit=limit,
-            metadata={
-                "summary_fact": True,
-            },
-        )
+        with span("mem0.get_all", kind="mem0"):
+            memory = client.get_all(
+                user_id=user_id,
+                limit=limit,
+                metadata={
+                    "summary_fact": True,
+                },
+            )
         
         filtered_memories = [
             {"id": mem["id"], "memory": mem["memory"], "metadata": mem["metadata"]}
             for mem in memory
         ]
         
-        rprint(f"Retrieved {len(filtered_memories)} memories from database")
+        log(f"Retrieved {len(filtered_memories)} memories from database")
         return filtered_memories, ""  # Empty context in fallback
 
 def get_filtered_memory(user_id: str = USER_ID, limit: int = 150):
@@ -77,21 +74,8 @@ def get_database_metadata(filtered_memory=None):
     Get database metadata analysis
     Returns: dict - metadata JSON or None if error
     """
-    rprint("Analyzing database metadata...")
-    model = ModelFactory.create(
-        model_platform=ModelPlatformType.GEMINI,
-        model_type="gemini-2.5-flash-lite",
-        api_key=GEMINI_API_KEY,
-        model_config_dict={"temperature": 0.3, "max_tokens": 100000},
-    )
-
-    metadata_agent = ChatAgent(
-        system_message=BaseMessage.make_assistant_message(
-            role_name="MetadataAnalyzer",
-            content=METADATA_ANALYZER_PROMPT,
-        ),
-        model=model,
-    )
+    log("Analyzing database metadata...")
+    model = get_model_for("metadata")
 
     if filtered_memory is None:
         filtered_memory = get_filtered_memory(USER_ID)
@@ -100,17 +84,67 @@ def get_database_metadata(filtered_memory=None):
         memory_data=json.dumps(filtered_memory, indent=2)
     )
 
-    response = metadata_agent.step(
-        BaseMessage.make_user_message(role_name="User", content=analysis_prompt)
-    )
+    with pooled_agent("MetadataAnalyzer", METADATA_ANALYZER_PROMPT, model) as metadata_agent:
+        response = cached_step(metadata_agent, analysis_prompt, site="metadata")
 
-    rprint("Database analysis complete")
-    rprint(response.msg.content)
+    log("Database analysis complete")
+    log_llm_output("Database metadata", response.msg.content)
 
     return response.msg.content
 
 
+def get_metadata_prompt_version() -> str:
+    """Manual prompt version plus a digest of the prompt text, so edits invalidate memoized output"""
+    digest = hashlib.sha256(
+        (METADATA_ANALYZER_PROMPT + ANALYSIS_PROMPT_TEMPLATE).encode("utf-8")
+    ).hexdigest()[:12]
+    return f"{METADATA_PROMPT_VERSION}-{digest}"
+
+
+def get_database_metadata_memoized(filtered_memory, user_id: str = USER_ID, max_memories: int = 150):
+    """
+    Phase 1 metadata with memoization on the memory corpus
+
+    Reuses the last metadata for (user_id, max_memories, corpus fingerprint,
+    prompt version, routed model); the corpus fingerprint comes from the local memory snapshot.
+
+    Returns:
+        tuple: (metadata JSON string, whether it was reused)
+    """
+    try:
+        from memory_sync import snapshot_enabled, get_corpus_fingerprint
+
+        fingerprint = get_corpus_fingerprint(user_id) if snapshot_enabled() else None
+    except Exception as e:
+        log(f"Corpus fingerprint unavailable, metadata will not be memoized: {e}")
+        fingerprint = None
+
+    key_parts = {
+        "max_memories": max_memories,
+        "corpus_fingerprint": fingerprint,
+        "prompt_version": get_metadata_prompt_version(),
+        "model": model_router.model_type_for_tier(model_router.tier_for("metadata")),
+    }
+
+    if fingerprint:
+        cached = metadata_cache.get(user_id, **key_parts)
+        if cached:
+            log("Memory corpus unchanged - reusing previous metadata analysis")
+            return cached, True
+
+    metadata_json = get_database_metadata(filtered_memory=filtered_memory)
+
+    if fingerprint and metadata_json:
+        metadata_cache.put(metadata_json, user_id, **key_parts)
+
+    return metadata_json, False
+
+
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
     # Direct execution for testing
     metadata = get_database_metadata()
     if metadata:
@@ -0,0 +1,148 @@
+"""
+Model Pool - Process-wide registry of warm LLM backends and reusable agents
+Every pipeline phase asks the pool for its model instead of calling ModelFactory.create,
+so concurrent research runs share one client per (platform, model_type, config).
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from camel.agents import ChatAgent
+from camel.messages import BaseMessage
+from camel.models import ModelFactory
+
+
+class ModelPool:
+    """Thread-safe registry of model backends and idle ChatAgents"""
+
+    def __init__(self, max_idle_agents: int = 32):
+        self.max_idle_agents = max_idle_agents
+        self._lock = threading.Lock()
+        self._models = {}
+        self._idle_agents = OrderedDict()  # agent key -> list of idle agents
+        self._idle_count = 0
+        self.stats = {
+            "models_created": 0,
+            "models_reused": 0,
+            "agents_created": 0,
+            "agents_reused": 0,
+        }
+
+    @staticmethod
+    def model_key(model_platform, model_type, model_config_dict: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None) -> tuple:
+        """Build the registry key for a model backend"""
+        return (
+            str(getattr(model_platform, "value", model_platform)),
+            str(getattr(model_type, "value", model_type)),
+            json.dumps(model_config_dict or {}, sort_keys=True),
+            api_key or "",
+        )
+
+    def get_model(self, model_platform, model_type, model_config_dict: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None):
+        """Return the shared backend for this configuration, creating it on first use"""
+        key = self.model_key(model_platform, model_type, model_config_dict, api_key)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self.stats["models_reused"] += 1
+                return model
+
+            model = ModelFactory.create(
+                model_platform=model_platform,
+                model_type=model_type,
+                api_key=api_key,
+                model_config_dict=dict(model_config_dict or {}),
+            )
+            model._pool_key = key
+            self._models[key] = model
+            self.stats["models_created"] += 1
+            return model
+
+    def checkout_agent(self, role_name: str, system_prompt: str, model) -> ChatAgent:
+        """Take an idle agent for this role/prompt/model (reset to a clean history) or build one"""
+        key = (role_name, system_prompt, id(model))
+
+        with self._lock:
+            idle = self._idle_agents.get(key)
+            agent = idle.pop() if idle else None
+            if agent is not None:
+                self._idle_count -= 1
+                if not idle:
+                    del self._idle_agents[key]
+                self.stats["agents_reused"] += 1
+            else:
+                self.stats["agents_created"] += 1
+
+        if agent is not None:
+            agent.reset()
+            return agent
+
+        agent = ChatAgent(
+            system_message=BaseMessage.make_assistant_message(
+                role_name=role_name,
+                content=system_prompt,
+            ),
+            model=model,
+        )
+        agent._pool_key = key
+        agent._pool_model_key = getattr(model, "_pool_key", None)
+        return agent
+
+    def release_agent(self, agent: ChatAgent):
+        """Return an agent to the idle pool, evicting the oldest idle agents past the cap"""
+        key = getattr(agent, "_pool_key", None)
+        if key is None or self.max_idle_agents <= 0:
+            return
+
+        with self._lock:
+            self._idle_agents.setdefault(key, []).append(agent)
+            self._idle_agents.move_to_end(key)
+            self._idle_count += 1
+
+            while self._idle_count > self.max_idle_agents:
+                oldest_key, oldest = next(iter(self._idle_agents.items()))
+                oldest.pop(0)
+                self._idle_count -= 1
+                if not oldest:
+                    del self._idle_agents[oldest_key]
+
+    @contextmanager
+    def agent(self, role_name: str, system_prompt: str, model):
+        """Context manager that checks an agent out and returns it to the pool afterwards"""
+        agent = self.checkout_agent(role_name, system_prompt, model)
+        try:
+            yield agent
+        finally:
+            self.release_agent(agent)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage counters"""
+        with self._lock:
+            return {
+                **self.stats,
+                "models_cached": len(self._models),
+                "idle_agents": self._idle_count,
+            }
+
+
+# Process-wide pool shared by every phase and every concurrent run
+model_pool = ModelPool()
+
+
+def get_model(model_platform, model_type, model_config_dict: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None):
+    """Get a pooled model backend - convenience function"""
+    return model_pool.get_model(model_platform, model_type, model_config_dict, api_key)
+
+
+def pooled_agent(role_name: str, system_prompt: str, model):
+    """Borrow a reset ChatAgent from the pool - convenience function"""
+    return model_pool.agent(role_name, system_prompt, model)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get model pool usage summary - convenience function"""
+    return model_pool.get_stats()
@@ -0,0 +1,139 @@
+"""
+Model Router - Resolves each LLM call site to a model tier and records per-tier metrics
+- Tiers and the call-site mapping live in config/models.py (overridable via env)
+- Models come from the shared model pool, so sites on the same tier share a backend
+- cached_step reports latency, token usage and cache hits per call site
+- camel is only imported when a model is first requested, so importing the router (for stats) stays cheap
+"""
+
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+
+from config.models import CALL_SITES, DEFAULT_API_KEY_ENV, MODEL_TIERS
+from replay import replay_mode
+
+
+class ModelRouter:
+    """Maps call sites to tiers/models and aggregates latency and cost per tier"""
+
+    def __init__(self, tiers: Dict[str, Dict[str, Any]] = None, sites: Dict[str, Dict[str, Any]] = None):
+        self.tiers = tiers or MODEL_TIERS
+        self.sites = sites or CALL_SITES
+        self._lock = threading.Lock()
+        self._metrics = defaultdict(
+            lambda: {"calls": 0, "cached": 0, "latency_seconds": 0.0, "input_tokens": 0, "output_tokens": 0}
+        )
+
+    def tier_for(self, site: str) -> str:
+        """Tier assigned to a call site (MODEL_SITE_<SITE> overrides the config)"""
+        if site not in self.sites:
+            raise ValueError(f"Unknown model call site: {site}")
+        tier = os.getenv(f"MODEL_SITE_{site.upper()}", self.sites[site]["tier"])
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown model tier '{tier}' for call site {site}")
+        return tier
+
+    def model_type_for_tier(self, tier: str) -> str:
+        """Model name for a tier (MODEL_TIER_<TIER> overrides the config)"""
+        return os.getenv(f"MODEL_TIER_{tier.upper()}", self.tiers[tier]["model_type"])
+
+    def get_model_for(self, site: str):
+        """Get the pooled model backend for a call site"""
+        from camel.types import ModelPlatformType
+        from model_pool import get_model
+
+        tier = self.tier_for(site)
+        if replay_mode() == "replay":
+            # Responses come from fixtures (llm_cache.cached_step); agents only need an offline backend
+            from camel.types import ModelType
+
+            return get_model(model_platform=ModelPlatformType.GEMINI, model_type=ModelType.STUB)
+
+        site_config = self.sites[site]
+        api_key_env = site_config.get("api_key_env", DEFAULT_API_KEY_ENV)
+        api_key = os.getenv(api_key_env)
+        if not api_key:
+            raise ValueError(f"Missing {api_key_env} in environment variables")
+
+        config = {"temperature": site_config.get("temperature", 0.2)}
+        max_tokens = site_config["max_tokens"] if "max_tokens" in site_config else self.tiers[tier].get("max_tokens")
+        if max_tokens:
+            config["max_tokens"] = max_tokens
+
+        return get_model(
+            model_platform=ModelPlatformType.GEMINI,
+            model_type=self.model_type_for_tier(tier),
+            api_key=api_key,
+            model_config_dict=config,
+        )
+
+    def record(self, site: str, latency_seconds: float, input_tokens: int, output_tokens: int, cached: bool = False):
+        """Record one call made on behalf of a call site (cache hits only count as calls)"""
+        try:
+            tier = self.tier_for(site)
+        except ValueError:
+            tier = "unrouted"
+        with self._lock:
+            for key in (("tier", tier), ("site", site)):
+                metrics = self._metrics[key]
+                metrics["calls"] += 1
+                if cached:
+                    # Cache hits cost nothing and would skew the tier's latency
+                    metrics["cached"] += 1
+                    continue
+                metrics["latency_seconds"] += latency_seconds
+                metrics["input_tokens"] += input_tokens
+                metrics["output_tokens"] += output_tokens
+
+    def _estimate_cost(self, tier: str, metrics: Dict[str, Any]) -> float:
+        input_price, output_price = self.tiers.get(tier, {}).get("cost_per_million", (0.0, 0.0))
+        return (metrics["input_tokens"] * input_price + metrics["output_tokens"] * output_price) / 1_000_000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier and per-site calls, latency, tokens and estimated cost"""
+        with self._lock:
+            snapshot = {key: dict(metrics) for key, metrics in self._metrics.items()}
+
+        stats = {"tiers": {}, "sites": {}}
+        for (kind, name), metrics in snapshot.items():
+            live_calls = metrics["calls"] - metrics["cached"]
+            tier = name
+            if kind == "site":
+                try:
+                    tier = self.tier_for(name)
+                except ValueError:
+                    tier = "unrouted"
+            stats[f"{kind}s"][name] = {
+                **metrics,
+                "tier": tier,
+                "model": self.model_type_for_tier(tier) if tier in self.tiers else None,
+                "avg_latency_seconds": round(metrics["latency_seconds"] / live_calls, 3) if live_calls else 0.0,
+                "estimated_cost_usd": round(self._estimate_cost(tier, metrics), 6),
+            }
+        return stats
+
+    def reset_stats(self):
+        """Clear collected metrics"""
+        with self._lock:
+            self._metrics.clear()
+
+
+# Process-wide router shared by every phase
+model_router = ModelRouter()
+
+
+def get_model_for(site: str):
+    """Get the model for a pipeline call site - convenience function"""
+    return model_router.get_model_for(site)
+
+
+def record_llm_call(site: str, latency_seconds: float, input_tokens: int, output_tokens: int, cached: bool = False):
+    """Record per-site/per-tier LLM metrics - convenience function"""
+    model_router.record(site, latency_seconds, input_tokens, output_tokens, cached)
+
+
+def get_router_stats() -> Dict[str, Any]:
+    """Get per-tier latency/cost summary - convenience function"""
+    return model_router.get_stats()
@@ -0,0 +1,99 @@
+"""
+Phase Cache - Memoizes phase outputs keyed on their inputs
+Each entry records the user it was computed for so writes to that user's
+memories can invalidate everything derived from the old corpus.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from event_bus import log
+from utils import CACHE_DIR
+
+
+class PhaseCache:
+    """JSON-file cache of a single phase's outputs"""
+
+    def __init__(self, phase: str, cache_dir: Path = None):
+        self.phase = phase
+        self.cache_dir = Path(cache_dir or CACHE_DIR / "phases" / phase)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**key_parts) -> str:
+        payload = json.dumps(key_parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, user_id: str, **key_parts) -> Optional[Any]:
+        """Return the memoized output for these inputs, or None"""
+        path = self._path(self.make_key(user_id=user_id, **key_parts))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["output"]
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, output: Any, user_id: str, **key_parts):
+        """Memoize a phase output"""
+        key = self.make_key(user_id=user_id, **key_parts)
+        entry = {
+            "phase": self.phase,
+            "user_id": user_id,
+            "key_parts": key_parts,
+            "created_at": time.time(),
+            "output": output,
+        }
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self._path(key))
+
+    def invalidate(self, user_id: str = None) -> int:
+        """Drop entries for a user (or all entries), returns number removed"""
+        removed = 0
+        if not self.cache_dir.exists():
+            return removed
+        with self._lock:
+            for path in self.cache_dir.glob("*.json"):
+                if user_id is not None:
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            if json.load(f).get("user_id") != user_id:
+                                continue
+                    except (OSError, json.JSONDecodeError):
+                        pass
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+# Phase 1 metadata artifacts, keyed on (user_id, max_memories, corpus fingerprint, prompt version)
+metadata_cache = PhaseCache("metadata")
+
+
+def invalidate_user_caches(user_id: str):
+    """Call after writing memories for a user: drops derived phase outputs and forces a full re-sync"""
+    metadata_cache.invalidate(user_id)
+
+    from memory_sync import get_snapshot_store, snapshot_enabled
+
+    # With snapshots off there is no store to reset (and opening one would create its database)
+    if not snapshot_enabled():
+        return
+    try:
+        get_snapshot_store().invalidate(user_id)
+    except Exception as e:
+        log(f"Memory snapshot invalidation failed for {user_id}, next sync may serve stale memories: {e}", level="warning")
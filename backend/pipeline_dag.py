@@ -0,0 +1,204 @@
+"""
+Pipeline DAG - Pipeline phases declared as nodes with explicit inputs and outputs
+- A node starts as soon as all its inputs exist; independent nodes run concurrently on a
+  bounded pool (PIPELINE_MAX_WORKERS). Workers run in a copy of the submitting context, so the
+  session tracker, event bus and tracer follow the work
+- Outputs are collected in a values dict owned by the caller. Nodes whose outputs are all
+  present already are skipped, so re-running an orchestrator never repeats finished work;
+  an on_node_complete callback lets callers persist outputs (session checkpoints)
+- Every node is timed as a phase span and publishes the same progress events: "starting" for
+  the first node of a progress phase, "progress" in between, and "completed" from the last one
+"""
+
+import contextvars
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from event_bus import emit_progress, log
+from tracing import span
+
+
+class Node:
+    """One unit of pipeline work"""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Dict[str, Any]],
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+        phase: Optional[str] = None,
+        message: str = None,
+        summarize: Callable[[Dict[str, Any]], Dict[str, Any]] = None,
+        persist: bool = True,
+    ):
+        """
+        Args:
+            name: Node name (also its trace span name)
+            fn: Called with the inputs as keyword arguments, returns a dict with every output
+            inputs: Values the node needs
+            outputs: Values the node produces
+            phase: Progress phase its events are published under (None: no progress events)
+            message: Progress message when the node starts
+            summarize: Builds the progress data published when the node completes
+            persist: Whether the outputs can be checkpointed (False for live objects like agents)
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.phase = phase
+        self.message = message or f"Running {name}"
+        self.summarize = summarize
+        self.persist = persist
+
+    def done(self, values: Dict[str, Any]) -> bool:
+        return all(output in values for output in self.outputs)
+
+
+class PipelineDAG:
+    """Validated node graph with a concurrent scheduler"""
+
+    def __init__(self, nodes: List[Node]):
+        self.nodes: Dict[str, Node] = {}
+        self.producers: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate pipeline node '{node.name}'")
+            self.nodes[node.name] = node
+            for output in node.outputs:
+                if output in self.producers:
+                    raise ValueError(f"'{output}' is produced by both '{self.producers[output].name}' and '{node.name}'")
+                self.producers[output] = node
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[Node]:
+        order, visiting, visited = [], set(), set()
+
+        def visit(node: Node):
+            if node.name in visited:
+                return
+            if node.name in visiting:
+                raise ValueError(f"Pipeline nodes form a cycle through '{node.name}'")
+            visiting.add(node.name)
+            for name in node.inputs:
+                if name in self.producers:
+                    visit(self.producers[name])
+            visiting.discard(node.name)
+            visited.add(node.name)
+            order.append(node)
+
+        for node in self.nodes.values():
+            visit(node)
+        return order
+
+    def plan(self, values: Dict[str, Any], targets: Iterable[str] = None) -> List[Node]:
+        """Nodes that still have to run to produce targets (default: every output), in dependency order"""
+        if targets is None:
+            needed = {node.name for node in self.order}
+        else:
+            needed, stack = set(), list(targets)
+            while stack:
+                name = stack.pop()
+                if name in values:
+                    continue
+                producer = self.producers.get(name)
+                if producer is None:
+                    raise ValueError(f"No pipeline node produces '{name}'")
+                if producer.name not in needed:
+                    needed.add(producer.name)
+                    stack.extend(producer.inputs)
+
+        pending = [node for node in self.order if node.name in needed and not node.done(values)]
+        for node in pending:
+            missing = [name for name in node.inputs if name not in values and name not in self.producers]
+            if missing:
+                raise ValueError(f"Pipeline node '{node.name}' is missing inputs: {', '.join(missing)}")
+        return pending
+
+    def run(
+        self,
+        values: Dict[str, Any],
+        targets: Iterable[str] = None,
+        max_workers: int = None,
+        on_node_complete: Callable[[Node, Dict[str, Any]], None] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run every pending node, updating values in place
+
+        on_node_complete(node, outputs) is called on the scheduling thread after each node succeeds.
+
+        Raises the first node error once the nodes already running have finished.
+        """
+        pending = self.plan(values, targets)
+        if not pending:
+            return values
+        max_workers = max_workers or int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+
+        # Nodes left per progress phase, so the phase's first start and last completion are known
+        phase_left: Dict[str, int] = {}
+        for node in pending:
+            if node.phase:
+                phase_left[node.phase] = phase_left.get(node.phase, 0) + 1
+        phase_started = set()
+
+        running = {}
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="pipeline-node") as executor:
+            while running or (pending and error is None):
+                if error is None:
+                    for node in [n for n in pending if all(name in values for name in n.inputs)]:
+                        pending.remove(node)
+                        if node.phase:
+                            status = "progress" if node.phase in phase_started else "starting"
+                            phase_started.add(node.phase)
+                            emit_progress(node.phase, status, {"message": node.message, "node": node.name})
+                        inputs = {name: values[name] for name in node.inputs}
+                        future = executor.submit(contextvars.copy_context().run, self._execute, node, inputs)
+                        running[future] = node
+                if not running:
+                    raise RuntimeError(f"Pipeline stalled with unscheduled nodes: {', '.join(n.name for n in pending)}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    try:
+                        outputs = future.result()
+                        values.update(outputs)
+                        if on_node_complete:
+                            on_node_complete(node, outputs)
+                    except Exception as e:
+                        if error is None:
+                            error = e
+                        if node.phase:
+                            emit_progress(node.phase, "failed", {"node": node.name, "error": str(e)})
+                        continue
+                    if node.phase:
+                        phase_left[node.phase] -= 1
+                        status = "completed" if phase_left[node.phase] == 0 else "progress"
+                        emit_progress(node.phase, status, {"node": node.name, **self._summary(node, values)})
+
+        if error is not None:
+            raise error
+        return values
+
+    @staticmethod
+    def _execute(node: Node, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        with span(node.name, kind="phase"):
+            outputs = node.fn(**inputs) or {}
+        missing = [name for name in node.outputs if name not in outputs]
+        if missing:
+            raise ValueError(f"Pipeline node '{node.name}' did not produce: {', '.join(missing)}")
+        return {name: outputs[name] for name in node.outputs}
+
+    @staticmethod
+    def _summary(node: Node, values: Dict[str, Any]) -> Dict[str, Any]:
+        if node.summarize is None:
+            return {"message": f"{node.name} complete"}
+        try:
+            return node.summarize({name: values[name] for name in node.outputs})
+        except Exception as e:
+            # Progress details are best effort; a malformed LLM payload must not fail the run
+            log(f"Progress summary for {node.name} failed: {e}", level="warning")
+            return {"message": f"{node.name} complete"}
@@ -0,0 +1,183 @@
+"""
+Replay - Offline record/replay stand-ins for Gemini and mem0
+- DEEP_RESEARCH_REPLAY=record: calls go to the live services and every LLM step and mem0
+  request/response pair is appended to fixture files
+- DEEP_RESEARCH_REPLAY=replay: no network or API keys; recorded responses are served back,
+  matched on the exact request first and otherwise on call order per LLM call site / mem0 method
+- DEEP_RESEARCH_FIXTURES: fixture directory (llm.jsonl + mem0.jsonl), default .cache/replay
+- DEEP_RESEARCH_REPLAY_LATENCY: "recorded" (sleep the recorded latency, default), or fixed
+  seconds per call ("0" for as fast as possible)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils import CACHE_DIR
+
+MODES = ("record", "replay")
+
+# mem0 methods that change state; in replay they succeed without a recording
+MEM0_WRITE_METHODS = ("add", "update", "delete", "delete_all", "batch_update", "batch_delete")
+
+
+def replay_mode() -> Optional[str]:
+    """Active mode from DEEP_RESEARCH_REPLAY ("record", "replay" or None)"""
+    mode = os.getenv("DEEP_RESEARCH_REPLAY", "").strip().lower()
+    if mode and mode not in MODES:
+        raise ValueError(f"DEEP_RESEARCH_REPLAY must be one of {MODES}, got '{mode}'")
+    return mode or None
+
+
+def fixtures_dir() -> Path:
+    return Path(os.getenv("DEEP_RESEARCH_FIXTURES", str(CACHE_DIR / "replay")))
+
+
+def request_key(*parts: Any) -> str:
+    """Stable digest of a request"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """
+    One JSONL fixture file of recorded calls
+
+    Each record has a request key, a channel (call site or mem0 method), the
+    response and the recorded latency. Lookups prefer an unused record with the
+    same key, then a used one (identical requests repeated more often than
+    recorded), then the next unused record on the same channel.
+    """
+
+    def __init__(self, path: Path, latency: str = None):
+        self.path = Path(path)
+        self.latency = latency if latency is not None else os.getenv("DEEP_RESEARCH_REPLAY_LATENCY", "recorded")
+        self._lock = threading.Lock()
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._by_key: Dict[str, List[int]] = {}
+        self._by_channel: Dict[str, List[int]] = {}
+        self._used = set()
+        self.stats = {"recorded": 0, "exact": 0, "repeated": 0, "by_order": 0, "missing": 0}
+
+    def _load(self):
+        if self._records is not None:
+            return
+        self._records = []
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._records.append(json.loads(line))
+        for i, record in enumerate(self._records):
+            self._by_key.setdefault(record["key"], []).append(i)
+            self._by_channel.setdefault(record["channel"], []).append(i)
+
+    def record(self, key: str, channel: str, response: Any, latency_seconds: float, **fields):
+        """Append a live call to the fixture file"""
+        record = {"key": key, "channel": channel, "latency_seconds": latency_seconds, "response": response, **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.stats["recorded"] += 1
+
+    def lookup(self, key: str, channel: str) -> Optional[Dict[str, Any]]:
+        """Recorded call for a request (None when nothing on the channel is left)"""
+        with self._lock:
+            self._load()
+            exact = self._by_key.get(key, [])
+            index = next((i for i in exact if i not in self._used), None)
+            if index is not None:
+                self.stats["exact"] += 1
+            elif exact:
+                index = exact[-1]
+                self.stats["repeated"] += 1
+            else:
+                index = next((i for i in self._by_channel.get(channel, []) if i not in self._used), None)
+                if index is None:
+                    self.stats["missing"] += 1
+                    return None
+                self.stats["by_order"] += 1
+            self._used.add(index)
+            return self._records[index]
+
+    def delay(self, record: Optional[Dict[str, Any]]):
+        """Sleep the injected latency for a replayed call"""
+        if self.latency == "recorded":
+            seconds = (record or {}).get("latency_seconds", 0.0)
+        else:
+            seconds = float(self.latency or 0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+_stores: Dict[str, FixtureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_fixture_store(name: str) -> FixtureStore:
+    """Shared fixture store for a backend ("llm" or "mem0")"""
+    path = fixtures_dir() / f"{name}.jsonl"
+    with _stores_lock:
+        store = _stores.get(str(path))
+        if store is None:
+            store = FixtureStore(path)
+            _stores[str(path)] = store
+        return store
+
+
+def reset_fixture_stores():
+    """Forget loaded fixtures and used records, so the next run replays from the start"""
+    with _stores_lock:
+        _stores.clear()
+
+
+class RecordingMemoryClient:
+    """Wraps a live MemoryClient and records every call and its response"""
+
+    def __init__(self, client, store: FixtureStore):
+        self._client = client
+        self._store = store
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def recorded(*args, **kwargs):
+            started = time.perf_counter()
+            response = attribute(*args, **kwargs)
+            self._store.record(
+                request_key(name, args, kwargs), name, response, time.perf_counter() - started,
+                request={"args": args, "kwargs": kwargs},
+            )
+            return response
+
+        return recorded
+
+
+class ReplayMemoryClient:
+    """Serves recorded mem0 responses; writes succeed without touching anything"""
+
+    def __init__(self, store: FixtureStore):
+        self._store = store
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def replayed(*args, **kwargs):
+            record = self._store.lookup(request_key(name, args, kwargs), name)
+            self._store.delay(record)
+            if record is not None:
+                return record["response"]
+            if name in MEM0_WRITE_METHODS:
+                return {"results": []}
+            return []
+
+        return replayed
@@ -1,21 +1,15 @@
-import os
 import sys
 import json
 import warnings
-from dotenv import load_dotenv
-
-# Load environment variables FIRST
-load_dotenv()
 
 # Import utils for path setup
-from utils import ROOT
+from utils import ROOT, require_env
 
-from rich import print as rprint
+from event_bus import log, log_llm_output
 
-from camel.agents import ChatAgent
-from camel.messages import BaseMessage
-from camel.models import ModelFactory
-from camel.types import ModelPlatformType, ModelType
+from model_pool import pooled_agent
+from model_router import get_model_for
+from llm_cache import cached_step
 from config.prompts import (
     STRATEGIC_PLANNING_SYSTEM_PROMPT,
     STRATEGIC_PLANNING_USER_PROMPT,
@@ -24,12 +18,6 @@ from config.prompts import (
 # Suppress warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-# Configuration
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise ValueError("Missing GEMINI_API_KEY in environment variables")
-
 
 # a rewoo loop to combine the metadata and user query to finally create a plan that the react agent can use
 
@@ -41,22 +29,10 @@ class ReWOOResearchPlanner:
     """
 
     def __init__(self):
-        rprint("Strategic planner initialized")
+        require_env("GEMINI_API_KEY")
+        log("Strategic planner initialized")
 
-        self.model = ModelFactory.create(
-            model_platform=ModelPlatformType.GEMINI,
-            model_type="gemini-2.5-flash-lite",
-            api_key=GEMINI_API_KEY,
-            model_config_dict={"temperature": 0.3, "max_tokens": 100000},
-        )
-
-        self.planner_agent = ChatAgent(
-            system_message=BaseMessage.make_assistant_message(
-                role_name="StrategicPlanner",
-                content=STRATEGIC_PLANNING_SYSTEM_PROMPT,
-            ),
-            model=self.model,
-        )
+        self.model = get_model_for("plan")
 
     def create_research_plan(self, user_query: str, metadata_json: str) -> str:
         """
@@ -69,18 +45,17 @@ class ReWOOResearchPlanner:
         Returns:
             str: Strategic research plan as JSON string
         """
-        rprint("Creating research plan...")
-        rprint(f"   Research Question: {user_query}")
+        log("Creating research plan...")
+        log(f"   Research Question: {user_query}")
 
         planning_prompt = STRATEGIC_PLANNING_USER_PROMPT.format(
             user_query=user_query, metadata_json=metadata_json
         )
 
-        response = self.planner_agent.step(
-            BaseMessage.make_user_message(role_name="User", content=planning_prompt)
-        )  # use camel agent again
+        with pooled_agent("StrategicPlanner", STRATEGIC_PLANNING_SYSTEM_PROMPT, self.model) as planner_agent:
+            response = cached_step(planner_agent, planning_prompt, site="plan")  # use camel agent again
 
-        rprint("Strategic plan complete")
-        rprint(response.msg.content)
+        log("Strategic plan complete")
+        log_llm_output("Research plan", response.msg.content)
 
         return response.msg.content
@@ -3,14 +3,26 @@
 FastAPI server exposing the Deep Memory Research Pipeline for a simple frontend.
 
 Endpoints:
-- POST /api/research/run: Execute the pipeline synchronously for a question
-- GET /api/health: Basic health check (env keys, artifacts dir)
+- POST /api/research/run: Execute the pipeline for a question and return the full result
+- POST /api/research/stream: Execute the pipeline and stream progress events (SSE)
+- POST /api/research/jobs: Submit a pipeline run, returns a job ID
+- POST /api/research/resume: Continue an interrupted session from its checkpoint, returns a job ID
+- GET /api/research/jobs[/{job_id}[/progress|/result]]: Job status, progress events and results
+- GET /api/research/sessions/{session_id}/analysis: Phase 4 report of a session (background_analysis
+  runs return the answer first and attach the report here when it is ready)
+- GET /api/health: Basic health check (env keys, job pool load, LLM cache hit/miss counters)
+
+All runs execute on a bounded worker pool (see jobs.py); submissions beyond its
+capacity are rejected with 429.
 """
 
 import os
 import sys
 import json
+import time
 import asyncio
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Any, Dict
 
@@ -25,12 +37,15 @@ CURRENT_DIR = Path(__file__).resolve().parent
 if str(CURRENT_DIR) not in sys.path:
     sys.path.append(str(CURRENT_DIR))
 
-from utils import load_artifact
-from main import DeepResearchOrchestrator
-
-
+# Load .env before any pipeline module reads its configuration
 load_dotenv()
 
+from utils import find_session_artifact, load_artifact
+from main import DeepResearchOrchestrator
+from checkpoints import SessionCheckpoint
+from jobs import JobQueueFull, ResearchJob, SessionBusy, get_job_manager
+from event_bus import PROGRESS, bind_event_bus, log
+
 app = FastAPI(title="Deep Memory Research Backend", version="1.0")
 
 # Allow local frontend by default
@@ -49,6 +64,13 @@ class RunRequest(BaseModel):
     max_memories: Optional[int] = 100
     store_memories: Optional[bool] = False
     max_iterations: Optional[int] = 5
+    background_analysis: Optional[bool] = None  # None: BACKGROUND_ANALYSIS env default
+
+
+class ResumeRequest(BaseModel):
+    session_id: str
+    store_memories: Optional[bool] = False
+    background_analysis: Optional[bool] = None
 
 
 @app.get("/api/health")
@@ -56,378 +78,375 @@ def health() -> Dict[str, Any]:
     mem0 = os.getenv("MEM0_API_KEY")
     gemini = os.getenv("GEMINI_API_KEY")
     ok = bool(mem0 and gemini)
+    # The cache module (and its model backend imports) loads with the first run; no counters before that
+    llm_cache = sys.modules.get("llm_cache")
     return {
         "ok": ok,
         "has_MEM0_API_KEY": bool(mem0),
         "has_GEMINI_API_KEY": bool(gemini),
+        "jobs": get_job_manager().get_stats(),
+        "llm_cache": llm_cache.get_cache_stats() if llm_cache else None,
     }
 
 
-@app.post("/api/research/run")
-def run_research(req: RunRequest) -> Dict[str, Any]:
+def _validate(req: RunRequest):
     if not req.question or not req.question.strip():
         raise HTTPException(status_code=400, detail="Question is required")
 
-    orchestrator = DeepResearchOrchestrator(
-        user_id=req.user_id or "doctor_memory",
-        max_memories=req.max_memories or 100,
-    )
 
-    # Capture pipeline logs to return to frontend for visual display
-    import io
-    import contextlib
-
-    # Inject max_iterations by temporarily wrapping phase 3 call
-    original_method = orchestrator.phase_3_strategic_deep_research
-    def wrapped_phase_3(question: str, strategic_plan: str, metadata_context: str):
-        return original_method(
-            question,
-            strategic_plan,
-            metadata_context,
+def _submit(runner, req: RunRequest, session_id: str = None) -> ResearchJob:
+    """Queue a run on the shared worker pool (429 when the pool and queue are full, 409 when the session is busy)"""
+    try:
+        return get_job_manager().submit(runner, session_id=session_id, **req.dict())
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except SessionBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+# Sessions whose Phase 4 runs in the background: orchestrator while running, result once done
+MAX_ANALYSIS_SESSIONS = 100
+_analysis_sessions: "OrderedDict[str, Any]" = OrderedDict()
+_analysis_sessions_lock = threading.Lock()
+
+
+def _track_background_analysis(orchestrator: DeepResearchOrchestrator):
+    """Keep a background analysis (or its rejection when the queue was full) retrievable by session ID"""
+    session_id = orchestrator.session_timestamp
+    with _analysis_sessions_lock:
+        _analysis_sessions[session_id] = orchestrator if orchestrator.analysis_future else orchestrator.analysis_result()
+        while len(_analysis_sessions) > MAX_ANALYSIS_SESSIONS:
+            _analysis_sessions.popitem(last=False)
+    if orchestrator.analysis_future is None:
+        return
+
+    def finished(future):
+        # Drop the orchestrator (and its run state) once the report exists
+        with _analysis_sessions_lock:
+            if session_id in _analysis_sessions:
+                _analysis_sessions[session_id] = future.result()
+
+    orchestrator.analysis_future.add_done_callback(finished)
+
+
+def _run_pipeline(orchestrator: DeepResearchOrchestrator, req: RunRequest) -> Dict[str, Any]:
+    """Run the pipeline for a request; background runs also take Phase 5 with them"""
+    # Phase 5 never goes through the CLI prompt: either the background worker runs it after
+    # the analysis, or the caller runs it once the response is assembled
+    store_memories = bool(req.store_memories) if orchestrator.background_analysis else False
+    result = orchestrator.run_complete_pipeline(req.question.strip(), store_memories=store_memories)
+    if orchestrator.analysis_future is not None or orchestrator.analysis_status == "rejected":
+        _track_background_analysis(orchestrator)
+    return result
+
+
+def _run_research_job(req: RunRequest):
+    """Runner for /api/research/run: full pipeline plus captured logs and loaded artifacts"""
+
+    def runner(job: ResearchJob) -> Dict[str, Any]:
+        orchestrator = DeepResearchOrchestrator(
+            user_id=req.user_id or "doctor_memory",
+            max_memories=req.max_memories or 100,
             max_iterations=req.max_iterations or 5,
+            background_analysis=req.background_analysis,
         )
-    orchestrator.phase_3_strategic_deep_research = wrapped_phase_3  # type: ignore
+        job.session_id = orchestrator.session_timestamp
+
+        # Pipeline logs for the frontend come from this run's own log sink
+        result = _run_pipeline(orchestrator, req)
+        if not result.get("success"):
+            return {"success": False, "error": result.get("error", "Pipeline failed")}
+
+        # Load selected artifacts for convenience
+        artifacts = result.get("artifacts", {})
+        response: Dict[str, Any] = {
+            "success": True,
+            "session_id": orchestrator.session_timestamp,
+            "execution_time": result.get("execution_time"),
+            "artifacts": artifacts,
+            "final_answer": result.get("final_answer"),
+            "trace": result.get("trace"),
+            "analysis_status": result.get("analysis_status"),
+        }
 
-    buffer = io.StringIO()
-    original_stdout = sys.stdout
+        # Try to parse metadata/plan when available
+        metadata_path = artifacts.get("metadata")
+        plan_path = artifacts.get("plan")
+        analysis_path = artifacts.get("analysis_report")
 
-    class Tee:
-        def __init__(self, *streams):
-            self.streams = streams
-        def write(self, data):
-            for s in self.streams:
-                try:
-                    s.write(data)
-                except Exception:
-                    pass
-        def flush(self):
-            for s in self.streams:
-                try:
-                    s.flush()
-                except Exception:
-                    pass
-
-    tee = Tee(original_stdout, buffer)
-    with contextlib.redirect_stdout(tee):
-        result = orchestrator.run_complete_pipeline(req.question.strip())
-    pipeline_logs = buffer.getvalue()
-    if not result.get("success"):
-        raise HTTPException(status_code=500, detail=result.get("error", "Pipeline failed"))
+        try:
+            if metadata_path:
+                response["metadata"] = load_artifact(metadata_path)
+        except Exception:
+            response["metadata"] = None
 
-    # Load selected artifacts for convenience
-    artifacts = result.get("artifacts", {})
-    response: Dict[str, Any] = {
-        "success": True,
-        "session_id": orchestrator.session_timestamp,
-        "execution_time": result.get("execution_time"),
-        "artifacts": artifacts,
-        "final_answer": result.get("final_answer"),
-        "logs": pipeline_logs,
-    }
+        try:
+            if plan_path:
+                response["plan"] = load_artifact(plan_path)
+        except Exception:
+            response["plan"] = None
+
+        try:
+            if analysis_path:
+                response["analysis_report"] = load_artifact(analysis_path)
+        except Exception:
+            response["analysis_report"] = None
 
-    # Try to parse metadata/plan when available
-    metadata_path = artifacts.get("metadata")
-    plan_path = artifacts.get("plan")
-    analysis_path = artifacts.get("analysis_report")
+        # Optionally write memories back (Phase 5)
+        if req.store_memories and not orchestrator.background_analysis:
+            try:
+                with bind_event_bus(orchestrator.events):
+                    stored = orchestrator.phase_5_memory_writing(req.question)
+                response["memories_stored"] = stored
+            except Exception as e:
+                # Don't fail the request if optional memory write fails
+                response["memories_stored_error"] = str(e)
 
-    try:
-        if metadata_path:
-            response["metadata"] = load_artifact(metadata_path)
-    except Exception:
-        response["metadata"] = None
+        response["logs"] = orchestrator.run_log.text()
+        return response
 
-    try:
-        if plan_path:
-            response["plan"] = load_artifact(plan_path)
-    except Exception:
-        response["plan"] = None
+    return runner
 
-    try:
-        if analysis_path:
-            response["analysis_report"] = load_artifact(analysis_path)
-    except Exception:
-        response["analysis_report"] = None
 
-    # Optionally write memories back (Phase 5)
-    if req.store_memories:
-        try:
-            stored = orchestrator.phase_5_memory_writing(req.question)
-            response["memories_stored"] = stored
-        except Exception as e:
-            # Don't fail the request if optional memory write fails
-            response["memories_stored_error"] = str(e)
+@app.post("/api/research/run")
+async def run_research(req: RunRequest) -> Dict[str, Any]:
+    _validate(req)
 
-    return response
+    # Run on the bounded worker pool; awaiting keeps no server thread busy meanwhile
+    job = _submit(_run_research_job(req), req)
+    await asyncio.wrap_future(job.future)
 
+    if job.status != "succeeded":
+        raise HTTPException(status_code=500, detail=job.error or "Pipeline failed")
+    return job.result
 
-@app.post("/api/research/stream")
-def stream_research(req: RunRequest):
-    """Stream research pipeline progress in real-time"""
-    if not req.question or not req.question.strip():
-        raise HTTPException(status_code=400, detail="Question is required")
 
-    def generate_progress():
-        import threading
-        import queue
-        import time
-        
-        progress_queue = queue.Queue()
-        
-        class ProgressOrchestrator(DeepResearchOrchestrator):
-            """Extends base orchestrator with progress reporting via queue"""
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, **kwargs)
-                self.progress_queue = progress_queue
-                
-            def emit_progress(self, phase: str, status: str, data: Any = None):
-                progress_data = {
-                    "phase": phase,
-                    "status": status,
-                    "timestamp": time.time(),
-                    "data": data
-                }
-                self.progress_queue.put(progress_data)
-                
-            def phase_1_metadata_analysis(self) -> str:
-                """Override to add progress reporting"""
-                self.emit_progress("metadata", "starting", {"message": "Loading memories from database"})
-                
-                # Load filtered memories
-                filtered_memories = get_filtered_memory(
-                    user_id=self.user_id, 
-                    limit=self.max_memories
-                )
-                self.emit_progress("metadata", "progress", {
-                    "message": f"Loaded {len(filtered_memories)} memories",
-                    "count": len(filtered_memories)
-                })
-                
-                self.emit_progress("metadata", "progress", {"message": "Analyzing database structure and patterns"})
-                
-                # Generate metadata analysis
-                metadata_json = get_database_metadata(filtered_memory=filtered_memories)
-                
-                if not metadata_json:
-                    raise ValueError("Failed to generate metadata analysis")
+class ProgressOrchestrator(DeepResearchOrchestrator):
+    """Base orchestrator whose phase progress events are forwarded to an emitter (e.g. a job's event log)"""
+    def __init__(self, *args, emitter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if emitter:
+            self.events.subscribe(
+                lambda event: emitter(event["phase"], event["status"], event["data"]), types=(PROGRESS,)
+            )
+
+
+def _load_result_artifacts(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Final streamed/job response: pipeline result plus loaded artifact contents"""
+    final_response = {
+        "success": result.get("success"),
+        "session_id": result.get("session_id"),
+        "execution_time": result.get("execution_time"),
+        "artifacts": result.get("artifacts"),
+        "final_answer": result.get("final_answer"),
+        "trace": result.get("trace"),
+        "analysis_status": result.get("analysis_status"),
+    }
+    if not result.get("success"):
+        final_response["error"] = result.get("error")
+
+    # Load and include artifact contents
+    try:
+        if result.get("artifacts"):
+            # Load metadata if available
+            if "metadata" in result["artifacts"]:
+                metadata_content = load_artifact(result["artifacts"]["metadata"])
+                if metadata_content:
+                    final_response["metadata"] = json.loads(metadata_content) if isinstance(metadata_content, str) else metadata_content
+            
+            # Load plan if available  
+            if "plan" in result["artifacts"]:
+                plan_content = load_artifact(result["artifacts"]["plan"])
+                if plan_content:
+                    final_response["plan"] = json.loads(plan_content) if isinstance(plan_content, str) else plan_content
+            
+            # Load analysis report if available
+            if "analysis_report" in result["artifacts"]:
+                analysis_content = load_artifact(result["artifacts"]["analysis_report"])
+                if analysis_content:
+                    final_response["analysis_report"] = analysis_content
                     
-                # Save metadata artifact
-                metadata_path = save_artifact("metadata", metadata_json, ext="json")
-                self.artifacts["metadata"] = metadata_path
-                
-                self.emit_progress("metadata", "completed", {
-                    "message": "Database analysis complete",
-                    "artifact_path": metadata_path,
-                    "summary": json.loads(metadata_json).get("database_summary", {})
-                })
-                
-                return metadata_json
-                
-            def phase_2_strategic_planning(self, question: str, metadata_json: str) -> str:
-                self.emit_progress("planning", "starting", {"message": "Creating strategic research plan"})
-                
-                from rewoo_planner import ReWOOResearchPlanner
-                planner = ReWOOResearchPlanner()
-                
-                research_plan = planner.create_research_plan(question, metadata_json)
-                
-                if "error" in research_plan.lower():
-                    raise ValueError("Failed to create research plan")
-                
-                plan_path = save_artifact("plan", research_plan, ext="json")
-                self.artifacts["plan"] = plan_path
-                
-                plan_data = json.loads(research_plan)
-                self.emit_progress("planning", "completed", {
-                    "message": "Strategic research plan created",
-                    "artifact_path": plan_path,
-                    "phases": plan_data.get("phases", []),
-                    "strategy": plan_data.get("search_strategy", "")
-                })
-                
-                return research_plan
-                
-            def phase_3_strategic_deep_research(self, question: str, strategic_plan: str, metadata_context: str, max_iterations: int = 5) -> tuple:
-                self.emit_progress("research", "starting", {
-                    "message": "Beginning strategic deep research",
-                    "max_iterations": max_iterations
-                })
-                
-                from strategic_react_agent import StrategicResearchAgent
-                
-                agent = StrategicResearchAgent()
-                
-                # Set up progress emission for the agent
-                def emit_iteration_progress(iteration_num, search_term, memories_found, memory_connections):
-                    self.emit_progress("research", "progress", {
-                        "message": f"Iteration {iteration_num}: Searching '{search_term}'",
-                        "current_iteration": iteration_num,
-                        "search_term": search_term,
-                        "memories_found": memories_found,
-                        "memory_connections": memory_connections[:3] if memory_connections else []  # Show first 3 connections
-                    })
-                
-                # Attach the emission method to the agent
-                agent.emit_iteration_progress = emit_iteration_progress
-                agent.set_progress_emitter(self.emit_progress)
-                
-                # Execute research with progress tracking
-                final_answer, raw_results = agent.execute_with_strategic_plan(
-                    question, strategic_plan, metadata_context, max_iterations=max_iterations
-                )
-                
-                final_answer_path = save_artifact("final_answer", final_answer, ext="md")
-                raw_results_path = save_jsonl_artifact("raw_results", raw_results)
-                
-                self.artifacts["final_answer"] = final_answer_path
-                self.artifacts["raw_results"] = raw_results_path
-                
-                self.emit_progress("research", "completed", {
-                    "message": "Research execution complete",
-                    "final_answer": final_answer,
-                    "artifact_paths": {
-                        "final_answer": final_answer_path,
-                        "raw_results": raw_results_path
-                    },
-                    "iterations_completed": len(raw_results),
-                    "raw_results": raw_results
-                })
-                
-                return final_answer, raw_results
-                
-            def phase_4_comprehensive_analysis(self, question: str, execution_time: float) -> str:
-                self.emit_progress("analysis", "starting", {"message": "Performing comprehensive meta-analysis"})
-                
-                from meta_analysis_engine import AnalysisEngine
-                analysis_engine = AnalysisEngine()
-                
-                analysis_report = analysis_engine.generate_comprehensive_report(
-                    question=question,
-                    artifacts_dict=self.artifacts,
-                    execution_time=execution_time,
-                    session_id=self.session_timestamp
+            # Load raw results if available
+            if "raw_results" in result["artifacts"]:
+                raw_results_content = load_artifact(result["artifacts"]["raw_results"])
+                if raw_results_content:
+                    final_response["raw_results"] = json.loads(raw_results_content) if isinstance(raw_results_content, str) else raw_results_content
+                    
+    except Exception as e:
+        # Log artifact loading errors but don't fail the whole response
+        log(f"Error loading artifacts: {e}", level="warning")
+
+    return final_response
+
+
+def _progress_research_job(req: RunRequest, resume_session: str = None):
+    """Runner for streamed and polled jobs: emits phase progress into the job's event log"""
+
+    def runner(job: ResearchJob) -> Dict[str, Any]:
+        try:
+            if resume_session:
+                orchestrator = ProgressOrchestrator.resume(
+                    resume_session, background_analysis=req.background_analysis, emitter=job.emit
                 )
-                
-                analysis_path = save_artifact("analysis_report", analysis_report, ext="md")
-                self.artifacts["analysis_report"] = analysis_path
-                
-                self.emit_progress("analysis", "completed", {
-                    "message": "Meta-analysis complete",
-                    "artifact_path": analysis_path
-                })
-                
-                return analysis_report
-        
-        # Import required modules
-        from utils import save_artifact, save_jsonl_artifact, get_timestamp, load_artifact
-        from metadata_generator import get_database_metadata, get_filtered_memory
-        
-        def run_pipeline():
-            try:
+            else:
                 orchestrator = ProgressOrchestrator(
                     user_id=req.user_id or "doctor_memory",
                     max_memories=req.max_memories or 100,
+                    max_iterations=req.max_iterations or 5,
+                    background_analysis=req.background_analysis,
+                    emitter=job.emit,
                 )
-                
-                # Inject max_iterations
-                original_method = orchestrator.phase_3_strategic_deep_research
-                def wrapped_phase_3(question: str, strategic_plan: str, metadata_context: str):
-                    return original_method(
-                        question,
-                        strategic_plan,
-                        metadata_context,
-                        max_iterations=req.max_iterations or 5,
-                    )
-                orchestrator.phase_3_strategic_deep_research = wrapped_phase_3
-                
-                result = orchestrator.run_complete_pipeline(req.question.strip())
-                
-                # Load all artifacts for final response
-                final_response = {
-                    "success": result.get("success"),
-                    "session_id": result.get("session_id"),
-                    "execution_time": result.get("execution_time"),
-                    "artifacts": result.get("artifacts"),
-                    "final_answer": result.get("final_answer"),
-                }
-                
-                # Load and include artifact contents
+            job.session_id = orchestrator.session_timestamp
+            
+            # Background analysis keeps publishing into the job's event log after "complete"
+            result = _run_pipeline(orchestrator, req)
+            result.setdefault("session_id", orchestrator.session_timestamp)
+            final_response = _load_result_artifacts(result)
+
+            # Optionally write memories back (Phase 5)
+            if req.store_memories and result.get("success") and not orchestrator.background_analysis:
                 try:
-                    if result.get("artifacts"):
-                        # Load metadata if available
-                        if "metadata" in result["artifacts"]:
-                            metadata_content = load_artifact(result["artifacts"]["metadata"])
-                            if metadata_content:
-                                final_response["metadata"] = json.loads(metadata_content) if isinstance(metadata_content, str) else metadata_content
-                        
-                        # Load plan if available  
-                        if "plan" in result["artifacts"]:
-                            plan_content = load_artifact(result["artifacts"]["plan"])
-                            if plan_content:
-                                final_response["plan"] = json.loads(plan_content) if isinstance(plan_content, str) else plan_content
-                        
-                        # Load analysis report if available
-                        if "analysis_report" in result["artifacts"]:
-                            analysis_content = load_artifact(result["artifacts"]["analysis_report"])
-                            if analysis_content:
-                                final_response["analysis_report"] = analysis_content
-                                
-                        # Load raw results if available
-                        if "raw_results" in result["artifacts"]:
-                            raw_results_content = load_artifact(result["artifacts"]["raw_results"])
-                            if raw_results_content:
-                                final_response["raw_results"] = json.loads(raw_results_content) if isinstance(raw_results_content, str) else raw_results_content
-                                
+                    with bind_event_bus(orchestrator.events):
+                        final_response["memories_stored"] = orchestrator.phase_5_memory_writing(req.question)
                 except Exception as e:
-                    # Log artifact loading errors but don't fail the whole response
-                    print(f"Error loading artifacts: {e}")
-                
-                # Final completion message
-                progress_queue.put({
-                    "phase": "complete",
-                    "status": "finished", 
-                    "timestamp": time.time(),
-                    "data": final_response
-                })
-                
-            except Exception as e:
-                progress_queue.put({
-                    "phase": "error",
-                    "status": "failed", 
-                    "timestamp": time.time(),
-                    "data": {"error": str(e)}
-                })
-        
-        # Start pipeline in separate thread
-        pipeline_thread = threading.Thread(target=run_pipeline)
-        pipeline_thread.start()
-        
-        # Stream progress updates
-        while True:
-            try:
-                progress = progress_queue.get(timeout=1)
-                yield f"data: {json.dumps(progress)}\n\n"
-                
-                if progress["phase"] in ["complete", "error"]:
-                    break
-                    
-            except queue.Empty:
-                # Send heartbeat
-                yield f"data: {json.dumps({'phase': 'heartbeat', 'status': 'alive', 'timestamp': time.time()})}\n\n"
-                continue
-        
-        pipeline_thread.join()
+                    final_response["memories_stored_error"] = str(e)
+
+            final_response["logs"] = orchestrator.run_log.text()
+            
+            # Final completion message
+            job.emit("complete", "finished", final_response)
+            return final_response
+            
+        except Exception as e:
+            job.emit("error", "failed", {"error": str(e)})
+            raise
+
+    return runner
+
+
+def _stream_job_events(job: ResearchJob):
+    """Yield a job's progress events as SSE lines until it completes or fails"""
+    cursor = 0
+    while True:
+        events, cursor = job.events_since(cursor, timeout=1)
+        for progress in events:
+            yield f"data: {json.dumps(progress)}\n\n"
+            if progress["phase"] in ["complete", "error"]:
+                return
+
+        if not events:
+            if job.done:
+                return
+            # Send heartbeat
+            yield f"data: {json.dumps({'phase': 'heartbeat', 'status': 'alive', 'timestamp': time.time()})}\n\n"
+
+
+@app.post("/api/research/stream")
+def stream_research(req: RunRequest):
+    """Stream research pipeline progress in real-time"""
+    _validate(req)
+    job = _submit(_progress_research_job(req), req)
 
     return StreamingResponse(
-        generate_progress(),
+        _stream_job_events(job),
         media_type="text/plain",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "Content-Type": "text/event-stream"
+            "Content-Type": "text/event-stream",
+            "X-Job-Id": job.job_id,
         }
     )
 
 
+@app.post("/api/research/jobs", status_code=202)
+def submit_research_job(req: RunRequest) -> Dict[str, Any]:
+    """Queue a research run and return its job ID immediately"""
+    _validate(req)
+    job = _submit(_progress_research_job(req), req)
+    return job.to_dict()
+
+
+@app.post("/api/research/resume", status_code=202)
+def resume_research_job(req: ResumeRequest) -> Dict[str, Any]:
+    """Queue the rest of an interrupted session: completed phases and research iterations are not repeated"""
+    try:
+        session = SessionCheckpoint(req.session_id).load_session()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not session.get("question"):
+        raise HTTPException(status_code=404, detail=f"No checkpoint for session: {req.session_id}")
+
+    run_req = RunRequest(
+        question=session["question"],
+        user_id=session.get("user_id"),
+        max_memories=session.get("max_memories"),
+        max_iterations=session.get("max_iterations"),
+        store_memories=req.store_memories,
+        background_analysis=req.background_analysis,
+    )
+    # The busy check and the job registration happen together under the job manager's lock
+    job = _submit(_progress_research_job(run_req, resume_session=req.session_id), run_req, session_id=req.session_id)
+    return job.to_dict()
+
+
+@app.get("/api/research/jobs")
+def list_research_jobs() -> Dict[str, Any]:
+    manager = get_job_manager()
+    return {"jobs": manager.list_jobs(), "pool": manager.get_stats()}
+
+
+def _get_job(job_id: str) -> ResearchJob:
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.get("/api/research/jobs/{job_id}")
+def get_research_job(job_id: str) -> Dict[str, Any]:
+    """Job status and latest progress event"""
+    return _get_job(job_id).to_dict()
+
+
+@app.get("/api/research/jobs/{job_id}/progress")
+def get_research_job_progress(job_id: str, since: int = 0) -> Dict[str, Any]:
+    """Progress events after the `since` cursor (pass back `next` to continue)"""
+    job = _get_job(job_id)
+    events, next_cursor = job.events_since(since)
+    return {"job_id": job_id, "status": job.status, "events": events, "next": next_cursor}
+
+
+@app.get("/api/research/jobs/{job_id}/result")
+def get_research_job_result(job_id: str) -> Dict[str, Any]:
+    """Final result of a finished job (409 while it is still queued or running)"""
+    job = _get_job(job_id)
+    if not job.done:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job.status}")
+    return job.to_dict(include_result=True)
+
+
 # To run: uvicorn DEEP_RESEARCH_BACKEND.server:app --reload --port 8000
 
 
+@app.get("/api/research/sessions/{session_id}/analysis")
+def get_session_analysis(session_id: str) -> Dict[str, Any]:
+    """Phase 4 status and report of a session (status: running, succeeded, failed or rejected)"""
+    with _analysis_sessions_lock:
+        entry = _analysis_sessions.get(session_id)
+    if isinstance(entry, DeepResearchOrchestrator):
+        return entry.analysis_result()
+    if entry is not None:
+        return entry
+
+    # Synchronous runs and sessions from earlier server processes: the saved report
+    path = find_session_artifact(session_id, "analysis_report", ext="md")
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No analysis for session: {session_id}")
+    return {
+        "session_id": session_id,
+        "status": "succeeded",
+        "error": None,
+        "artifact_path": path,
+        "analysis_report": load_artifact(path),
+    }
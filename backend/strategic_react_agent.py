@@ -3,67 +3,95 @@ Strategic Research Agent that explores mem0 memory networks using strategic plan
 Implements memory archaeology approach with guided iterative exploration.
 """
 
+import contextvars
+import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-from dotenv import load_dotenv
-
-# Load environment variables FIRST
-load_dotenv()
-
-# Import utils for path setup
-
-from camel.agents import ChatAgent
-from camel.messages import BaseMessage
-from camel.models import ModelFactory
-from camel.types import ModelPlatformType, ModelType
-from mem0.client.main import MemoryClient
-from rich import print as rprint
+from event_bus import emit_progress, log
+from tracing import span
+from memory_client import get_memory_client
+from utils import require_env
 from memory_id_tracker import search_with_id_capture, inject_memory_context
+from model_pool import pooled_agent
+from model_router import get_model_for
+from llm_cache import cached_step
+from context_packer import ContextPacker
 
 from config.prompts import (
     MEMORY_ANALYST_SYSTEM_PROMPT,
     MEMORY_ARCHAEOLOGIST_SYSTEM_PROMPT,
-    SEARCH_TERM_EXTRACTION_PROMPT,
-    SEARCH_TERM_EXTRACTION_SYSTEM,
     STRATEGIC_DECISION_PROMPT,
     STRATEGIC_MEMORY_ANALYSIS_PROMPT,
 )
 
 # Config
 USER_ID = "doctor_memory"
-MEM0_API_KEY = os.getenv("MEM0_API_KEY")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not MEM0_API_KEY or not GEMINI_API_KEY:
-    print("Missing API keys!")
-    exit(1)
+
+class NoveltyMonitor:
+    """Tracks new-memory yield and score distribution per iteration to stop unproductive research early"""
+
+    def __init__(self, patience: int = 2, score_floor: float = 0.55):
+        self.patience = patience
+        self.score_floor = score_floor
+        self.seen_ids = set()
+        self.stale_streak = 0
+        self.stop_reason = None
+
+    def observe(self, iteration: int, searches: list, results: list) -> dict:
+        """Record one iteration's merged results and return its novelty stats"""
+        ids = [r.get("id") for r in results if r.get("id")]
+        new_ids = [memory_id for memory_id in ids if memory_id not in self.seen_ids]
+        self.seen_ids.update(ids)
+
+        scores = sorted((r.get("score") or 0.0 for r in results), reverse=True)
+        stats = {
+            "iteration": iteration,
+            "searches": list(searches),
+            "memories_found": len(results),
+            "new_memories": len(new_ids),
+            "novelty": round(len(new_ids) / len(ids), 3) if ids else 0.0,
+            "max_score": round(scores[0], 3) if scores else 0.0,
+            "mean_score": round(sum(scores) / len(scores), 3) if scores else 0.0,
+            "total_unique_memories": len(self.seen_ids),
+        }
+
+        # An iteration is stale when it surfaces nothing new or only weak matches
+        if not new_ids:
+            self.stale_streak += 1
+            reason = "no_new_memories"
+        elif stats["max_score"] < self.score_floor:
+            self.stale_streak += 1
+            reason = "scores_below_floor"
+        else:
+            self.stale_streak = 0
+            reason = None
+
+        if reason and self.stale_streak >= self.patience:
+            self.stop_reason = reason
+        return stats
 
 
 class StrategicResearchAgent:
     def __init__(self):
-        self.mem0 = MemoryClient(api_key=MEM0_API_KEY)
-        self.progress_emitter = None
-
-        # Strategic research model setup
-        self.model = ModelFactory.create(
-            model_platform=ModelPlatformType.GEMINI,
-            model_type=ModelType.GEMINI_2_5_PRO,
-            api_key=GEMINI_API_KEY,
-            model_config_dict={"temperature": 0.2, "max_tokens": 100000},
-        )
-
-    def set_progress_emitter(self, emitter):
-        """Set progress emitter for streaming updates"""
-        self.progress_emitter = emitter
+        require_env("MEM0_API_KEY", "GEMINI_API_KEY")
+        self.max_parallel_searches = int(os.getenv("RESEARCH_PARALLEL_SEARCHES", "3"))
+        self.novelty_patience = int(os.getenv("RESEARCH_NOVELTY_PATIENCE", "2"))
+        self.score_floor = float(os.getenv("RESEARCH_SCORE_FLOOR", "0.55"))
+        self.decision_context_budget = int(os.getenv("DECISION_CONTEXT_TOKENS", "6000"))
+        self.answer_context_budget = int(os.getenv("ANSWER_CONTEXT_TOKENS", "24000"))
+        self.last_stop_reason = None
+        self.iteration_stats = []
 
     def emit_progress(self, phase: str, status: str, data=None):
-        """Emit progress update if emitter is set"""
-        if self.progress_emitter:
-            self.progress_emitter(phase, status, data)
+        """Publish a progress update on the current run's event bus (feeds the SSE stream)"""
+        emit_progress(phase, status, data)
 
     def search_and_think(self, query, iteration_num=1):
         """Memory traversal + relationship analysis cycle with ID tracking"""
-        rprint(f"Searching: '{query}'")
+        log(f"Searching: '{query}'")
 
         try:
             # Use memory ID tracker for search with ID capture
@@ -73,32 +101,33 @@ class StrategicResearchAgent:
                 limit=5  # Small limit for strategic research
             )
         except Exception as e:
-            rprint(f"Error with ID tracker, falling back to direct search: {e}")
+            log(f"Error with ID tracker, falling back to direct search: {e}", level="warning")
             # Fallback to direct mem0 search
-            results = self.mem0.search(
-                query=query,
-                user_id=USER_ID,
-                limit=5,
-                threshold=0.5
-            )
+            with span("mem0.search", kind="mem0"):
+                results = get_memory_client().search(
+                    query=query,
+                    user_id=USER_ID,
+                    limit=5,
+                    threshold=0.5
+                )
             memory_context = ""
 
-        rprint(f"Found {len(results)} connected memories")
+        log(f"Found {len(results)} connected memories")
 
         if not results:
-            rprint("No connected memories found for this exploration")
+            log("No connected memories found for this exploration")
             return [], "No results found"
 
         # Display memory relationship summary
-        rprint("Memory Connections Discovered:")
+        log("Memory Connections Discovered:", level="debug")
         memory_connections = []
         for i, result in enumerate(results, 1):
             memory = result.get("memory", "")
             metadata = result.get("metadata") or {}
             patient = metadata.get("patient_name", "Unknown")
             score = result.get("score", 0)
-            rprint(f"   {i}. [{patient}] Connection Strength: {score:.3f}")
-            rprint(f"      Memory Fragment: {memory[:100]}...")
+            log(f"   {i}. [{patient}] Connection Strength: {score:.3f}", level="debug")
+            log(f"      Memory Fragment: {memory[:100]}...", level="debug")
             
             memory_connections.append({
                 "patient": patient,
@@ -116,26 +145,64 @@ class StrategicResearchAgent:
         })
 
         # Use the memory context from tracker if available, otherwise format manually
-        if memory_context:
-            context = memory_context
-        else:
-            # Fallback: Format for agent with memory IDs for citations
-            context = ""
-            for i, result in enumerate(results, 1):
-                memory = result.get("memory", "")
-                metadata = result.get("metadata") or {}
-                patient = metadata.get("patient_name", "Unknown")
-                memory_id = result.get("id", f"unknown_{i}")
-                context += f"{i}. [ID:{memory_id}] [{patient}] {memory}\n"
+        context = memory_context or self.format_memory_context(results)
 
         return results, context
 
+    def search_many(self, queries, iteration_num, executor):
+        """
+        Run several searches concurrently and merge their results
+
+        Args:
+            queries: Search terms for this iteration
+            iteration_num: Current research iteration
+            executor: Bounded thread pool shared across the research loop
+
+        Returns:
+            list: Results de-duplicated by memory ID (best score kept), most relevant first
+        """
+        futures = [
+            executor.submit(contextvars.copy_context().run, self.search_and_think, query, iteration_num)
+            for query in queries
+        ]
+
+        merged = {}
+        for query, future in zip(queries, futures):
+            try:
+                results, _ = future.result()
+            except Exception as e:
+                log(f"Search failed: {e}", level="error")
+                continue
+            for i, result in enumerate(results, 1):
+                memory_id = result.get("id", f"unknown_{iteration_num}_{i}")
+                if memory_id not in merged or result.get("score", 0) > merged[memory_id].get("score", 0):
+                    merged[memory_id] = {**result, "search_query": query}
+
+        results = sorted(merged.values(), key=lambda r: r.get("score", 0), reverse=True)
+        if len(queries) > 1:
+            log(f"Merged {len(results)} unique memories from {len(queries)} parallel searches")
+        return results
+
+    @staticmethod
+    def format_memory_context(results) -> str:
+        """Format memories for the agent with memory IDs for citations"""
+        context = ""
+        for i, result in enumerate(results, 1):
+            memory = result.get("memory", "")
+            metadata = result.get("metadata") or {}
+            patient = metadata.get("patient_name", "Unknown")
+            memory_id = result.get("id", f"unknown_{i}")
+            context += f"{i}. [ID:{memory_id}] [{patient}] {memory}\n"
+        return context
+
     def execute_with_strategic_plan(
         self,
         question: str,
         strategic_plan: str,
         metadata_context: str = None,
         max_iterations: int = 5,
+        resume_state: dict = None,
+        on_iteration=None,
     ) -> tuple:
         """
         Execute research using strategic plan as guidance for iterative research.
@@ -145,19 +212,22 @@ class StrategicResearchAgent:
             strategic_plan: Strategic research plan from ReWOO planner as guidance
             metadata_context: Database metadata context for enhanced decision making
             max_iterations: Maximum number of research iterations
+            resume_state: Research state saved by on_iteration in an interrupted run
+            on_iteration: Called with the research state after every iteration (checkpointing)
 
         Returns:
             tuple: (final_answer, raw_results_list)
         """
-        rprint(f"Starting research: {question}")
+        log(f"Starting research: {question}")
 
         # Execute strategic iterative research with plan guidance
+        raw_results = []
         final_answer = self.strategic_research_loop(
-            question, strategic_plan, metadata_context, max_iterations
+            question, strategic_plan, metadata_context, max_iterations, raw_results,
+            resume_state=resume_state, on_iteration=on_iteration,
         )
 
-        # Return empty raw_results - strategic research doesn't track raw results currently
-        return final_answer, []
+        return final_answer, raw_results
 
     def strategic_research_loop(
         self,
@@ -165,118 +235,258 @@ class StrategicResearchAgent:
         strategic_plan: str,
         metadata_context: str = None,
         max_iterations: int = 5,
+        raw_results: list = None,
+        resume_state: dict = None,
+        on_iteration=None,
     ) -> str:
         """
         Execute iterative research guided by strategic plan
-        """
-        rprint("Strategic research loop started")
-
-        all_context = ""
-
-        # Create enhanced decision agent that uses strategic plan
-        enhanced_agent = ChatAgent(
-            system_message=BaseMessage.make_assistant_message(
-                role_name="StrategicResearcher",
-                content=MEMORY_ARCHAEOLOGIST_SYSTEM_PROMPT.format(
-                    strategic_plan=strategic_plan
-                ),
-            ),
-            model=self.model,
-        )
-
-        # Start with plan-guided initial search
-        current_search = self.extract_initial_search_from_plan(strategic_plan, question)
 
-        for iteration in range(1, max_iterations + 1):
-            rprint(f"\nIteration {iteration}/{max_iterations}")
+        Stops when the agent reports enough information, when consecutive iterations
+        surface no new memories (or only matches below the score floor), or at max_iterations.
+        Every retrieved memory is appended to raw_results (when given) tagged with its
+        search query, phase and iteration; per-iteration stats are kept in self.iteration_stats.
 
-            # Search with current terms
-            results, context = self.search_and_think(current_search, iteration)
-
-            # Add to accumulated context
-            if context != "No results found":
-                all_context += (
-                    f"\nStrategic Search {iteration} - '{current_search}':\n{context}\n"
-                )
-
-            # Get strategic decision from enhanced agent
-            if iteration < max_iterations:
-                decision_prompt = STRATEGIC_DECISION_PROMPT.format(
-                    question=question,
-                    strategic_plan=strategic_plan,
-                    all_context=all_context,
-                    iteration=iteration,
+        After every iteration on_iteration (when given) receives the research state: the completed
+        iterations with their merged results, the next searches and the stop reason once known.
+        Passing that state back as resume_state replays the completed iterations into the context,
+        novelty and raw results without searching again and continues with the next searches.
+        """
+        log("Strategic research loop started")
+
+        packer = ContextPacker()
+        raw_results = raw_results if raw_results is not None else []
+        self.iteration_stats = []
+        novelty = NoveltyMonitor(patience=self.novelty_patience, score_floor=self.score_floor)
+        stop_reason = "max_iterations"
+
+        # Start with the plan's first-phase searches; later phases back up decisions that propose nothing new
+        planned = self.planned_searches(strategic_plan)
+        current_searches = planned[0][: self.max_parallel_searches] if planned else []
+        backlog = [term for phase in planned for term in phase if term not in current_searches]
+        searches_run = set()
+
+        completed = []
+        start_iteration = 1
+        if resume_state and resume_state.get("question") == question:
+            for entry in resume_state.get("completed", []):
+                iteration, searches, results = entry["iteration"], entry["searches"], entry["results"]
+                searches_run.update(term.lower() for term in searches)
+                packer.add(iteration, searches, results)
+                self.iteration_stats.append(novelty.observe(iteration, searches, results))
+                search_phase = "planned" if iteration == 1 else "iterative"
+                raw_results.extend({**result, "search_phase": search_phase, "iteration": iteration} for result in results)
+                completed.append(entry)
+            start_iteration = len(completed) + 1
+            current_searches = resume_state.get("next_searches") or current_searches
+            if resume_state.get("stop_reason"):
+                stop_reason = resume_state["stop_reason"]
+                start_iteration = max_iterations + 1
+            log(f"Resuming research after {len(completed)} completed iterations")
+
+        def save_checkpoint(next_searches: list, stop: str = None):
+            if on_iteration is None:
+                return
+            state = {"question": question, "completed": completed, "next_searches": next_searches, "stop_reason": stop}
+            try:
+                on_iteration(state)
+            except Exception as e:
+                log(f"Could not checkpoint research state: {e}", level="warning")
+
+        # Borrow enhanced decision agent that uses strategic plan; searches fan out over a bounded pool
+        with pooled_agent(
+            "StrategicResearcher",
+            MEMORY_ARCHAEOLOGIST_SYSTEM_PROMPT.format(strategic_plan=strategic_plan),
+            get_model_for("decision"),
+        ) as enhanced_agent, ThreadPoolExecutor(
+            max_workers=max(1, self.max_parallel_searches), thread_name_prefix="research-search"
+        ) as executor:
+            if not current_searches and start_iteration <= max_iterations:
+                # Plan has no usable searches: the first structured decision picks them
+                decision = self.decide(
+                    enhanced_agent, question, strategic_plan, "No searches have been run yet.", 0, max_iterations
                 )
-                
-                # Inject memory context with IDs into the decision prompt
-                try:
-                    enhanced_prompt = inject_memory_context(decision_prompt, "")
-                except Exception as e:
-                    rprint(f"Warning: Could not inject memory context: {e}")
-                    enhanced_prompt = decision_prompt
-
-                response = enhanced_agent.step(
-                    BaseMessage.make_user_message(
-                        role_name="User", content=enhanced_prompt
+                current_searches = decision["next_searches"] or [question]
+
+            for iteration in range(start_iteration, max_iterations + 1):
+                with span(f"iteration {iteration}", kind="iteration", searches=list(current_searches)):
+                    log(f"\nIteration {iteration}/{max_iterations}")
+                    searches_run.update(term.lower() for term in current_searches)
+
+                    # Search with current terms (concurrently when the decision proposed several)
+                    results = self.search_many(current_searches, iteration, executor)
+
+                    # Add to accumulated context (de-duplicated by memory ID)
+                    packer.add(iteration, current_searches, results)
+                    completed.append({"iteration": iteration, "searches": list(current_searches), "results": results})
+
+                    # Track how much this iteration added before paying for another decision call
+                    stats = novelty.observe(iteration, current_searches, results)
+                    self.iteration_stats.append(stats)
+                    search_phase = "planned" if iteration == 1 else "iterative"
+                    raw_results.extend(
+                        {**result, "search_phase": search_phase, "iteration": iteration} for result in results
                     )
-                )
-
-                decision = response.msg.content
-                rprint("\nStrategic Decision:")
-                rprint(f"   {decision}")
-
-                # Parse decision
-                if "ENOUGH_INFO: YES" in decision:
-                    rprint("Strategic research complete - enough information gathered!")
-                    break
-
-                # Extract next search
-                next_search = None
-                for line in decision.split("\n"):
-                    if "NEXT_SEARCH:" in line:
-                        next_search = line.split("NEXT_SEARCH:")[1].strip()
+                    self.emit_progress("research", "progress", {
+                        "message": (
+                            f"Iteration {iteration}: {stats['new_memories']} new of "
+                            f"{stats['memories_found']} memories (best score {stats['max_score']:.3f})"
+                        ),
+                        "current_iteration": iteration,
+                        **stats,
+                    })
+
+                    if novelty.stop_reason:
+                        stop_reason = novelty.stop_reason
+                        log(f"Stopping early ({stop_reason}): last {novelty.stale_streak} iterations added nothing useful")
                         break
 
-                if next_search:
-                    current_search = next_search
-                else:
-                    rprint("No next search found, stopping strategic research")
-                    break
+                    # Get strategic decision from enhanced agent
+                    if iteration < max_iterations:
+                        decision = self.decide(
+                            enhanced_agent,
+                            question,
+                            strategic_plan,
+                            packer.pack(self.decision_context_budget),
+                            iteration,
+                            max_iterations,
+                        )
+
+                        if decision["enough_info"]:
+                            log("Strategic research complete - enough information gathered!")
+                            stop_reason = "enough_info"
+                            break
+
+                        next_searches = [term for term in decision["next_searches"] if term.lower() not in searches_run]
+                        if not next_searches:
+                            next_searches = [term for term in backlog if term.lower() not in searches_run][
+                                : self.max_parallel_searches
+                            ]
+                            if next_searches:
+                                log("Decision proposed no new searches, continuing with planned searches")
+
+                        if next_searches:
+                            current_searches = next_searches
+                            save_checkpoint(next_searches)
+                        else:
+                            log("No new searches left in the decision or the plan, stopping strategic research")
+                            stop_reason = "no_next_search"
+                            break
+
+        save_checkpoint([], stop_reason)
+        self.last_stop_reason = stop_reason
+        if self.iteration_stats:
+            self.iteration_stats[-1]["stop_reason"] = stop_reason
+        self.emit_progress("research", "progress", {
+            "message": f"Research loop stopped: {stop_reason}",
+            "stop_reason": stop_reason,
+            "iterations_completed": len(self.iteration_stats),
+            "total_unique_memories": len(novelty.seen_ids),
+        })
 
         # Generate final strategic answer with full context
-        rprint("Generating final report...")
-        if all_context.strip():
+        log("Generating final report...")
+        if packer.memories:
             final_answer = self.answer_strategic_question(
-                question, all_context, strategic_plan, metadata_context
+                question, packer.pack(self.answer_context_budget), strategic_plan, metadata_context
             )
         else:
             final_answer = "I couldn't find relevant information in the database to answer your question using the strategic approach."
 
         return final_answer
 
-    def extract_initial_search_from_plan(
-        self, strategic_plan: str, question: str
-    ) -> str:
-        """Extract the best initial search term from strategic plan using LLM"""
-
-        prompt = SEARCH_TERM_EXTRACTION_PROMPT.format(
-            question=question, strategic_plan=strategic_plan
+    def decide(
+        self,
+        agent,
+        question: str,
+        strategic_plan: str,
+        packed_context: str,
+        iteration: int,
+        max_iterations: int,
+    ) -> dict:
+        """Ask the research agent for a structured decision: enough_info, next_searches, reasoning"""
+        # The prompt carries the plan and the budgeted findings; earlier exchanges left in the
+        # agent's history would be re-sent on every call and grow input tokens per iteration
+        agent.reset()
+
+        decision_prompt = STRATEGIC_DECISION_PROMPT.format(
+            question=question,
+            strategic_plan=strategic_plan,
+            all_context=packed_context,
+            iteration=iteration,
+            max_iterations=max_iterations,
+            max_searches=self.max_parallel_searches,
         )
 
-        agent = ChatAgent(
-            system_message=BaseMessage.make_assistant_message(
-                role_name="SearchTermExtractor", content=SEARCH_TERM_EXTRACTION_SYSTEM
-            ),
-            model=self.model,
-        )
+        # Inject memory context with IDs into the decision prompt
+        try:
+            enhanced_prompt = inject_memory_context(decision_prompt, "")
+        except Exception as e:
+            log(f"Could not inject memory context: {e}", level="warning")
+            enhanced_prompt = decision_prompt
 
-        response = agent.step(
-            BaseMessage.make_user_message(role_name="User", content=prompt)
-        )
+        response = cached_step(agent, enhanced_prompt, site="decision")
+        decision = self.parse_decision(response.msg.content, self.max_parallel_searches)
 
-        extracted_term = response.msg.content.strip()
-        rprint(f"LLM extracted initial search term: '{extracted_term}'")
-        return extracted_term
+        log("\nStrategic Decision:")
+        log(f"   enough_info={decision['enough_info']} next_searches={decision['next_searches']}")
+        log(f"   {decision['reasoning']}")
+        self.emit_progress("research", "progress", {
+            "message": f"Decision after iteration {iteration}: "
+            + ("enough information" if decision["enough_info"] else f"{len(decision['next_searches'])} next searches"),
+            "current_iteration": iteration,
+            "decision": decision,
+        })
+        return decision
+
+    @staticmethod
+    def _parse_json_object(content: str) -> dict:
+        """Parse the first JSON object in an LLM response (tolerates code fences and stray text)"""
+        match = re.search(r"\{.*\}", content or "", re.DOTALL)
+        if not match:
+            return {}
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @classmethod
+    def parse_decision(cls, content: str, max_searches: int) -> dict:
+        """Normalize a decision response; malformed output becomes an empty (non-final) decision"""
+        data = cls._parse_json_object(content)
+
+        enough_info = data.get("enough_info", False)
+        if isinstance(enough_info, str):
+            enough_info = enough_info.strip().lower() in ("yes", "true")
+
+        raw_searches = data.get("next_searches") or []
+        if isinstance(raw_searches, str):
+            raw_searches = [raw_searches]
+
+        searches = []
+        for term in raw_searches:
+            term = str(term).strip()
+            if term and term.lower() not in (s.lower() for s in searches):
+                searches.append(term)
+
+        return {
+            "enough_info": bool(enough_info),
+            "next_searches": searches[:max_searches],
+            "reasoning": str(data.get("reasoning", "")).strip(),
+        }
+
+    @classmethod
+    def planned_searches(cls, strategic_plan: str) -> list:
+        """Search terms for each phase of the ReWOO plan, in phase order"""
+        phases = cls._parse_json_object(strategic_plan).get("phases") or []
+        planned = []
+        for phase in phases:
+            searches = phase.get("searches") if isinstance(phase, dict) else None
+            terms = [str(term).strip() for term in (searches or []) if str(term).strip()]
+            if terms:
+                planned.append(terms)
+        return planned
 
     def answer_strategic_question(
         self,
@@ -316,24 +526,19 @@ This metadata provided crucial context about:
         try:
             enhanced_prompt = inject_memory_context(prompt, "")
         except Exception as e:
-            rprint(f"Warning: Could not inject memory context into final answer: {e}")
+            log(f"Could not inject memory context into final answer: {e}", level="warning")
             enhanced_prompt = prompt
 
-        agent = ChatAgent(
-            system_message=BaseMessage.make_assistant_message(
-                role_name="MemoryAnalyst", content=MEMORY_ANALYST_SYSTEM_PROMPT
-            ),
-            model=self.model,
-        )
-
-        response = agent.step(
-            BaseMessage.make_user_message(role_name="User", content=enhanced_prompt)
-        )
+        with pooled_agent("MemoryAnalyst", MEMORY_ANALYST_SYSTEM_PROMPT, get_model_for("final_answer")) as agent:
+            response = cached_step(agent, enhanced_prompt, site="final_answer")
         return response.msg.content
 
 
 def main():
     """Strategic research testing"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
     print("Strategic Memory Research Agent")
     print("Ask questions and I'll use strategic research to find answers")
     print("Type 'exit' to quit\n")
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Backend modules are imported flat (as main.py and server.py do)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    """Point session artifacts and checkpoints at a temporary directory"""
+    import utils
+
+    monkeypatch.setattr(utils, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(utils, "_artifacts_dir_ready", False)
+    monkeypatch.setenv("EVENT_LOG_FILE", "0")
+    monkeypatch.setenv("CONSOLE_LOG_LEVEL", "off")
+    return tmp_path / "artifacts"
@@ -0,0 +1,35 @@
+from citation_linker import CitationLinker
+
+REFERENCES = {
+    "m1": {"memory": "John Smith takes metformin for type 2 diabetes with good glucose control"},
+    "m2": {"memory": "Mary Jones started lisinopril for hypertension after elevated blood pressure readings"},
+}
+
+
+def test_table_rows_are_left_untouched():
+    answer = (
+        "| Patient | Medication | Condition |\n"
+        "|---|---|---|\n"
+        "| John Smith | metformin for glucose control | type 2 diabetes |\n"
+        "\n"
+        "John Smith takes metformin for type 2 diabetes with good glucose control.\n"
+    )
+    linked, stats = CitationLinker(REFERENCES).link(answer)
+
+    table = answer.split("\n\n")[0]
+    assert linked.startswith(table)
+    assert linked.endswith("good glucose control [ID:m1].\n")
+    assert stats["claims"] == 1
+
+
+def test_tag_goes_after_closing_parenthesis():
+    answer = (
+        "Mary Jones started lisinopril after elevated blood pressure readings (hypertension).\n"
+        "- Lisinopril was started for elevated blood pressure (Mary Jones, hypertension)\n"
+    )
+    linked, _ = CitationLinker(REFERENCES).link(answer)
+
+    assert linked == (
+        "Mary Jones started lisinopril after elevated blood pressure readings (hypertension) [ID:m2].\n"
+        "- Lisinopril was started for elevated blood pressure (Mary Jones, hypertension) [ID:m2]\n"
+    )
@@ -0,0 +1,133 @@
+import pytest
+
+pytest.importorskip("camel")
+
+import llm_cache
+from camel.messages import BaseMessage
+from camel.responses import ChatAgentResponse
+from llm_cache import LLMResponseCache, cached_step
+
+DESCRIPTION = {
+    "platform": "gemini",
+    "model": "gemini-2.5-flash",
+    "temperature": 0.2,
+    "config": {"temperature": 0.2},
+    "system_prompt": "You are a research planner.",
+}
+
+
+class FakeAgent:
+    """Stands in for a camel ChatAgent: counts live steps and keeps a conversation"""
+
+    role_name = "Planner"
+
+    def __init__(self, reply="plan"):
+        self.reply = reply
+        self.steps = 0
+        self.chat_history = []
+        self.system_message = BaseMessage.make_assistant_message(role_name="system", content=DESCRIPTION["system_prompt"])
+        self._pool_model_key = ("gemini", "gemini-2.5-flash", '{"temperature": 0.2}')
+
+    def step(self, user_message):
+        self.steps += 1
+        reply = BaseMessage.make_assistant_message(role_name=self.role_name, content=self.reply)
+        self.update_memory(user_message, None)
+        self.update_memory(reply, None)
+        return ChatAgentResponse(msgs=[reply], terminated=False, info={})
+
+    def update_memory(self, message, role):
+        self.chat_history.append({"role": "user" if message.role_name == "User" else "assistant", "content": message.content})
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("DEEP_RESEARCH_REPLAY", raising=False)
+    cache = LLMResponseCache(tmp_path / "llm", max_bytes=1024 * 1024, ttl_seconds=3600)
+    monkeypatch.setattr(llm_cache, "llm_cache", cache)
+    return cache
+
+
+def test_key_is_stable_and_covers_every_input():
+    key = LLMResponseCache.make_key(DESCRIPTION, [], "plan the research")
+
+    assert key == LLMResponseCache.make_key(dict(DESCRIPTION), [], "plan the research")
+    assert key != LLMResponseCache.make_key(DESCRIPTION, [], "plan the research again")
+    assert key != LLMResponseCache.make_key({**DESCRIPTION, "config": {"temperature": 0.7}}, [], "plan the research")
+    assert key != LLMResponseCache.make_key({**DESCRIPTION, "system_prompt": "You are a critic."}, [], "plan the research")
+    assert key != LLMResponseCache.make_key(
+        DESCRIPTION, [{"role": "user", "content": "earlier turn"}], "plan the research"
+    )
+
+
+def test_expired_entries_are_dropped(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path, max_bytes=1024 * 1024, ttl_seconds=60)
+    now = 1_000_000.0
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now)
+    cache.put("k1", "answer", DESCRIPTION)
+
+    now += 30
+    assert cache.get("k1")["content"] == "answer"
+    now += 60
+    assert cache.get("k1") is None
+
+    stats = cache.get_stats()
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_bytes=1024 * 1024, ttl_seconds=0)
+    cache.put("k1", "a" * 100, DESCRIPTION)
+    entry_bytes = cache.get_stats()["bytes"]
+    cache.max_bytes = entry_bytes * 2 + 50  # room for two entries (timestamps vary in length), not three
+
+    cache.put("k2", "b" * 100, DESCRIPTION)
+    assert cache.get("k1") is not None
+    cache.put("k3", "c" * 100, DESCRIPTION)
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None
+    assert cache.get("k3") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+    reopened = LLMResponseCache(tmp_path, max_bytes=cache.max_bytes, ttl_seconds=0)
+    assert reopened.get_stats()["entries"] is None
+    assert reopened.get("k3") is not None
+    assert reopened.get_stats()["entries"] == 2
+
+
+def test_cached_step_counts_hits_and_misses(cache):
+    first = FakeAgent()
+    response = cached_step(first, "plan the research")
+    assert response.msg.content == "plan"
+    assert first.steps == 1
+
+    second = FakeAgent(reply="a different plan")
+    response = cached_step(second, "plan the research")
+    assert response.msg.content == "plan"
+    assert response.info["cached"]
+    assert second.steps == 0
+    assert [turn["content"] for turn in second.chat_history] == ["plan the research", "plan"]
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_follow_up_turn_is_keyed_on_the_conversation(cache):
+    agent = FakeAgent()
+    cached_step(agent, "plan the research")
+    cached_step(agent, "now refine it")
+
+    assert agent.steps == 2
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_disabled_cache_always_calls_the_model(cache):
+    cache.enabled = False
+    first, second = FakeAgent(), FakeAgent()
+    cached_step(first, "plan the research")
+    cached_step(second, "plan the research")
+
+    assert first.steps == second.steps == 1
+    assert cache.get_stats()["hits"] == cache.get_stats()["misses"] == 0
@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from local_memory_index import HashingEmbedder, LocalMemoryIndex
+
+MEMORIES = [
+    {"id": "m1", "memory": "John Smith takes metformin for type 2 diabetes; HbA1c improved to 6.8"},
+    {"id": "m2", "memory": "Mary Jones started lisinopril for hypertension after elevated blood pressure readings"},
+    {"id": "m3", "memory": "Colon cancer screening scheduled for Robert Brown next spring"},
+]
+
+
+class FakeClient:
+    """mem0 stand-in: serves the corpus and records remote searches"""
+
+    def __init__(self, memories):
+        self.memories = memories
+        self.searches = []
+
+    def get_all(self, user_id, limit=100):
+        return list(self.memories)
+
+    def search(self, query, user_id, limit=5, threshold=0.5):
+        self.searches.append(query)
+        return []
+
+
+@pytest.fixture(autouse=True)
+def no_snapshot(monkeypatch):
+    monkeypatch.setenv("MEMORY_SNAPSHOT", "0")
+
+
+def test_relevant_query_is_served_locally():
+    client = FakeClient(MEMORIES)
+    index = LocalMemoryIndex("doctor", client, embedder=HashingEmbedder())
+
+    results = index.search("metformin for type 2 diabetes", limit=2, threshold=0.5)
+
+    assert results and results[0]["id"] == "m1"
+    assert client.searches == []
+    assert index.stats["local_hits"] == 1
+
+
+def test_no_local_match_is_an_answer_not_a_remote_fallback():
+    client = FakeClient(MEMORIES)
+    index = LocalMemoryIndex("doctor", client, embedder=HashingEmbedder())
+
+    assert index.search("quarterly revenue forecast", limit=5) == []
+    assert client.searches == []
+    assert index.stats["local_misses"] == 1
+
+
+def test_falls_back_to_mem0_when_the_mirror_cannot_be_built():
+    client = FakeClient(MEMORIES)
+    client.get_all = lambda user_id, limit=100: (_ for _ in ()).throw(ConnectionError("offline"))
+    index = LocalMemoryIndex("doctor", client, embedder=HashingEmbedder())
+
+    index.search("metformin", limit=5)
+
+    assert client.searches == ["metformin"]
+    assert index.stats["remote_fallbacks"] == 1
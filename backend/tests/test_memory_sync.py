@@ -0,0 +1,129 @@
+from memory_sync import MemorySnapshotStore
+
+USER = "clinic"
+
+
+class FakeClient:
+    """In-memory mem0 v2 get_all: AND filters on user_id and updated_at gte, paged with a next link"""
+
+    def __init__(self):
+        self.memories = {}
+        self.calls = []
+
+    def add(self, memory_id, text, updated_at, user_id=USER, **metadata):
+        self.memories[memory_id] = {
+            "id": memory_id,
+            "memory": text,
+            "metadata": metadata,
+            "user_id": user_id,
+            "created_at": updated_at,
+            "updated_at": updated_at,
+        }
+
+    def get_all(self, version, filters, page, page_size):
+        self.calls.append({"filters": filters, "page": page})
+        matches = []
+        for mem in sorted(self.memories.values(), key=lambda mem: mem["id"]):
+            if all(self._matches(mem, condition) for condition in filters["AND"]):
+                matches.append(mem)
+        start = (page - 1) * page_size
+        return {
+            "results": [dict(mem) for mem in matches[start:start + page_size]],
+            "next": f"page={page + 1}" if start + page_size < len(matches) else None,
+        }
+
+    @staticmethod
+    def _matches(mem, condition):
+        if "user_id" in condition:
+            return mem["user_id"] == condition["user_id"]
+        return mem["updated_at"] >= condition["updated_at"]["gte"]
+
+
+def make_store(tmp_path, client):
+    return MemorySnapshotStore(db_path=str(tmp_path / "snapshot.sqlite3"), client=client, page_size=2, min_sync_interval=0)
+
+
+def seeded_client():
+    client = FakeClient()
+    client.add("m1", "John Smith takes metformin", "2024-01-01T00:00:00", condition="diabetes")
+    client.add("m2", "Mary Jones takes lisinopril", "2024-01-02T00:00:00", condition="hypertension")
+    client.add("m3", "Ann Lee has asthma", "2024-01-03T00:00:00", condition="asthma")
+    client.add("o1", "another user's memory", "2024-01-04T00:00:00", user_id="other")
+    return client
+
+
+def test_first_sync_downloads_every_page(tmp_path):
+    client = seeded_client()
+    store = make_store(tmp_path, client)
+
+    result = store.sync(USER)
+
+    assert result["mode"] == "full"
+    assert (result["fetched"], result["total"]) == (3, 3)
+    assert [call["page"] for call in client.calls] == [1, 2]
+    assert client.calls[0]["filters"] == {"AND": [{"user_id": USER}]}
+    assert {mem["id"] for mem in store.get_memories(USER)} == {"m1", "m2", "m3"}
+    assert [mem["id"] for mem in store.get_memories(USER, metadata={"condition": "asthma"})] == ["m3"]
+    assert store.get_fingerprint(USER) == result["fingerprint"]
+    assert store.get_state(USER)["watermark"] == "2024-01-03T00:00:00"
+
+
+def test_delta_sync_fetches_changes_since_the_watermark(tmp_path):
+    client = seeded_client()
+    store = make_store(tmp_path, client)
+    first = store.sync(USER)
+
+    client.add("m2", "Mary Jones switched to losartan", "2024-02-01T00:00:00", condition="hypertension")
+    client.add("m4", "Raj Patel started statins", "2024-02-02T00:00:00", condition="cholesterol")
+    client.calls.clear()
+    result = store.sync(USER)
+
+    assert result["mode"] == "delta"
+    assert client.calls[0]["filters"] == {
+        "AND": [{"user_id": USER}, {"updated_at": {"gte": "2024-01-03T00:00:00"}}]
+    }
+    # gte re-reads the memory at the watermark itself
+    assert (result["fetched"], result["total"]) == (3, 4)
+    assert result["fingerprint"] != first["fingerprint"]
+    memories = {mem["id"]: mem["memory"] for mem in store.get_memories(USER)}
+    assert memories["m2"] == "Mary Jones switched to losartan"
+    assert store.get_state(USER)["watermark"] == "2024-02-02T00:00:00"
+
+
+def test_unchanged_corpus_keeps_its_fingerprint(tmp_path):
+    store = make_store(tmp_path, seeded_client())
+    first = store.sync(USER)
+
+    assert store.sync(USER)["fingerprint"] == first["fingerprint"]
+    assert store.sync(USER, force_full=True)["fingerprint"] == first["fingerprint"]
+
+
+def test_sync_within_the_interval_is_skipped(tmp_path):
+    client = seeded_client()
+    store = MemorySnapshotStore(db_path=str(tmp_path / "snapshot.sqlite3"), client=client, min_sync_interval=3600)
+    first = store.sync(USER)
+    client.calls.clear()
+
+    result = store.sync(USER)
+
+    assert result == {"mode": "skipped", "fetched": 0, "total": 3, "fingerprint": first["fingerprint"]}
+    assert client.calls == []
+
+
+def test_invalidate_forces_a_full_sync_that_drops_deleted_memories(tmp_path):
+    client = seeded_client()
+    store = make_store(tmp_path, client)
+    first = store.sync(USER)
+
+    del client.memories["m1"]
+    assert store.sync(USER)["total"] == 3  # a delta sync cannot see deletions
+
+    store.invalidate(USER)
+    assert store.get_state(USER)["needs_full_sync"] == 1
+    result = store.sync(USER)
+
+    assert result["mode"] == "full"
+    assert result["total"] == 2
+    assert result["fingerprint"] != first["fingerprint"]
+    assert {mem["id"] for mem in store.get_memories(USER)} == {"m2", "m3"}
+    assert store.get_state(USER)["needs_full_sync"] == 0
@@ -0,0 +1,204 @@
+import json
+import threading
+
+import pytest
+
+from checkpoints import SessionCheckpoint
+from jobs import JobManager, SessionBusy
+from main import DeepResearchOrchestrator
+from utils import save_artifact
+
+
+class FakeEngine:
+    def load_artifacts(self, artifacts_dict):
+        return {kind: path for kind, path in artifacts_dict.items()}
+
+    def analyze_research_methodology(self, artifacts):
+        return "methodology"
+
+    def analyze_data_quality(self, artifacts):
+        return "data quality"
+
+    def analyze_findings_quality(self, artifacts, question):
+        return "findings"
+
+    def synthesize_report(self, question, artifacts_dict, execution_time, session_id, *analyses):
+        return "report: " + ", ".join(analyses)
+
+
+class FakeOrchestrator(DeepResearchOrchestrator):
+    """Pipeline with offline phases that records which ones ran"""
+
+    fail_research = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ran = []
+
+    def load_memories(self):
+        self.ran.append("memory_load")
+        return [{"id": "m1", "memory": "metformin for type 2 diabetes"}]
+
+    def _plan_setup(self):
+        return {"planner": object()}
+
+    def phase_1_metadata_analysis(self, filtered_memories=None):
+        self.ran.append("metadata")
+        self.artifacts["metadata"] = save_artifact("metadata", "{}", session_id=self.session_timestamp)
+        return "{}"
+
+    def phase_2_strategic_planning(self, question, metadata_json, planner=None):
+        self.ran.append("plan")
+        self.artifacts["plan"] = save_artifact("plan", '{"phases": []}', session_id=self.session_timestamp)
+        return '{"phases": []}'
+
+    def phase_3_strategic_deep_research(self, question, strategic_plan, metadata_context, max_iterations=None):
+        self.ran.append("research")
+        if self.fail_research:
+            raise RuntimeError("mem0 unreachable")
+        self.artifacts["final_answer"] = save_artifact("final_answer", "answer", ext="md", session_id=self.session_timestamp)
+        self.research_stats = {"iterations_completed": 1, "stop_reason": "enough_info", "iteration_stats": []}
+        return f"answer to {question}", [{"id": "m1"}]
+
+    def add_citations(self, final_answer):
+        self.ran.append("citations")
+        return final_answer + " [ID:m1]"
+
+    def _analysis_setup(self):
+        return {"analysis_engine": FakeEngine()}
+
+
+def interrupted_session(question="Which patients take metformin?"):
+    orchestrator = FakeOrchestrator(max_iterations=3)
+    orchestrator.fail_research = True
+    result = orchestrator.run_complete_pipeline(question, store_memories=False)
+    assert not result["success"]
+    return orchestrator
+
+
+def test_resume_runs_only_the_unfinished_nodes(artifacts):
+    first = interrupted_session()
+    checkpoint = SessionCheckpoint(first.session_timestamp)
+    assert checkpoint.load_session()["status"] == "failed"
+    assert {"memory_load", "metadata", "plan"} <= set(checkpoint.completed_nodes())
+
+    resumed = FakeOrchestrator.resume(first.session_timestamp)
+    assert resumed.question == "Which patients take metformin?"
+    assert resumed.max_iterations == 3
+    result = resumed.run_complete_pipeline(resumed.question, store_memories=False)
+
+    assert result["success"]
+    assert resumed.ran == ["research", "citations"]
+    assert result["final_answer"] == "answer to Which patients take metformin? [ID:m1]"
+    assert checkpoint.load_session()["status"] == "succeeded"
+    assert "analysis" in checkpoint.completed_nodes()
+
+
+def test_setup_nodes_are_not_checkpointed(artifacts):
+    first = interrupted_session()
+    completed = SessionCheckpoint(first.session_timestamp).completed_nodes()
+    assert "plan_setup" not in completed
+    assert "analysis_setup" not in completed
+
+
+def test_resume_without_checkpoint_raises(artifacts):
+    with pytest.raises(ValueError):
+        DeepResearchOrchestrator.resume("no_such_session")
+
+
+def test_different_question_discards_checkpoints(artifacts):
+    first = interrupted_session()
+    checkpoint = SessionCheckpoint(first.session_timestamp)
+    checkpoint.save_research_state({"question": first.question, "completed": [], "next_searches": ["x"]})
+
+    resumed = FakeOrchestrator.resume(first.session_timestamp)
+    result = resumed.run_complete_pipeline("Which patients have hypertension?", store_memories=False)
+
+    assert result["success"]
+    assert resumed.ran[:4] == ["memory_load", "metadata", "plan", "research"]
+    assert checkpoint.load_session()["question"] == "Which patients have hypertension?"
+    assert checkpoint.load_research_state() is None
+
+    again = FakeOrchestrator.resume(first.session_timestamp)
+    assert again.node_outputs["final_answer"].startswith("answer to Which patients have hypertension?")
+
+
+def test_research_state_for_another_question_is_ignored(artifacts):
+    checkpoint = SessionCheckpoint("session_1")
+    checkpoint.save_research_state({"question": "old", "completed": [], "next_searches": ["x"]})
+
+    assert checkpoint.load_research_state("new") is None
+    assert checkpoint.load_research_state("old")["next_searches"] == ["x"]
+
+
+def test_session_with_active_job_rejects_another():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def runner(job):
+        release.wait(5)
+        return {"success": True}
+
+    manager.submit(runner, session_id="session_1", question="q")
+    try:
+        with pytest.raises(SessionBusy):
+            manager.submit(runner, session_id="session_1", question="q")
+        manager.submit(lambda job: {"success": True}, session_id="session_2", question="q")
+    finally:
+        release.set()
+
+
+def test_research_loop_continues_after_the_last_saved_iteration(monkeypatch):
+    pytest.importorskip("camel")
+    import contextlib
+
+    import strategic_react_agent
+
+    monkeypatch.setenv("MEM0_API_KEY", "test")
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setenv("RESEARCH_NOVELTY_PATIENCE", "9")
+    monkeypatch.setattr(strategic_react_agent, "pooled_agent", contextlib.contextmanager(lambda *args: (yield None)))
+    monkeypatch.setattr(strategic_react_agent, "get_model_for", lambda site: None)
+
+    class Interrupted(Exception):
+        pass
+
+    class Agent(strategic_react_agent.StrategicResearchAgent):
+        crash_at = None
+
+        def __init__(self):
+            super().__init__()
+            self.searched = []
+
+        def search_many(self, queries, iteration_num, executor):
+            self.searched.append(list(queries))
+            if iteration_num == self.crash_at:
+                raise Interrupted()
+            return [{"id": f"{query}-{iteration_num}", "memory": query, "score": 0.9} for query in queries]
+
+        def decide(self, agent, question, strategic_plan, packed_context, iteration, max_iterations):
+            return {"enough_info": False, "next_searches": [f"s{iteration}a", f"s{iteration}b"], "reasoning": ""}
+
+        def answer_strategic_question(self, question, packed_context, strategic_plan, metadata_context):
+            return packed_context
+
+    plan = json.dumps({"phases": [{"searches": ["p1", "p2"]}]})
+    uninterrupted = Agent()
+    expected_answer, expected_results = uninterrupted.execute_with_strategic_plan("Q", plan, "", max_iterations=4)
+
+    saved = []
+    first = Agent()
+    first.crash_at = 3
+    with pytest.raises(Interrupted):
+        first.execute_with_strategic_plan(
+            "Q", plan, "", max_iterations=4, on_iteration=lambda state: saved.append(json.loads(json.dumps(state)))
+        )
+    assert len(saved[-1]["completed"]) == 2
+
+    resumed = Agent()
+    answer, results = resumed.execute_with_strategic_plan("Q", plan, "", max_iterations=4, resume_state=saved[-1])
+
+    assert resumed.searched == [["s2a", "s2b"], ["s3a", "s3b"]]
+    assert answer == expected_answer
+    assert results == expected_results
+    assert [stats["iteration"] for stats in resumed.iteration_stats] == [1, 2, 3, 4]
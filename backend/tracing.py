@@ -0,0 +1,226 @@
+"""
+Tracing - Hierarchical timing spans for pipeline runs
+- Spans wrap phases, LLM calls (with token counts) and mem0 requests
+- Each run binds its own Tracer through a contextvar; spans opened in worker threads
+  started with contextvars.copy_context() nest under the span that submitted them
+- span() is a no-op when no tracer is bound (CLI tools, tests)
+"""
+
+import contextvars
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Span:
+    """One timed operation with attributes and child spans"""
+
+    def __init__(self, name: str, kind: str, attributes: Dict[str, Any] = None, offset: float = 0.0):
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.offset = offset  # Seconds since the trace started
+        self.duration = None
+        self.error = None
+        self.children: List["Span"] = []
+
+    def set(self, **attributes):
+        """Add attributes (e.g. token counts known only after the call)"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        span = {
+            "name": self.name,
+            "kind": self.kind,
+            "start_seconds": round(self.offset, 4),
+            "duration_seconds": round(self.duration, 4) if self.duration is not None else None,
+        }
+        if self.attributes:
+            span["attributes"] = self.attributes
+        if self.error:
+            span["error"] = self.error
+        if self.children:
+            span["children"] = [child.to_dict() for child in self.children]
+        return span
+
+
+class Tracer:
+    """Collects the span tree of one pipeline run"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.root = Span("pipeline", "run", {"session_id": session_id})
+        self._lock = threading.Lock()
+
+    def _open(self, parent: Optional[Span], name: str, kind: str, attributes: Dict[str, Any]) -> Span:
+        span = Span(name, kind, attributes, time.perf_counter() - self._origin)
+        with self._lock:
+            (parent or self.root).children.append(span)
+        return span
+
+    def _close(self, span: Span):
+        span.duration = time.perf_counter() - self._origin - span.offset
+        if span.kind == "phase":
+            span.attributes["peak_rss_mb"] = peak_rss_mb()
+
+    def finish(self):
+        """Close the root span (again when work continued after an earlier save, e.g. background Phase 4)"""
+        with self._lock:
+            self._close(self.root)
+
+    def _walk(self):
+        stack = list(self.root.children)
+        while stack:
+            span = stack.pop()
+            yield span
+            stack.extend(span.children)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full span tree (the trace artifact)"""
+        with self._lock:
+            return {
+                "session_id": self.session_id,
+                "started_at": self.started_at,
+                "summary": self._summary(),
+                "root": self.root.to_dict(),
+            }
+
+    def summary(self, slowest: int = 5) -> Dict[str, Any]:
+        """Per-phase wall time, per-kind totals and the slowest individual calls"""
+        with self._lock:
+            return self._summary(slowest)
+
+    def phase_totals(self) -> Dict[str, Dict[str, Any]]:
+        """Per phase: wall time, LLM calls and tokens, mem0 calls and peak RSS at phase end"""
+        with self._lock:
+            totals = {}
+            for phase in self.root.children:
+                if phase.kind != "phase" or phase.duration is None:
+                    continue
+                phase_totals = {
+                    "seconds": round(phase.duration, 3),
+                    "llm_calls": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "mem0_calls": 0,
+                    "peak_rss_mb": phase.attributes.get("peak_rss_mb"),
+                }
+                stack = list(phase.children)
+                while stack:
+                    span = stack.pop()
+                    stack.extend(span.children)
+                    if span.kind == "llm":
+                        phase_totals["llm_calls"] += 1
+                        phase_totals["input_tokens"] += span.attributes.get("input_tokens", 0)
+                        phase_totals["output_tokens"] += span.attributes.get("output_tokens", 0)
+                    elif span.kind == "mem0":
+                        phase_totals["mem0_calls"] += 1
+                totals[phase.name] = phase_totals
+            return totals
+
+    def _summary(self, slowest: int = 5) -> Dict[str, Any]:
+        closed = [span for span in self._walk() if span.duration is not None]
+        phases = {span.name: round(span.duration, 3) for span in self.root.children
+                  if span.kind == "phase" and span.duration is not None}
+
+        by_kind: Dict[str, Dict[str, Any]] = {}
+        for span in closed:
+            if span.kind == "phase":
+                continue
+            totals = by_kind.setdefault(span.kind, {"count": 0, "seconds": 0.0})
+            totals["count"] += 1
+            totals["seconds"] += span.duration
+            for key in ("input_tokens", "output_tokens"):
+                if key in span.attributes:
+                    totals[key] = totals.get(key, 0) + span.attributes[key]
+        for totals in by_kind.values():
+            totals["seconds"] = round(totals["seconds"], 3)
+
+        # Slowest individual calls: leaf spans only, containers would just repeat their children
+        leaves = sorted((span for span in closed if not span.children and span.kind != "phase"),
+                        key=lambda span: span.duration, reverse=True)
+        return {
+            "total_seconds": round(self.root.duration, 3) if self.root.duration is not None else None,
+            "phases": phases,
+            "by_kind": by_kind,
+            "slowest": [
+                {"name": span.name, "kind": span.kind, "seconds": round(span.duration, 3)}
+                for span in leaves[:slowest]
+            ],
+        }
+
+
+class _NullSpan(Span):
+    """Span handed out when no tracer is bound"""
+
+    def __init__(self):
+        super().__init__("", "")
+
+    def set(self, **attributes):
+        pass
+
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar("current_tracer", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Tracer bound to the current context, if any"""
+    return _current_tracer.get()
+
+
+@contextmanager
+def bind_tracer(tracer: Tracer):
+    """Record spans opened in this context (and contexts copied from it) into tracer"""
+    tracer_token = _current_tracer.set(tracer)
+    span_token = _current_span.set(None)
+    try:
+        yield tracer
+    finally:
+        _current_span.reset(span_token)
+        _current_tracer.reset(tracer_token)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """
+    Time a block as a child of the current span
+
+    Args:
+        name: Span name (e.g. "phase_3_research", "llm:decision", "mem0.search")
+        kind: Span category used for totals (phase, llm, mem0, ...)
+        **attributes: Extra attributes recorded on the span
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield _NullSpan()
+        return
+
+    current = tracer._open(_current_span.get(), name, kind, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer._close(current)
@@ -4,21 +4,43 @@ Handles paths, artifact persistence, and common functionality
 """
 
 import json
+import os
 import pathlib
+import re
 import sys
+import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, Union
 
 # Project root and path setup  
 ROOT = pathlib.Path(__file__).resolve().parent  # Current directory is now root
-ARTIFACTS_DIR = ROOT / "artifacts"
+# Artifact root is configurable so deployments can keep sessions outside the source tree
+ARTIFACTS_DIR = pathlib.Path(os.getenv("DEEP_RESEARCH_ARTIFACTS_DIR", str(ROOT / "artifacts")))
+CACHE_DIR = ROOT / ".cache"
 
 # Add required modules to Python path
 sys.path.append(str(ROOT / "camel"))
 sys.path.append(str(ROOT / "mem0"))
 
-# Ensure artifacts directory exists
-ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+_artifacts_dir_ready = False
+
+
+def artifacts_dir() -> pathlib.Path:
+    """Artifacts directory, created on first use rather than at import"""
+    global _artifacts_dir_ready
+    if not _artifacts_dir_ready:
+        ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+        _artifacts_dir_ready = True
+    return ARTIFACTS_DIR
+
+
+def require_env(*names: str):
+    """Raise if any of the given environment variables is missing (checked at use, not import)"""
+    if os.getenv("DEEP_RESEARCH_REPLAY", "").strip().lower() == "replay":
+        return  # Offline replay serves recorded responses and needs no API keys
+    missing = [name for name in names if not os.getenv(name)]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)} in environment variables")
 
 
 def get_timestamp() -> str:
@@ -26,7 +48,12 @@ def get_timestamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
 
 
-def save_artifact(kind: str, data: Union[str, Dict[str, Any]], ext: str = "json") -> str:
+def new_session_id() -> str:
+    """Timestamped session ID with a random suffix, unique across concurrent runs"""
+    return f"{get_timestamp()}_{uuid.uuid4().hex[:6]}"
+
+
+def save_artifact(kind: str, data: Union[str, Dict[str, Any]], ext: str = "json", session_id: str = None) -> str:
     """
     Save data as timestamped artifact
     
@@ -34,13 +61,14 @@ def save_artifact(kind: str, data: Union[str, Dict[str, Any]], ext: str = "json"
         kind: Type of artifact (metadata, plan, search_list, etc.)
         data: Data to save (string or dict)
         ext: File extension (json, md, jsonl)
+        session_id: Prefix artifacts with the session instead of the current timestamp
     
     Returns:
         str: Path to saved file
     """
-    timestamp = get_timestamp()
-    filename = f"{timestamp}_{kind}.{ext}"
-    filepath = ARTIFACTS_DIR / filename
+    prefix = session_id or get_timestamp()
+    filename = f"{prefix}_{kind}.{ext}"
+    filepath = artifacts_dir() / filename
     
     if isinstance(data, dict):
         content = json.dumps(data, indent=2, ensure_ascii=False)
@@ -53,20 +81,21 @@ def save_artifact(kind: str, data: Union[str, Dict[str, Any]], ext: str = "json"
     return str(filepath)
 
 
-def save_jsonl_artifact(kind: str, data_list: list) -> str:
+def save_jsonl_artifact(kind: str, data_list: list, session_id: str = None) -> str:
     """
     Save list of objects as JSONL artifact
     
     Args:
         kind: Type of artifact 
         data_list: List of objects to save as JSONL
+        session_id: Prefix artifacts with the session instead of the current timestamp
         
     Returns:
         str: Path to saved file
     """
-    timestamp = get_timestamp()
-    filename = f"{timestamp}_{kind}.jsonl"
-    filepath = ARTIFACTS_DIR / filename
+    prefix = session_id or get_timestamp()
+    filename = f"{prefix}_{kind}.jsonl"
+    filepath = artifacts_dir() / filename
     
     with open(filepath, "w", encoding="utf-8") as f:
         for item in data_list:
@@ -110,6 +139,21 @@ def load_artifact(filepath: str) -> Union[str, Dict[str, Any], list]:
         return content
 
 
+def find_session_artifact(session_id: str, kind: str, ext: str = "json") -> Union[str, None]:
+    """
+    Path to a session's artifact of given kind if it exists
+
+    Args:
+        session_id: Session ID (letters, digits, '_' and '-' only)
+        kind: Type of artifact
+        ext: File extension
+    """
+    if not re.fullmatch(r"[\w-]+", session_id or ""):
+        return None
+    path = ARTIFACTS_DIR / f"{session_id}_{kind}.{ext}"
+    return str(path) if path.is_file() else None
+
+
 def get_latest_artifact(kind: str, ext: str = "json") -> Union[str, None]:
     """
     Get path to most recent artifact of given kind